@@ -0,0 +1,74 @@
+"""
+Бенчмарк записи истории действий пользователей.
+
+Сравнивает пропускную способность (событий в секунду) поштучного
+эндпоинта POST /users/{user_id}/history/add и пакетного
+POST /users/history/bulk. Нужен запущенный сервис администрирования
+с базой данных, заполненной из database.sql.
+
+Запуск из каталога backend/admin:
+    python benchmarks/history_ingest.py --url http://localhost:8000/api/v1 \\
+        --events 5000 --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+USER_ID = "user_001"
+MENU_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _event() -> dict:
+    return {
+        "menu_id": MENU_ID,
+        "action_date": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+async def _single(client: httpx.AsyncClient, events: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.post(
+                f"/users/{USER_ID}/history/add", json=_event()
+            )
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(events)))
+    return events / (time.perf_counter() - started)
+
+
+async def _bulk(client: httpx.AsyncClient, events: int, batch_size: int) -> float:
+    started = time.perf_counter()
+    for offset in range(0, events, batch_size):
+        items = [
+            {"user_id": USER_ID, **_event()}
+            for _ in range(min(batch_size, events - offset))
+        ]
+        response = await client.post("/users/history/bulk", json={"items": items})
+        response.raise_for_status()
+    return events / (time.perf_counter() - started)
+
+
+async def main(url: str, events: int, batch_size: int, concurrency: int) -> None:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        single = await _single(client, events, concurrency)
+        bulk = await _bulk(client, events, batch_size)
+
+    print(f"{'Поштучно':<12} {single:10.1f} событий/с")
+    print(f"{'Пачками':<12} {bulk:10.1f} событий/с  (x{bulk / single:.1f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.events, args.batch_size, args.concurrency))
@@ -0,0 +1,145 @@
+"""
+Бенчмарк поиска узлов меню.
+
+Сравнивает прежний поиск (ILIKE '%слово%' по имени и тексту, дочерние
+узлы отдельным запросом на каждый найденный узел) с полнотекстовым
+поиском по GIN-индексу с ранжированием и дочерними узлами одним
+запросом. Оба способа возвращают не больше --limit узлов. Синтетические
+узлы вставляются в транзакции, которая в конце откатывается, поэтому
+данные в БД не меняются. Нужна база, созданная из database.sql,
+и переменные окружения POSTGRES_*.
+
+Запуск из каталога backend/admin:
+    python benchmarks/menu_search.py --nodes 100000 --keywords "слуховой аппарат"
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import selectinload
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("REMINDER_POLLING_INTERVAL_IN_MINUTES", "60")
+
+from src.db.postgres import async_session_maker  # noqa: E402
+from src.db.db_engine import DBEngine  # noqa: E402
+from src.models.nodes import MenuNode  # noqa: E402
+from src.services.menu_service import MenuService  # noqa: E402
+from src.utils.pagination import PaginatedParams  # noqa: E402
+
+WORDS = (
+    "слух ребенок аппарат имплант кохлеарный слуховой речь развитие школа "
+    "детский сад педагог родители поддержка компенсация диагноз врач "
+    "сурдолог занятие игра упражнение видео книга курс помощь общение"
+).split()
+
+
+def _synthetic_records(size: int, branching: int) -> list[tuple]:
+    """Дерево из size узлов со случайными именами и текстами."""
+    rng = random.Random(0)
+    ids = [uuid.uuid4() for _ in range(size)]
+    paths = []
+    records = []
+    for index, node_id in enumerate(ids):
+        parent_index = (index - 1) // branching if index else None
+        parent_path = paths[parent_index] if index else "/"
+        paths.append(f"{parent_path}{node_id}/")
+        records.append(
+            (
+                node_id,
+                ids[parent_index] if index else None,
+                f"{' '.join(rng.sample(WORDS, 3))} {index}",
+                " ".join(rng.choices(WORDS, k=30)),
+                paths[-1],
+            )
+        )
+    return records
+
+
+async def _legacy_search(menu_service: MenuService, keywords: str, limit: int) -> int:
+    """Прежний поиск: ILIKE без индекса и запрос детей на каждый узел."""
+    conditions = []
+    for term in keywords.split():
+        conditions.append(MenuNode.name.ilike(f"%{term}%"))
+        conditions.append(MenuNode.text.ilike(f"%{term}%"))
+    stmt = (
+        select(MenuNode)
+        .options(selectinload(MenuNode.content))
+        .where(or_(*conditions))
+        .order_by(MenuNode.name)
+        .limit(limit)
+    )
+    session = menu_service.db_engine.session
+    menu_nodes = (await session.execute(stmt)).scalars().all()
+    for node in menu_nodes:
+        children = (
+            select(MenuNode.id, MenuNode.name)
+            .where(MenuNode.parent_id == node.id)
+            .order_by(MenuNode.name)
+        )
+        (await session.execute(children)).all()
+    return len(menu_nodes)
+
+
+async def _search(menu_service: MenuService, keywords: str, limit: int) -> int:
+    nodes = await menu_service.search_menu_nodes(keywords, PaginatedParams(limit, 1))
+    return len(nodes)
+
+
+async def _timed(coro) -> tuple[float, int]:
+    started = time.perf_counter()
+    found = await coro
+    return time.perf_counter() - started, found
+
+
+async def main(nodes: int, branching: int, keywords: str, limit: int, repeat: int) -> None:
+    records = _synthetic_records(nodes, branching)
+
+    async with async_session_maker() as session:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            MenuNode.__tablename__,
+            schema_name=MenuNode.__table__.schema,
+            columns=["id", "parent_id", "name", "text", "path"],
+            records=records,
+        )
+        # Статистика нужна планировщику, чтобы выбрать GIN-индекс
+        await session.execute(text("ANALYZE content.menu_node"))
+
+        menu_service = MenuService(DBEngine(session))
+        try:
+            legacy, legacy_found = min(
+                [await _timed(_legacy_search(menu_service, keywords, limit))
+                 for _ in range(repeat)]
+            )
+            search, found = min(
+                [await _timed(_search(menu_service, keywords, limit))
+                 for _ in range(repeat)]
+            )
+        finally:
+            await session.rollback()
+
+    print(f"Синтетических узлов: {nodes}, запрос «{keywords}», не больше {limit}")
+    print(f"{'ILIKE':<14} {legacy * 1000:10.1f} мс  найдено {legacy_found}")
+    print(
+        f"{'Полнотекстовый':<14} {search * 1000:10.1f} мс  найдено {found}"
+        f"  (x{legacy / search:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--branching", type=int, default=10)
+    parser.add_argument("--keywords", default="слуховой аппарат")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.nodes, args.branching, args.keywords, args.limit, args.repeat))
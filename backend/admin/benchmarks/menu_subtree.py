@@ -0,0 +1,108 @@
+"""
+Бенчмарк загрузки ветки меню.
+
+Сравнивает загрузку всего дерева (как в GET /menu/) с загрузкой одной
+ветки рекурсивным запросом (как в GET /menu/{id}/subtree) на большом
+синтетическом меню. Синтетические узлы вставляются в транзакции, которая
+в конце откатывается, поэтому данные в БД не меняются. Нужна база,
+созданная из database.sql, и переменные окружения POSTGRES_*.
+
+Запуск из каталога backend/admin:
+    python benchmarks/menu_subtree.py --nodes 100000 --depth 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("REMINDER_POLLING_INTERVAL_IN_MINUTES", "60")
+
+from src.db.db_engine import DBEngine  # noqa: E402
+from src.db.postgres import async_session_maker  # noqa: E402
+from src.models.nodes import MenuNode  # noqa: E402
+from src.services.menu_service import MenuService  # noqa: E402
+from src.utils.menu_tree import build_menu_tree  # noqa: E402
+
+
+def _synthetic_records(size: int, branching: int) -> tuple[uuid.UUID, list[tuple]]:
+    """Дерево из size узлов, у каждого не больше branching детей."""
+    ids = [uuid.uuid4() for _ in range(size)]
+    paths = []
+    records = []
+    for index, node_id in enumerate(ids):
+        parent_index = (index - 1) // branching if index else None
+        parent_path = paths[parent_index] if index else "/"
+        paths.append(f"{parent_path}{node_id}/")
+        records.append(
+            (
+                node_id,
+                ids[parent_index] if index else None,
+                f"Синтетический узел {index:07d}",
+                f"Текст узла {index}",
+                paths[-1],
+            )
+        )
+    return ids[0], records
+
+
+async def _timed(coro) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    body = await coro
+    return time.perf_counter() - started, body
+
+
+async def _full_tree(db_engine: DBEngine) -> bytes:
+    """Путь GET /menu/ без кэша: все узлы и весь контент."""
+    return orjson.dumps(build_menu_tree(await db_engine.get_full_menu()))
+
+
+async def main(nodes: int, branching: int, depth: int, repeat: int) -> None:
+    root_id, records = _synthetic_records(nodes, branching)
+
+    async with async_session_maker() as session:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            MenuNode.__tablename__,
+            schema_name=MenuNode.__table__.schema,
+            columns=["id", "parent_id", "name", "text", "path"],
+            records=records,
+        )
+
+        db_engine = DBEngine(session)
+        menu_service = MenuService(db_engine)
+        try:
+            full, full_body = min(
+                [await _timed(_full_tree(db_engine)) for _ in range(repeat)]
+            )
+            subtree, subtree_body = min(
+                [
+                    await _timed(menu_service.get_menu_subtree(root_id, depth))
+                    for _ in range(repeat)
+                ]
+            )
+        finally:
+            await session.rollback()
+
+    print(f"Синтетических узлов: {nodes}, ветвление {branching}, глубина {depth}")
+    print(f"{'Все дерево':<12} {full * 1000:10.1f} мс {len(full_body) / 1024:10.0f} КБ")
+    print(
+        f"{'Ветка':<12} {subtree * 1000:10.1f} мс {len(subtree_body) / 1024:10.0f} КБ"
+        f"  (x{full / subtree:.0f})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--branching", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.nodes, args.branching, args.depth, args.repeat))
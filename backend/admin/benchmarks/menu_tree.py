@@ -0,0 +1,176 @@
+"""
+Бенчмарк построения полного дерева меню.
+
+Сравнивает прежний способ (поиск детей перебором всех узлов, модели
+MenuNodeOut и AllMenuNodeOut, сериализация через pydantic) с линейным
+построением словарей и orjson, а также с ответом из кэша по ревизии.
+На синтетических деревьях проверяется, что оба способа дают одинаковый
+JSON. Идентификаторы создаются типом UUID из asyncpg, как в строках,
+которые возвращает драйвер. Прежний способ квадратичен, поэтому для больших деревьев
+пропускается (см. --legacy-max). БД не нужна.
+
+Запуск из каталога backend/admin:
+    python benchmarks/menu_tree.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+from asyncpg.pgproto.pgproto import UUID as DriverUUID
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Настройки читаются при импорте моделей; к БД бенчмарк не подключается
+for name, value in {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "REMINDER_POLLING_INTERVAL_IN_MINUTES": "60",
+}.items():
+    os.environ.setdefault(name, value)
+
+from src.schemas.entity import (  # noqa: E402
+    AllMenuNodeOut,
+    ContentOut,
+    MenuNodeChildOut,
+    MenuNodeOut,
+)
+from src.utils.menu_tree import MenuTreeCache, build_menu_tree  # noqa: E402
+
+
+def _driver_uuid(value: int) -> DriverUUID:
+    """UUID того же типа, что asyncpg отдает для колонок uuid."""
+    return DriverUUID(str(uuid.UUID(int=value)))
+
+
+def _synthetic_nodes(size: int, branching: int) -> list[SimpleNamespace]:
+    """Дерево из size узлов, у каждого не больше branching детей."""
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    nodes = []
+    for index in range(size):
+        node_id = _driver_uuid(index + 1)
+        parent_id = _driver_uuid((index - 1) // branching + 1) if index else None
+        content = []
+        if index % 10 == 0:
+            content.append(
+                SimpleNamespace(
+                    id=_driver_uuid(size + index + 1),
+                    menu_id=node_id,
+                    type=1,
+                    server_path=f"/files/{index}.pdf",
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        nodes.append(
+            SimpleNamespace(
+                id=node_id,
+                parent_id=parent_id,
+                name=f"Узел {index:07d}",
+                text=f"Текст узла {index}",
+                subscription_type=None,
+                content=content,
+            )
+        )
+    # БД отдает узлы, отсортированные по имени
+    return sorted(nodes, key=lambda node: node.name)
+
+
+def _legacy(menu_nodes) -> bytes:
+    """Прежняя реализация MenuService.get_full_menu и _build_menu_tree."""
+    node_out_list = [
+        MenuNodeOut(
+            id=node.id,
+            parent_id=node.parent_id,
+            name=node.name,
+            text=node.text,
+            subscription_type=node.subscription_type,
+            content=[
+                ContentOut(
+                    id=c.id,
+                    menu_id=c.menu_id,
+                    type=c.type,
+                    server_path=c.server_path,
+                    created_at=c.created_at,
+                    updated_at=c.updated_at,
+                )
+                for c in node.content
+            ],
+            children_names=[
+                child.name for child in menu_nodes if child.parent_id == node.id
+            ],
+            children_nodes=[
+                MenuNodeChildOut(id=child.id, name=child.name)
+                for child in menu_nodes
+                if child.parent_id == node.id
+            ],
+        )
+        for node in menu_nodes
+    ]
+    node_map = {
+        node.id: AllMenuNodeOut(**node.model_dump(), children=[])
+        for node in node_out_list
+    }
+    roots = []
+    for node in node_out_list:
+        if node.parent_id and node.parent_id in node_map:
+            node_map[node.parent_id].children.append(node_map[node.id])
+        else:
+            roots.append(node_map[node.id])
+    return orjson.dumps(roots[0].model_dump(mode="json"))
+
+
+def _optimized(menu_nodes) -> bytes:
+    return orjson.dumps(build_menu_tree(menu_nodes))
+
+
+def _measure(func, *args) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main(sizes: list[int], branching: int, legacy_max: int, repeat: int) -> None:
+    print(f"{'узлов':>8} {'прежний, мс':>12} {'линейный, мс':>13} {'кэш, мкс':>9}")
+    for size in sizes:
+        nodes = _synthetic_nodes(size, branching)
+
+        optimized, body = min(_measure(_optimized, nodes) for _ in range(repeat))
+
+        legacy = None
+        if size <= legacy_max:
+            legacy, legacy_body = _measure(_legacy, nodes)
+            assert orjson.loads(legacy_body) == orjson.loads(body), "JSON различается"
+
+        cache = MenuTreeCache()
+        cache.set(1, body)
+        started = time.perf_counter()
+        for _ in range(10000):
+            cache.get(1)
+        cached = (time.perf_counter() - started) / 10000
+
+        legacy_text = f"{legacy * 1000:12.1f}" if legacy is not None else f"{'-':>12}"
+        print(f"{size:>8} {legacy_text} {optimized * 1000:13.1f} {cached * 1e6:9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--branching", type=int, default=10)
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10000,
+        help="Наибольшее дерево, на котором запускается прежний способ",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.branching, args.legacy_max, args.repeat)
@@ -0,0 +1,108 @@
+"""
+Бенчмарк пагинации истории пользователя.
+
+Сравнивает первую и глубокую страницу истории (как в GET
+/users/{id}/history) при пагинации через OFFSET и по курсору. Все
+--rows действий принадлежат одному синтетическому пользователю.
+Действия вставляются в транзакции, которая в конце откатывается,
+поэтому данные в БД не меняются. Нужна база, созданная из database.sql,
+и переменные окружения POSTGRES_*.
+
+Запуск из каталога backend/admin:
+    python benchmarks/pagination.py --rows 1000000 --page 10000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("REMINDER_POLLING_INTERVAL_IN_MINUTES", "60")
+
+from src.db.db_engine import DBEngine  # noqa: E402
+from src.db.postgres import async_session_maker  # noqa: E402
+from src.models.history import History  # noqa: E402
+from src.models.users import User  # noqa: E402
+from src.utils.pagination import PaginatedParams  # noqa: E402
+
+
+def _synthetic_records(user_id: str, rows: int) -> list[tuple]:
+    """Действия пользователя, по несколько на одну и ту же секунду."""
+    started = datetime(2024, 1, 1)
+    return [
+        (uuid.uuid4(), user_id, started + timedelta(seconds=index // 4))
+        for index in range(rows)
+    ]
+
+
+async def _timed(db_engine: DBEngine, user_id: str, pagination: PaginatedParams):
+    started = time.perf_counter()
+    items, next_cursor = await db_engine.get_user_history(user_id, pagination)
+    return time.perf_counter() - started, items, next_cursor
+
+
+async def main(rows: int, page: int, page_size: int, repeat: int) -> None:
+    user_id = f"bench_{uuid.uuid4()}"
+    records = _synthetic_records(user_id, rows)
+
+    async with async_session_maker() as session:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            User.__tablename__,
+            schema_name=User.__table__.schema,
+            columns=["id", "phone_number"],
+            records=[(user_id, "")],
+        )
+        await driver_connection.copy_records_to_table(
+            History.__tablename__,
+            schema_name=History.__table__.schema,
+            columns=["id", "user_id", "action_date"],
+            records=records,
+        )
+        await session.execute(text("ANALYZE content.history"))
+
+        db_engine = DBEngine(session)
+        try:
+            # Курсор на начало нужной страницы берется из предыдущей
+            _, _, cursor = await _timed(
+                db_engine, user_id, PaginatedParams(page_size, page - 1)
+            )
+            cases = {
+                "OFFSET, страница 1": PaginatedParams(page_size, 1),
+                f"OFFSET, страница {page}": PaginatedParams(page_size, page),
+                f"Курсор, страница {page}": PaginatedParams(page_size, 1, cursor),
+            }
+            results = {}
+            for name, pagination in cases.items():
+                results[name] = min(
+                    [await _timed(db_engine, user_id, pagination) for _ in range(repeat)],
+                    key=lambda result: result[0],
+                )
+        finally:
+            await session.rollback()
+
+    offset_page = results[f"OFFSET, страница {page}"]
+    cursor_page = results[f"Курсор, страница {page}"]
+    assert [item.id for item in offset_page[1]] == [item.id for item in cursor_page[1]]
+
+    print(f"Действий: {rows}, размер страницы {page_size}")
+    for name, (elapsed, _, _) in results.items():
+        print(f"{name:<24} {elapsed * 1000:10.2f} мс")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--page", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page, args.page_size, args.repeat))
@@ -1,10 +1,11 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.postgres import get_async_session
 from src.schemas.entity import (
     ContentCreate,
     MenuNodeOut,
+    MenuNodeIdsIn,
     MenuNodeCreate,
     MenuNodeUpdate,
     Message,
@@ -12,6 +13,10 @@ from src.schemas.entity import (
     RatingSummaryOut,
     RatingListOut,
     AllMenuNodeOut,
+    MenuRevisionOut,
+    MenuNodeAncestorOut,
+    MenuBreadcrumbsOut,
+    MenuDescendantCountOut,
 )
 from src.services.menu_service import MenuService, get_menu_service
 from src.utils.pagination import PaginatedParams
@@ -24,7 +29,8 @@ router = APIRouter()
     "/", summary="Получить всё дерево меню навигации", response_model=AllMenuNodeOut
 )
 async def get_full_menu(menu_service: MenuService = Depends(get_menu_service)):
-    return await menu_service.get_full_menu()
+    body = await menu_service.get_full_menu()
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -45,6 +51,48 @@ async def get_menu_node_by_name(
 async def get_menu_root(menu_service: MenuService = Depends(get_menu_service)):
     return await menu_service.get_menu_root()
 
+@router.get(
+    "/revision",
+    summary="Получить текущую ревизию меню",
+    response_model=MenuRevisionOut,
+)
+async def get_menu_revision(menu_service: MenuService = Depends(get_menu_service)):
+    return await menu_service.get_menu_revision()
+
+@router.get(
+    "/ratings/summary",
+    summary="Получить рейтинги всех узлов меню",
+    response_model=list[RatingSummaryOut],
+)
+async def get_menu_rating_summaries(
+    menu_service: MenuService = Depends(get_menu_service),
+):
+    return await menu_service.get_menu_rating_summaries()
+
+@router.get(
+    "/nodes",
+    summary="Получить несколько узлов меню по id",
+    response_model=list[MenuNodeOut],
+)
+async def get_menu_nodes(
+    ids: list[UUID] = Query(..., title="Идентификаторы узлов", max_length=100),
+    menu_service: MenuService = Depends(get_menu_service),
+):
+    return await menu_service.get_menu_nodes_by_ids(ids)
+
+
+@router.post(
+    "/nodes",
+    summary="Получить несколько узлов меню по списку id в теле запроса",
+    response_model=list[MenuNodeOut],
+)
+async def post_menu_nodes(
+    node_ids: MenuNodeIdsIn,
+    menu_service: MenuService = Depends(get_menu_service),
+):
+    return await menu_service.get_menu_nodes_by_ids(node_ids.ids)
+
+
 @router.get(
     "/search",
     summary="Поиск узлов меню по ключевым словам",
@@ -52,9 +100,10 @@ async def get_menu_root(menu_service: MenuService = Depends(get_menu_service)):
 )
 async def search_menu_nodes(
     keywords: str = Query(..., title="Ключевые слова для поиска", min_length=1),
+    pagination: PaginatedParams = Depends(),
     menu_service: MenuService = Depends(get_menu_service),
 ):
-    return await menu_service.search_menu_nodes(keywords)
+    return await menu_service.search_menu_nodes(keywords, pagination)
 
 @router.post("/add", summary="Добавить узел меню навигации", response_model=Message)
 async def add_menu_node(
@@ -72,6 +121,53 @@ async def get_menu_node(
     return await menu_service.get_menu_node_by_id(menu_id)
 
 
+@router.get(
+    "/{menu_id}/subtree",
+    summary="Получить ветку меню от узла на заданную глубину",
+    response_model=AllMenuNodeOut,
+)
+async def get_menu_subtree(
+    menu_id: UUID,
+    depth: int = Query(1, ge=0, le=100, description="Сколько уровней потомков вернуть"),
+    menu_service: MenuService = Depends(get_menu_service),
+):
+    body = await menu_service.get_menu_subtree(menu_id, depth)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/{menu_id}/ancestors",
+    summary="Получить предков узла меню от корня к родителю",
+    response_model=list[MenuNodeAncestorOut],
+)
+async def get_menu_node_ancestors(
+    menu_id: UUID, menu_service: MenuService = Depends(get_menu_service)
+):
+    return await menu_service.get_menu_node_ancestors(menu_id)
+
+
+@router.get(
+    "/{menu_id}/breadcrumbs",
+    summary="Получить навигационную цепочку до узла меню",
+    response_model=MenuBreadcrumbsOut,
+)
+async def get_menu_node_breadcrumbs(
+    menu_id: UUID, menu_service: MenuService = Depends(get_menu_service)
+):
+    return await menu_service.get_menu_node_breadcrumbs(menu_id)
+
+
+@router.get(
+    "/{menu_id}/descendants/count",
+    summary="Получить число потомков узла меню",
+    response_model=MenuDescendantCountOut,
+)
+async def count_menu_node_descendants(
+    menu_id: UUID, menu_service: MenuService = Depends(get_menu_service)
+):
+    return await menu_service.count_menu_node_descendants(menu_id)
+
+
 @router.put("/{menu_id}", summary="Обновить узел меню по id", response_model=Message)
 async def update_menu_node(
     menu_id: UUID,
@@ -9,6 +9,8 @@ from src.schemas.entity import (
     UsersListOut,
     UserCreate,
     HistoryCreate,
+    HistoryBulkCreate,
+    HistoryBulkOut,
     HistoryOut,
     QuestionOut,
     QuestionCreate,
@@ -109,6 +111,18 @@ async def delete_question(
     return await user_service.delete_question(question_id)
 
 
+@router.post(
+    "/history/bulk",
+    summary="Пакетно добавить действия пользователей",
+    response_model=HistoryBulkOut,
+)
+async def create_user_action_records_bulk(
+    history_data: HistoryBulkCreate,
+    user_service: UserService = Depends(get_user_service),
+):
+    return await user_service.create_user_action_records_bulk(history_data)
+
+
 @router.post(
     "/{user_id}/history/add",
     summary="Добавить действие пользователя",
@@ -17,5 +17,13 @@ class Settings(BaseSettings):
     bot_token: str = "yourToken"
     reminder_polling_interval_in_minutes: int
 
+    # сверка счетчиков оценок с таблицей оценок
+    rating_counter_reconcile_interval_in_minutes: int = 60
+
+    # темп рассылок в Telegram, сообщений в секунду.
+    # Токен общий с ботом: вместе с TELEGRAM_GLOBAL_RATE бота не больше 30
+    telegram_global_rate: float = 5
+    telegram_max_retries: int = 3
+
 
 settings = Settings()  # type: ignore
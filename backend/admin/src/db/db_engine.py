@@ -1,10 +1,28 @@
 # db_engine.py
-from datetime import datetime
-from uuid import UUID
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
 from typing import Sequence
-from sqlalchemy import select, update, delete, and_, func, text, or_
+from sqlalchemy import (
+    ARRAY,
+    Row,
+    Text,
+    Uuid,
+    any_,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by, array_agg, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 from fastapi import Depends, HTTPException, status
 
 from src.db.postgres import get_async_session
@@ -14,10 +32,14 @@ from src.models.history import History
 from src.models.ratings import UserMenuNode
 from src.models.nodes import MenuNode
 from src.models.contents import Content
+from src.models.revisions import MenuRevision
+from src.models.rating_counters import MenuRatingCounter
 from src.schemas.entity import (
     UserCreate,
     QuestionCreate,
     HistoryCreate,
+    HistoryBulkItem,
+    HistoryBulkOut,
     RatingCreate,
     RatingDetailOut,
     RatingListOut,
@@ -88,15 +110,13 @@ class DBEngine:
         return result.scalar_one_or_none()
     # User methods
 
-    async def get_users(self, pagination: PaginatedParams) -> Sequence[User]:
-        stmt = (
-            select(User)
-            .offset(pagination.offset)
-            .limit(pagination.limit)
-            .order_by(User.phone_number)
-        )
+    async def get_users(
+        self, pagination: PaginatedParams
+    ) -> tuple[list[User], str | None]:
+        """Страница пользователей по номеру телефона и курсор следующей."""
+        stmt = pagination.paginate(select(User), User.phone_number, User.id)
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return pagination.page(result.scalars().all(), User.phone_number, User.id)
 
     async def get_user_by_id(self, user_id: str) -> User | None:
         stmt = select(User).where(User.id == user_id)
@@ -157,7 +177,7 @@ class DBEngine:
             end_date: datetime|None = None,
             sort_by: str = "created_at",
             sort_order: str = "desc"
-    ) -> Sequence[Question]:
+    ) -> tuple[list[Question], str | None]:
         stmt = select(Question)
 
         # Применяем фильтрацию по дате
@@ -166,17 +186,15 @@ class DBEngine:
         if end_date:
             stmt = stmt.where(Question.created_at <= end_date)
 
-        # Применяем сортировку
+        # Применяем сортировку, id делает порядок однозначным для курсора
         sort_column = Question.created_at if sort_by == "created_at" else Question.updated_at
-        if sort_order == "asc":
-            stmt = stmt.order_by(sort_column.asc())
-        else:
-            stmt = stmt.order_by(sort_column.desc())
-
-        stmt = stmt.offset(pagination.offset).limit(pagination.limit)
+        descending = sort_order != "asc"
+        stmt = pagination.paginate(stmt, sort_column, Question.id, descending=descending)
 
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return pagination.page(
+            result.scalars().all(), sort_column, Question.id, descending=descending
+        )
 
     async def create_question(self, question_data: QuestionCreate) -> Question:
         question = Question(user_id=question_data.user_id,
@@ -224,18 +242,84 @@ class DBEngine:
         await self.session.refresh(history)
         return history
 
+    async def create_history_records(
+        self, items: list[HistoryBulkItem]
+    ) -> HistoryBulkOut:
+        """
+        Сохраняет пачку действий одной командой COPY.
+
+        Пользователи и узлы меню проверяются двумя запросами на всю пачку,
+        действия с неизвестными идентификаторами пропускаются.
+        """
+        user_ids = {item.user_id for item in items}
+        menu_ids = {item.menu_id for item in items if item.menu_id}
+
+        existing_users = set(
+            (
+                await self.session.execute(select(User.id).where(User.id.in_(user_ids)))
+            ).scalars()
+        )
+        existing_menus = set()
+        if menu_ids:
+            existing_menus = set(
+                (
+                    await self.session.execute(
+                        select(MenuNode.id).where(MenuNode.id.in_(menu_ids))
+                    )
+                ).scalars()
+            )
+
+        records = []
+        skipped_unknown_user = 0
+        skipped_unknown_menu = 0
+        for item in items:
+            if item.user_id not in existing_users:
+                skipped_unknown_user += 1
+            elif item.menu_id is not None and item.menu_id not in existing_menus:
+                skipped_unknown_menu += 1
+            else:
+                records.append(
+                    (item.user_id, item.menu_id, self._to_naive_utc(item.action_date))
+                )
+
+        if records:
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                History.__tablename__,
+                schema_name=History.__table__.schema,
+                columns=["user_id", "menu_id", "action_date"],
+                records=records,
+            )
+            await self.session.commit()
+
+        return HistoryBulkOut(
+            received=len(items),
+            inserted=len(records),
+            skipped_unknown_user=skipped_unknown_user,
+            skipped_unknown_menu=skipped_unknown_menu,
+        )
+
+    @staticmethod
+    def _to_naive_utc(value: datetime) -> datetime:
+        """Приводит дату к UTC без часового пояса, как в колонке TIMESTAMP."""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
     async def get_user_history(
         self, user_id: str, pagination: PaginatedParams
-    ) -> Sequence[History]:
-        stmt = (
-            select(History)
-            .where(History.user_id == user_id)
-            .offset(pagination.offset)
-            .limit(pagination.limit)
-            .order_by(History.action_date.desc())
+    ) -> tuple[list[History], str | None]:
+        stmt = pagination.paginate(
+            select(History).where(History.user_id == user_id),
+            History.action_date,
+            History.id,
+            descending=True,
         )
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return pagination.page(
+            result.scalars().all(), History.action_date, History.id, descending=True
+        )
 
     # Menu methods
     async def get_full_menu(self) -> Sequence[MenuNode]:
@@ -247,6 +331,91 @@ class DBEngine:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_menu_subtree(
+        self, menu_id: UUID, depth: int
+    ) -> Sequence[tuple[MenuNode, int]]:
+        """
+        Узел и его потомки не глубже depth уровней вместе с контентом.
+
+        Потомки находятся одним рекурсивным запросом (WITH RECURSIVE),
+        контент догружается вторым. Возвращает пары (узел, уровень).
+        """
+        subtree = (
+            select(MenuNode.id, literal_column("0").label("level"))
+            .where(MenuNode.id == menu_id)
+            .cte("subtree", recursive=True)
+        )
+        child = aliased(MenuNode)
+        subtree = subtree.union_all(
+            select(child.id, subtree.c.level + 1).where(
+                child.parent_id == subtree.c.id, subtree.c.level < depth
+            )
+        )
+        stmt = (
+            select(MenuNode, subtree.c.level)
+            .join(subtree, MenuNode.id == subtree.c.id)
+            .options(selectinload(MenuNode.content))
+            .order_by(MenuNode.name)
+        )
+        result = await self.session.execute(stmt)
+        return result.tuples().all()
+
+    async def get_menu_children_rows(self, parent_ids: list[UUID]) -> Sequence[Row]:
+        """Пары (id, имя) дочерних узлов для нескольких родителей."""
+        stmt = (
+            select(MenuNode.parent_id, MenuNode.id, MenuNode.name)
+            .where(MenuNode.parent_id.in_(parent_ids))
+            .order_by(MenuNode.name)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def get_menu_node_lineage(self, menu_id: UUID) -> Sequence[MenuNode]:
+        """
+        Цепочка узлов от корня до узла включительно.
+
+        ID предков берутся из пути узла, поэтому вся цепочка читается одним
+        запросом по первичному ключу. Для несуществующего узла список пуст.
+        """
+        target = aliased(MenuNode)
+        lineage_ids = cast(
+            func.string_to_array(func.btrim(target.path, "/"), "/"), ARRAY(Uuid)
+        )
+        stmt = (
+            select(MenuNode)
+            .join(target, MenuNode.id == any_(lineage_ids))
+            .where(target.id == menu_id)
+            .order_by(func.length(MenuNode.path))
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def count_menu_descendants(self, menu_id: UUID) -> int | None:
+        """
+        Число всех потомков узла или None, если узла нет.
+
+        Потомки - это пути в диапазоне [путь узла, путь узла с "0" вместо
+        последнего "/"), который читается по btree-индексу пути.
+        """
+        descendant = aliased(MenuNode)
+        descendants_count = (
+            select(func.count())
+            .select_from(descendant)
+            .where(
+                descendant.path > MenuNode.path,
+                descendant.path < func.left(MenuNode.path, -1, type_=Text) + "0",
+            )
+            .scalar_subquery()
+        )
+        stmt = select(descendants_count).where(MenuNode.id == menu_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_menu_revision(self) -> int:
+        stmt = select(MenuRevision.revision).where(MenuRevision.id == 1)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() or 0
+
     async def get_menu_node_by_id(self, menu_id: UUID) -> MenuNode | None:
         stmt = (
             select(MenuNode)
@@ -256,6 +425,71 @@ class DBEngine:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_menu_nodes_by_ids(self, menu_ids: list[UUID]) -> Sequence[MenuNode]:
+        stmt = (
+            select(MenuNode)
+            .where(MenuNode.id.in_(menu_ids))
+            .options(selectinload(MenuNode.content))
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_menu_node_out(self, *conditions) -> Row | None:
+        """
+        Узел меню вместе с контентом и дочерними узлами одним запросом.
+
+        Контент собирается в JSON-массив, а ID и имена дочерних узлов -
+        в массивы, упорядоченные по имени. Условия отбора узла передаются
+        как выражения SQLAlchemy.
+        """
+        child = aliased(MenuNode)
+        node_children = (
+            select(
+                array_agg(aggregate_order_by(child.id, child.name)).label("ids"),
+                array_agg(aggregate_order_by(child.name, child.name)).label("names"),
+            )
+            .where(child.parent_id == MenuNode.id)
+            .lateral("node_children")
+        )
+        node_content = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            literal_column("'id'"), Content.id,
+                            literal_column("'menu_id'"), Content.menu_id,
+                            literal_column("'type'"), Content.type,
+                            literal_column("'server_path'"), Content.server_path,
+                            literal_column("'created_at'"), Content.created_at,
+                            literal_column("'updated_at'"), Content.updated_at,
+                        ),
+                        Content.created_at,
+                    ),
+                    type_=JSON,
+                ).label("content_items")
+            )
+            .where(Content.menu_id == MenuNode.id)
+            .lateral("node_content")
+        )
+        stmt = (
+            select(
+                MenuNode.id,
+                MenuNode.parent_id,
+                MenuNode.name,
+                MenuNode.text,
+                MenuNode.subscription_type,
+                node_content.c.content_items.label("content"),
+                node_children.c.ids.label("children_ids"),
+                node_children.c.names.label("children_names"),
+            )
+            .select_from(MenuNode)
+            .join(node_content, true())
+            .join(node_children, true())
+            .where(*conditions)
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
     async def get_menu_node_by_name(self, name: str) -> MenuNode | None:
         stmt = (
             select(MenuNode)
@@ -274,33 +508,54 @@ class DBEngine:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def search_menu_nodes(self, keywords: str) -> Sequence[MenuNode]:
-        """Поиск узлов меню по ключевым словам с использованием ILIKE."""
-        terms = keywords.split()  # Разделяем на отдельные слова
-        conditions = []
-        for term in terms:
-            conditions.append(MenuNode.name.ilike(f"%{term}%"))
-            if MenuNode.text is not None:  # Проверяем, чтобы избежать ошибок если text NULL
-                conditions.append(MenuNode.text.ilike(f"%{term}%"))
-
-        if not conditions:
+    async def search_menu_nodes(
+        self, keywords: str, pagination: PaginatedParams
+    ) -> Sequence[MenuNode]:
+        """
+        Полнотекстовый поиск узлов меню по ключевым словам.
+
+        Узел подходит, если в имени или тексте есть любое из слов с учетом
+        словоформ русского языка. Поиск идет по GIN-индексу search_vector,
+        результаты упорядочены по релевантности (совпадения в имени весят
+        больше, чем в тексте).
+
+        Каждое слово разбирается plainto_tsquery, а запросы объединяются
+        через ||, поэтому операторы поиска во вводе ("-", кавычки, or)
+        не действуют и слова ищутся буквально.
+        """
+        terms = keywords.split()
+        if not terms:
             return []
 
+        config = literal_column("'russian'::regconfig")
+        query = func.plainto_tsquery(config, terms[0])
+        for term in terms[1:]:
+            query = query.op("||")(func.plainto_tsquery(config, term))
         stmt = (
             select(MenuNode)
             .options(selectinload(MenuNode.content))
-            .where(or_(*conditions))
-            .order_by(MenuNode.name)
+            .where(MenuNode.search_vector.bool_op("@@")(query))
+            .order_by(func.ts_rank(MenuNode.search_vector, query).desc(), MenuNode.name)
+            .offset(pagination.offset)
+            .limit(pagination.limit)
         )
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
     async def create_menu_node(self, node_data: MenuNodeCreate) -> MenuNode:
+        node_id = uuid4()
+        parent_path = (
+            select(MenuNode.path)
+            .where(MenuNode.id == node_data.parent_id)
+            .scalar_subquery()
+        )
         menu_node = MenuNode(
+            id=node_id,
             parent_id=node_data.parent_id,
             name=node_data.name,
             text=node_data.text,
             subscription_type=node_data.subscription_type,
+            path=func.coalesce(parent_path, "/") + f"{node_id}/",
         )
         self.session.add(menu_node)
         await self.session.commit()
@@ -310,10 +565,14 @@ class DBEngine:
     async def update_menu_node(
         self, menu_id: UUID, node_data: MenuNodeUpdate
     ) -> MenuNode:
+        values = node_data.model_dump(exclude_unset=True)
+        if "parent_id" in values:
+            await self._move_menu_subtree(menu_id, values["parent_id"])
+
         stmt = (
             update(MenuNode)
             .where(MenuNode.id == menu_id)
-            .values(**node_data.model_dump(exclude_unset=True))
+            .values(**values)
             .returning(MenuNode)
         )
 
@@ -327,6 +586,50 @@ class DBEngine:
             )
         return node
 
+    async def _move_menu_subtree(self, menu_id: UUID, parent_id: UUID | None) -> None:
+        """
+        Переписывает пути узла и всех его потомков при смене родителя.
+
+        Потомки выбираются диапазоном по индексу пути, пути меняются одним
+        UPDATE в транзакции изменения узла.
+        """
+        old_path = await self._get_menu_node_path(menu_id)
+        if old_path is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
+            )
+
+        parent_path = "/"
+        if parent_id is not None:
+            parent_path = await self._get_menu_node_path(parent_id)
+            if parent_path is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Parent menu node not found",
+                )
+            if parent_path.startswith(old_path):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Menu node cannot be moved into its own subtree",
+                )
+
+        new_path = f"{parent_path}{menu_id}/"
+        if new_path == old_path:
+            return
+
+        stmt = (
+            update(MenuNode)
+            .where(MenuNode.path >= old_path, MenuNode.path < old_path[:-1] + "0")
+            .values(path=literal(new_path) + func.substr(MenuNode.path, len(old_path) + 1))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def _get_menu_node_path(self, menu_id: UUID) -> str | None:
+        stmt = select(MenuNode.path).where(MenuNode.id == menu_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def delete_menu_node(self, menu_id: UUID) -> bool:
         stmt = delete(MenuNode).where(MenuNode.id == menu_id)
         result = await self.session.execute(stmt)
@@ -373,67 +676,131 @@ class DBEngine:
         await self.session.commit()
         return result.rowcount > 0
 
+    @staticmethod
+    def _rating_counts():
+        """Число оценок "Полезно" и "Не очень" в одном проходе."""
+        return (
+            func.count().filter(UserMenuNode.post_rating.is_(True)).label("useful_count"),
+            func.count().filter(UserMenuNode.post_rating.is_(False)).label(
+                "not_useful_count"
+            ),
+        )
+
     async def get_menu_rating_summary(self, menu_id: UUID) -> dict:
-        useful_stmt = select(func.count(UserMenuNode.id)).where(
-            and_(
-                UserMenuNode.menu_id == menu_id,
-                UserMenuNode.post_rating == True
-            )
+        stmt = select(
+            MenuRatingCounter.useful_count, MenuRatingCounter.not_useful_count
+        ).where(MenuRatingCounter.menu_id == menu_id)
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return {
+            "useful_count": row.useful_count if row else 0,
+            "not_useful_count": row.not_useful_count if row else 0,
+        }
+
+    async def get_menu_rating_summaries(self) -> Sequence[Row]:
+        """Сводки оценок по всем оцененным узлам из таблицы счетчиков."""
+        stmt = select(
+            MenuRatingCounter.menu_id,
+            MenuRatingCounter.useful_count,
+            MenuRatingCounter.not_useful_count,
+        ).order_by(MenuRatingCounter.menu_id)
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def reconcile_menu_rating_counters(self) -> int:
+        """
+        Пересчитывает счетчики оценок по таблице user_menu_node.
+
+        Счетчики поддерживает триггер, сверка исправляет расхождения
+        (например, после ручной правки данных) и заполняет таблицу в уже
+        существующей БД. На время сверки запись оценок блокируется, чтобы
+        параллельная оценка не потерялась. Возвращает число исправленных
+        счетчиков.
+        """
+        await self.session.execute(
+            text("LOCK TABLE content.user_menu_node IN SHARE MODE")
+        )
+        actual = (
+            select(UserMenuNode.menu_id, *self._rating_counts())
+            .group_by(UserMenuNode.menu_id)
+        )
+        upsert = insert(MenuRatingCounter).from_select(
+            ["menu_id", "useful_count", "not_useful_count"], actual
         )
-        useful_result = await self.session.execute(useful_stmt)
-        useful_count = useful_result.scalar() or 0
-        not_useful_stmt = select(func.count(UserMenuNode.id)).where(
-            and_(
-                UserMenuNode.menu_id == menu_id,
-                UserMenuNode.post_rating == False
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[MenuRatingCounter.menu_id],
+            set_={
+                "useful_count": upsert.excluded.useful_count,
+                "not_useful_count": upsert.excluded.not_useful_count,
+            },
+            where=or_(
+                MenuRatingCounter.useful_count != upsert.excluded.useful_count,
+                MenuRatingCounter.not_useful_count
+                != upsert.excluded.not_useful_count,
+            ),
+        ).returning(MenuRatingCounter.menu_id)
+        fixed = len((await self.session.execute(upsert)).all())
+
+        # Узлы, у которых не осталось оценок, но счетчик не нулевой
+        reset = (
+            update(MenuRatingCounter)
+            .where(
+                or_(
+                    MenuRatingCounter.useful_count != 0,
+                    MenuRatingCounter.not_useful_count != 0,
+                ),
+                ~select(UserMenuNode.id)
+                .where(UserMenuNode.menu_id == MenuRatingCounter.menu_id)
+                .exists(),
             )
+            .values(useful_count=0, not_useful_count=0)
         )
-        not_useful_result = await self.session.execute(not_useful_stmt)
-        not_useful_count = not_useful_result.scalar() or 0
-        return {
-            "useful_count": useful_count,
-            "not_useful_count": not_useful_count
-        }
+        fixed += (await self.session.execute(reset)).rowcount
+        await self.session.commit()
+        return fixed
 
     async def rate_menu_node(
         self, rating_data: RatingCreate, menu_id: UUID
     ) -> UserMenuNode:
-        user = await self.get_user_by_id(rating_data.user_id)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {rating_data.user_id} not found"
+        """
+        Сохраняет оценку одним запросом INSERT ... ON CONFLICT DO UPDATE.
+
+        Существование пользователя и узла проверяют внешние ключи; отдельные
+        запросы выполняются, только чтобы понять, чего не хватает. Счетчики
+        в menu_rating_counter обновляет триггер в той же транзакции, в том
+        числе когда пользователь меняет свою оценку.
+        """
+        stmt = insert(UserMenuNode).values(
+            user_id=rating_data.user_id,
+            menu_id=menu_id,
+            post_rating=rating_data.is_useful,
+            created_at=func.now(),
+            updated_at=func.now(),
+        )
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[UserMenuNode.user_id, UserMenuNode.menu_id],
+                set_={"post_rating": stmt.excluded.post_rating, "updated_at": func.now()},
             )
-        menu_node = await self.get_menu_node_by_id(menu_id)
-        if not menu_node:
+            .returning(UserMenuNode)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            rating = result.scalar_one()
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            if not await self.get_user_by_id(rating_data.user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"User with id {rating_data.user_id} not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Menu node with id {menu_id} not found"
             )
-        existing_stmt = select(UserMenuNode).where(
-            and_(
-                UserMenuNode.user_id == rating_data.user_id,
-                UserMenuNode.menu_id == menu_id,
-            )
-        )
-        existing_result = await self.session.execute(existing_stmt)
-        existing_rating = existing_result.scalar_one_or_none()
-        if existing_rating:
-            existing_rating.post_rating = rating_data.is_useful
-            existing_rating.updated_at = func.now()
-            await self.session.commit()
-            await self.session.refresh(existing_rating)
-            return existing_rating
-        else:
-            rating = UserMenuNode(
-                user_id=rating_data.user_id,
-                menu_id=menu_id,
-                post_rating=rating_data.is_useful,
-            )
-            self.session.add(rating)
-            await self.session.commit()
-            await self.session.refresh(rating)
-            return rating
+        return rating
 
     async def get_menu_ratings_all(
         self, menu_id: UUID, pagination: PaginatedParams
@@ -444,15 +811,19 @@ class DBEngine:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Menu node with id {menu_id} not found"
             )
-        stmt = (
-            select(UserMenuNode)
-            .where(UserMenuNode.menu_id == menu_id)
-            .offset(pagination.offset)
-            .limit(pagination.limit)
-            .order_by(UserMenuNode.created_at.desc())
+        stmt = pagination.paginate(
+            select(UserMenuNode).where(UserMenuNode.menu_id == menu_id),
+            UserMenuNode.created_at,
+            UserMenuNode.id,
+            descending=True,
         )
         result = await self.session.execute(stmt)
-        ratings = result.scalars().all()
+        ratings, next_cursor = pagination.page(
+            result.scalars().all(),
+            UserMenuNode.created_at,
+            UserMenuNode.id,
+            descending=True,
+        )
         rating_out_list = []
         for rating in ratings:
             rating_out = RatingDetailOut(
@@ -462,7 +833,9 @@ class DBEngine:
                 updated_at=rating.updated_at
                 )
             rating_out_list.append(rating_out)
-        return RatingListOut(menu_id=menu_id, ratings=rating_out_list)
+        return RatingListOut(
+            menu_id=menu_id, ratings=rating_out_list, next_cursor=next_cursor
+        )
 
 
 def get_db_engine(session: AsyncSession = Depends(get_async_session)):
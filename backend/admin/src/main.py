@@ -6,8 +6,6 @@ from fastapi.staticfiles import StaticFiles
 
 from src.api.v1 import example, menu_router, users_router, file_router
 from src.core.settings import settings
-from src.db.db_engine import create_db_engine
-from src.db.postgres import async_session_maker
 from src.services.reminder_scheduler import start_scheduler
 from src.services.telegram_bot import get_telegram_bot
 
@@ -16,14 +14,11 @@ from src.services.telegram_bot import get_telegram_bot
 async def lifespan(app: FastAPI):
     telegram_bot = get_telegram_bot()
 
-    async with async_session_maker() as session:
-        db_engine = create_db_engine(session)
+    start_scheduler(bot=telegram_bot)
 
-        start_scheduler(bot=telegram_bot, db_engine=db_engine)
+    yield
 
-        yield
-
-        await telegram_bot.bot.session.close()
+    await telegram_bot.bot.session.close()
 
 
 app = FastAPI(
@@ -1,6 +1,7 @@
 import uuid
 
-from sqlalchemy import text, String
+from sqlalchemy import text, Computed, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import mapped_column, relationship, Mapped
 from src.db.postgres import Base
 
@@ -23,6 +24,22 @@ class MenuNode(Base):
 
     subscription_type: Mapped[str | None] = mapped_column(String(255))
 
+    # Материализованный путь "/id_корня/.../id_узла/". Колонка с правилом
+    # сортировки "C", поэтому потомки узла - это диапазон в btree-индексе
+    path: Mapped[str] = mapped_column(Text(collation="C"), server_default="")
+
+    # Полнотекстовый индекс по имени и тексту, вычисляется в БД.
+    # Не загружается вместе с узлом, нужен только в условиях поиска
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(text, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     content: Mapped[list["Content"]] = relationship(
         "Content", back_populates="menu_node"
     )
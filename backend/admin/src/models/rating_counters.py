@@ -0,0 +1,22 @@
+import uuid
+
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import mapped_column, Mapped
+from src.db.postgres import Base
+
+
+class MenuRatingCounter(Base):
+    """Счетчики оценок узла меню, поддерживаются триггером в БД."""
+
+    __tablename__ = "menu_rating_counter"
+
+    menu_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+
+    useful_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    not_useful_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+
+    def __repr__(self):
+        return f"<MenuRatingCounter(menu_id={self.menu_id}"
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, BigInteger, DateTime, SmallInteger
+from sqlalchemy.orm import mapped_column, Mapped
+from src.db.postgres import Base
+
+
+class MenuRevision(Base):
+    """Счетчик изменений меню, увеличивается триггерами в БД."""
+
+    __tablename__ = "menu_revision"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<MenuRevision(revision={self.revision}"
@@ -25,6 +25,9 @@ class QuestionOut(BaseModel):
 
 class QuestionsListOut(BaseModel):
     items: list[QuestionOut] = Field(..., description="Список вопросов")
+    next_cursor: str | None = Field(
+        None, description="Курсор следующей страницы, null на последней"
+    )
 
 
 class ContentOut(BaseModel):
@@ -40,6 +43,11 @@ class ContentOut(BaseModel):
     )  # Изменено
 
 
+class MenuNodeChildOut(BaseModel):
+    id: UUID = Field(..., description="Идентификатор дочернего узла меню")
+    name: str = Field(..., description="Имя дочернего узла меню")
+
+
 class MenuNodeOut(BaseModel):
     id: UUID = Field(..., description="Уникальный идентификатор узла меню")
     parent_id: UUID | None = Field(
@@ -52,6 +60,40 @@ class MenuNodeOut(BaseModel):
         ..., description="Список контента, привязанного к узлу"
     )
     children_names: list[str] = Field(..., description="Имена дочерних узлов меню")
+    children_nodes: list[MenuNodeChildOut] = Field(
+        ..., description="Дочерние узлы меню в виде пар (id, имя)"
+    )
+
+
+class MenuNodeIdsIn(BaseModel):
+    ids: list[UUID] = Field(
+        ..., min_length=1, max_length=1000, description="Идентификаторы узлов меню"
+    )
+
+
+class MenuNodeAncestorOut(BaseModel):
+    id: UUID = Field(..., description="Идентификатор узла меню")
+    parent_id: UUID | None = Field(None, description="Идентификатор родительского узла")
+    name: str = Field(..., description="Имя узла меню")
+    depth: int = Field(..., description="Глубина узла, у корня 0")
+
+
+class MenuBreadcrumbsOut(BaseModel):
+    items: list[MenuNodeChildOut] = Field(
+        ..., description="Узлы от корня до текущего включительно"
+    )
+    text: str = Field(..., description="Имена узлов пути через разделитель")
+
+
+class MenuDescendantCountOut(BaseModel):
+    id: UUID = Field(..., description="Идентификатор узла меню")
+    descendants: int = Field(..., description="Число всех потомков узла")
+
+
+class MenuRevisionOut(BaseModel):
+    revision: int = Field(
+        ..., description="Ревизия меню, растет при каждом изменении узлов или контента"
+    )
 
 
 class MenuNodeCreate(BaseModel):
@@ -112,6 +154,9 @@ class UserOut(UserCreate):
 
 class UsersListOut(BaseModel):
     items: list[UserOut] = Field(..., description="Список пользователей")
+    next_cursor: str | None = Field(
+        None, description="Курсор следующей страницы, null на последней"
+    )
 
 
 class HistoryCreate(BaseModel):
@@ -129,8 +174,32 @@ class HistoryOut(HistoryCreate):
     )  # Изменено
 
 
+class HistoryBulkItem(HistoryCreate):
+    user_id: str = Field(..., description="Идентификатор пользователя")
+
+
+class HistoryBulkCreate(BaseModel):
+    items: list[HistoryBulkItem] = Field(
+        ..., max_length=10000, description="Список действий пользователей"
+    )
+
+
+class HistoryBulkOut(BaseModel):
+    received: int = Field(..., description="Получено действий в пачке")
+    inserted: int = Field(..., description="Записано действий")
+    skipped_unknown_user: int = Field(
+        ..., description="Пропущено из-за неизвестного пользователя"
+    )
+    skipped_unknown_menu: int = Field(
+        ..., description="Пропущено из-за неизвестного узла меню"
+    )
+
+
 class HistoryListOut(BaseModel):
     items: list[HistoryOut] = Field(..., description="Список действий")
+    next_cursor: str | None = Field(
+        None, description="Курсор следующей страницы, null на последней"
+    )
 
 
 class RatingCreate(BaseModel):
@@ -159,6 +228,9 @@ class RatingListOut(BaseModel):
     """Схема для возврата списка всех оценок узла меню"""
     menu_id: UUID
     ratings: list[RatingDetailOut]
+    next_cursor: str | None = Field(
+        None, description="Курсор следующей страницы, null на последней"
+    )
 
 
 AllMenuNodeOut.model_rebuild()
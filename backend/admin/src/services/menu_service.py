@@ -3,8 +3,10 @@
 from uuid import UUID
 from typing import Sequence
 from src.utils.pagination import PaginatedParams
+from src.utils.menu_tree import build_menu_tree, menu_tree_cache
 from fastapi import Depends, HTTPException, status
 from sqlalchemy import select
+import orjson
 
 from src.db.db_engine import DBEngine, get_db_engine
 from src.models.nodes import MenuNode
@@ -12,7 +14,11 @@ from src.schemas.entity import (
     MenuNodeCreate,
     MenuNodeUpdate,
     MenuNodeOut,
-    AllMenuNodeOut,
+    MenuNodeChildOut,
+    MenuRevisionOut,
+    MenuNodeAncestorOut,
+    MenuBreadcrumbsOut,
+    MenuDescendantCountOut,
     ContentCreate,
     RatingCreate,
     RatingListOut,
@@ -23,6 +29,8 @@ from src.schemas.entity import (
 from .file_service import file_service
 from fastapi import UploadFile
 
+BREADCRUMBS_SEPARATOR = " / "
+
 
 class MenuService:
     """Сервис для работы с меню."""
@@ -30,27 +38,27 @@ class MenuService:
     def __init__(self, db_engine: DBEngine):
         self.db_engine = db_engine
 
-    async def _get_children_names(self, parent_id: UUID) -> list[str]:
-        stmt = select(MenuNode.name).where(MenuNode.parent_id == parent_id)
-        result = await self.db_engine.session.execute(stmt)
-        return result.scalars().all()
-
-    async def _build_menu_tree(
-        self, nodes: Sequence[MenuNodeOut]
-    ) -> list[AllMenuNodeOut]:
-        """Построение дерева меню из плоского списка."""
-        node_map = {
-            node.id: AllMenuNodeOut(**node.model_dump(), children=[]) for node in nodes
+    async def _get_children_by_parent_ids(
+        self, parent_ids: list[UUID]
+    ) -> dict[UUID, list[MenuNodeChildOut]]:
+        """Дочерние узлы сразу для нескольких родителей одним запросом."""
+        children: dict[UUID, list[MenuNodeChildOut]] = {
+            parent_id: [] for parent_id in parent_ids
         }
-        root_nodes = []
-
-        for node in nodes:
-            if node.parent_id and node.parent_id in node_map:
-                node_map[node.parent_id].children.append(node_map[node.id])
-            else:
-                root_nodes.append(node_map[node.id])
+        if not parent_ids:
+            return children
 
-        return root_nodes
+        stmt = (
+            select(MenuNode.parent_id, MenuNode.id, MenuNode.name)
+            .where(MenuNode.parent_id.in_(parent_ids))
+            .order_by(MenuNode.parent_id, MenuNode.name)
+        )
+        result = await self.db_engine.session.execute(stmt)
+        for row in result:
+            children[row.parent_id].append(
+                MenuNodeChildOut(id=row.id, name=row.name)
+            )
+        return children
 
     def _get_content_list(self, node: MenuNode) -> list[ContentOut]:
         """Получение списка контента для узла меню."""
@@ -78,126 +86,199 @@ class MenuService:
             )
         return node
 
-    async def get_full_menu(self) -> AllMenuNodeOut:
-        """Получение полного дерева меню."""
-        menu_nodes = await self.db_engine.get_full_menu()
+    async def get_full_menu(self) -> bytes:
+        """
+        Получение полного дерева меню в виде готового JSON.
+
+        Сериализованное дерево кэшируется до следующего изменения ревизии
+        меню, поэтому повторные запросы стоят одного чтения ревизии.
+        """
+        revision = await self.db_engine.get_menu_revision()
+        body = menu_tree_cache.get(revision)
+        if body is not None:
+            return body
+
+        async with menu_tree_cache.lock:
+            body = menu_tree_cache.get(revision)
+            if body is not None:
+                return body
+
+            menu_nodes = await self.db_engine.get_full_menu()
+            if not menu_nodes:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="No menu nodes found"
+                )
 
-        if not menu_nodes:
+            tree = build_menu_tree(menu_nodes) or {
+                "id": str(UUID(int=0)),
+                "parent_id": None,
+                "name": "Empty Menu",
+                "text": "No menu items available",
+                "subscription_type": None,
+                "content": [],
+                "children_names": [],
+                "children_nodes": [],
+                "children": [],
+            }
+            body = orjson.dumps(tree)
+            menu_tree_cache.set(revision, body)
+            return body
+
+    async def get_menu_subtree(self, menu_id: UUID, depth: int) -> bytes:
+        """
+        Получение ветки меню не глубже depth уровней в виде готового JSON.
+
+        У узлов на последнем уровне заполнены children_names и
+        children_nodes, а children пуст: так клиент видит, что ветку
+        можно загрузить глубже.
+        """
+        rows = await self.db_engine.get_menu_subtree(menu_id, depth)
+        if not rows:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="No menu nodes found"
+                status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
             )
 
-        node_out_list = [
-            MenuNodeOut(
-                id=node.id,
-                parent_id=node.parent_id,
-                name=node.name,
-                text=node.text,
-                subscription_type=node.subscription_type,
-                content=self._get_content_list(node),
-                children_names=[
-                    child.name for child in menu_nodes if child.parent_id == node.id
-                ],
+        leaf_ids = [node.id for node, level in rows if level == depth]
+        leaf_children = (
+            await self.db_engine.get_menu_children_rows(leaf_ids) if leaf_ids else []
+        )
+        tree = build_menu_tree((node for node, _ in rows), leaf_children)
+        return orjson.dumps(tree)
+
+    async def _get_lineage(self, menu_id: UUID) -> Sequence[MenuNode]:
+        lineage = await self.db_engine.get_menu_node_lineage(menu_id)
+        if not lineage:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
             )
-            for node in menu_nodes
+        return lineage
+
+    async def get_menu_node_ancestors(self, menu_id: UUID) -> list[MenuNodeAncestorOut]:
+        """Получение предков узла меню от корня к родителю."""
+        lineage = await self._get_lineage(menu_id)
+        return [
+            MenuNodeAncestorOut(
+                id=node.id, parent_id=node.parent_id, name=node.name, depth=depth
+            )
+            for depth, node in enumerate(lineage[:-1])
         ]
 
-        tree = await self._build_menu_tree(node_out_list)
-        return (
-            tree[0]
-            if tree
-            else AllMenuNodeOut(
-                id=UUID(int=0),
-                name="Empty Menu",
-                text="No menu items available",
-                content=[],
-                children_names=[],
-                children=[],
-            )
+    async def get_menu_node_breadcrumbs(self, menu_id: UUID) -> MenuBreadcrumbsOut:
+        """Получение навигационной цепочки от корня до узла меню."""
+        lineage = await self._get_lineage(menu_id)
+        return MenuBreadcrumbsOut(
+            items=[MenuNodeChildOut(id=node.id, name=node.name) for node in lineage],
+            text=BREADCRUMBS_SEPARATOR.join(node.name for node in lineage),
         )
 
-    async def get_menu_node_by_name(self, name: str) -> MenuNodeOut:
-        """Получение узла меню по имени."""
-        node = await self.db_engine.get_menu_node_by_name(name)
-        if not node:
+    async def count_menu_node_descendants(self, menu_id: UUID) -> MenuDescendantCountOut:
+        """Получение числа всех потомков узла меню."""
+        descendants = await self.db_engine.count_menu_descendants(menu_id)
+        if descendants is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
             )
+        return MenuDescendantCountOut(id=menu_id, descendants=descendants)
 
-        children_names = await self._get_children_names(node.id)
+    async def get_menu_revision(self) -> MenuRevisionOut:
+        """Получение текущей ревизии меню."""
+        revision = await self.db_engine.get_menu_revision()
+        return MenuRevisionOut(revision=revision)
 
+    def _node_out_from_row(self, row) -> MenuNodeOut:
+        """Преобразование строки DBEngine.get_menu_node_out в MenuNodeOut."""
+        children_ids = row.children_ids or []
+        children_names = row.children_names or []
         return MenuNodeOut(
-            id=node.id,
-            parent_id=node.parent_id,
-            name=node.name,
-            text=node.text,
-            subscription_type=node.subscription_type,
-            content=self._get_content_list(node),
+            id=row.id,
+            parent_id=row.parent_id,
+            name=row.name,
+            text=row.text,
+            subscription_type=row.subscription_type,
+            content=row.content or [],
             children_names=children_names,
+            children_nodes=[
+                MenuNodeChildOut(id=child_id, name=name)
+                for child_id, name in zip(children_ids, children_names)
+            ],
         )
 
+    async def get_menu_node_by_name(self, name: str) -> MenuNodeOut:
+        """Получение узла меню по имени."""
+        row = await self.db_engine.get_menu_node_out(MenuNode.name == name)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
+            )
+        return self._node_out_from_row(row)
+
     async def get_menu_root(self) -> MenuNodeOut:
         """Получение корневого узла меню."""
-        node = await self.db_engine.get_menu_root()
-        if not node:
+        row = await self.db_engine.get_menu_node_out(MenuNode.parent_id.is_(None))
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Root menu node not found"
             )
-
-        children_names = await self._get_children_names(node.id)
-
-        return MenuNodeOut(
-            id=node.id,
-            parent_id=node.parent_id,
-            name=node.name,
-            text=node.text,
-            subscription_type=node.subscription_type,
-            content=self._get_content_list(node),
-            children_names=children_names,
-        )
+        return self._node_out_from_row(row)
 
     async def get_menu_node_by_id(self, menu_id: UUID) -> MenuNodeOut:
         """Получение узла меню по ID."""
-        node = await self._get_node_by_id(menu_id)
-
-        children_names = await self._get_children_names(node.id)
-
-        return MenuNodeOut(
-            id=node.id,
-            parent_id=node.parent_id,
-            name=node.name,
-            text=node.text,
-            subscription_type=node.subscription_type,
-            content=self._get_content_list(node),
-            children_names=children_names,
-        )
-
-    async def search_menu_nodes(self, keywords: str) -> list[MenuNodeOut]:
-        """Поиск узлов меню по ключевым словам в названии или тексте."""
-        menu_nodes = await self.db_engine.search_menu_nodes(keywords)
-
-        if not menu_nodes:
+        row = await self.db_engine.get_menu_node_out(MenuNode.id == menu_id)
+        if not row:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No menu nodes found matching the keywords",
+                status_code=status.HTTP_404_NOT_FOUND, detail="Menu node not found"
             )
-
-        # Преобразование в MenuNodeOut с вычислением children_names
-        node_out_list = []
-        for node in menu_nodes:
-            children_names = await self._get_children_names(node.id)
-            node_out = MenuNodeOut(
+        return self._node_out_from_row(row)
+
+    async def _build_node_out_list(
+        self, menu_nodes: Sequence[MenuNode]
+    ) -> list[MenuNodeOut]:
+        """Преобразование узлов в MenuNodeOut, дочерние узлы одним запросом."""
+        children = await self._get_children_by_parent_ids(
+            [node.id for node in menu_nodes]
+        )
+        return [
+            MenuNodeOut(
                 id=node.id,
                 parent_id=node.parent_id,
                 name=node.name,
                 text=node.text,
                 subscription_type=node.subscription_type,
                 content=self._get_content_list(node),
-                children_names=children_names,
+                children_names=[child.name for child in children[node.id]],
+                children_nodes=children[node.id],
+            )
+            for node in menu_nodes
+        ]
+
+    async def get_menu_nodes_by_ids(self, menu_ids: list[UUID]) -> list[MenuNodeOut]:
+        """
+        Получение нескольких узлов меню по ID в порядке запроса.
+
+        Число запросов к БД не зависит от числа узлов: узлы, их контент
+        и дочерние узлы загружаются тремя запросами. Отсутствующие ID
+        пропускаются.
+        """
+        menu_ids = list(dict.fromkeys(menu_ids))
+        menu_nodes = await self.db_engine.get_menu_nodes_by_ids(menu_ids)
+        nodes_by_id = {node.id: node for node in menu_nodes}
+        return await self._build_node_out_list(
+            [nodes_by_id[menu_id] for menu_id in menu_ids if menu_id in nodes_by_id]
+        )
+
+    async def search_menu_nodes(
+        self, keywords: str, pagination: PaginatedParams
+    ) -> list[MenuNodeOut]:
+        """Поиск узлов меню по ключевым словам, самые релевантные первыми."""
+        menu_nodes = await self.db_engine.search_menu_nodes(keywords, pagination)
+
+        if not menu_nodes:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No menu nodes found matching the keywords",
             )
-            node_out_list.append(node_out)
 
-        return node_out_list
+        return await self._build_node_out_list(menu_nodes)
 
     async def add_menu_node(self, node_data: MenuNodeCreate) -> Message:
         """Добавление узла меню."""
@@ -315,6 +396,11 @@ class MenuService:
             not_useful_count=rating_summary["not_useful_count"],
         )
 
+    async def get_menu_rating_summaries(self) -> list[RatingSummaryOut]:
+        """Получение сводок по рейтингам всех оцененных узлов меню."""
+        rows = await self.db_engine.get_menu_rating_summaries()
+        return [RatingSummaryOut.model_validate(row) for row in rows]
+
     async def rate_menu_node(self, menu_id: UUID, rating_data: RatingCreate) -> Message:
         """Оценка узла меню (Полезно/Не очень)."""
         await self.db_engine.rate_menu_node(rating_data, menu_id)
@@ -5,7 +5,8 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from src.schemas.entity import HistoryCreate
 from src.services.telegram_bot import TelegramBot
-from src.db.db_engine import DBEngine
+from src.db.db_engine import create_db_engine
+from src.db.postgres import async_session_maker
 from src.utils.pagination import PaginatedParams  # если используешь пагинацию
 from src.core.settings import settings
 import logging
@@ -13,10 +14,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-def start_scheduler(
-    bot: TelegramBot,
-    db_engine: DBEngine,
-):
+def start_scheduler(bot: TelegramBot):
+    """
+    Запускает фоновые задачи.
+
+    Задачи могут выполняться одновременно, поэтому каждая открывает свою
+    сессию БД и сама завершает в ней транзакцию.
+    """
     scheduler = AsyncIOScheduler()
     scheduler.add_job(
         notify_inactive_users,
@@ -24,36 +28,64 @@ def start_scheduler(
             minutes=settings.reminder_polling_interval_in_minutes
         ),  # TODO заменить на час
         # IntervalTrigger(hours=1),
-        kwargs={"bot": bot, "db_engine": db_engine},
+        kwargs={"bot": bot},
         name="notify_inactive_users",
     )
+    scheduler.add_job(
+        reconcile_menu_rating_counters,
+        IntervalTrigger(
+            minutes=settings.rating_counter_reconcile_interval_in_minutes
+        ),
+        name="reconcile_menu_rating_counters",
+        next_run_time=datetime.datetime.now(),  # заполняет счетчики при старте
+    )
     scheduler.start()
 
 
-async def notify_inactive_users(bot: TelegramBot, db_engine: DBEngine):
+async def notify_inactive_users(bot: TelegramBot):
     logger.info("🔔 Запущена задача по проверке неактивных пользователей")
 
-    users = await db_engine.get_long_time_lost_users(
-        days_count=10, pagination=PaginatedParams(page_size=1000, page_number=1)
-    )
-    if not users:
-        logger.info("No long time lost users")
+    async with async_session_maker() as session:
+        db_engine = create_db_engine(session)
+        users = await db_engine.get_long_time_lost_users(
+            days_count=10, pagination=PaginatedParams(page_size=1000, page_number=1)
+        )
+        if not users:
+            logger.info("No long time lost users")
 
-    root_node = (  # корень нужен, чтобы назначить пользователю, что тот его посмотрел
-        await db_engine.get_menu_root()
-    )  # не знаю надо ли проверять есть ли корень
+        root_node = (  # корень нужен, чтобы назначить пользователю, что тот его посмотрел
+            await db_engine.get_menu_root()
+        )  # не знаю надо ли проверять есть ли корень
 
-    for user in users:
+        for user in users:
+            try:
+                await bot.send_message(
+                    user_id=int(user.id),
+                    text="Появились вопросы? Получите быстрый ответ в боте!",
+                )
+                await db_engine.create_history_record(
+                    user_id=user.id,
+                    history_data=HistoryCreate(
+                        menu_id=root_node.id, action_date=datetime.datetime.now()
+                    ),
+                )  # пользователю добавляется действие для того чтобы через час ему опять не пришло уведомление
+            except Exception as e:
+                await session.rollback()
+                logger.warning(f"Ошибка при отправке сообщения пользователю {user.id}: {e}")
+
+    logger.info(f"Статистика отправки в Telegram: {bot.stats()}")
+
+
+async def reconcile_menu_rating_counters():
+    async with async_session_maker() as session:
         try:
-            await bot.send_message(
-                user_id=int(user.id),
-                text="Появились вопросы? Получите быстрый ответ в боте!",
-            )
-            await db_engine.create_history_record(
-                user_id=user.id,
-                history_data=HistoryCreate(
-                    menu_id=root_node.id, action_date=datetime.datetime.now()
-                ),
-            )  # пользователю добавляется действие для того чтобы через час ему опять не пришло уведомление
+            fixed = await create_db_engine(session).reconcile_menu_rating_counters()
         except Exception as e:
-            logger.warning(f"Ошибка при отправке сообщения пользователю {user.id}: {e}")
+            await session.rollback()
+            logger.warning(f"Ошибка при сверке счетчиков оценок: {e}")
+            return
+
+    if fixed:
+        logger.warning(f"Сверка счетчиков оценок: исправлено счетчиков {fixed}")
+    else:
+        logger.info("Сверка счетчиков оценок: расхождений нет")
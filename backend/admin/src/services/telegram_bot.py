@@ -1,21 +1,82 @@
+import asyncio
+import logging
+import time
 from functools import lru_cache
+from typing import Dict
 
 from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.exceptions import TelegramRetryAfter
 from src.core.settings import settings
 
+logger = logging.getLogger(__name__)
+
 
 class TelegramBot:
-    def __init__(self, token: str):
+    """
+    Отправка рассылок от имени бота.
+
+    Админка пишет только в личные чаты и каждому пользователю одно
+    сообщение за рассылку, поэтому достаточно общего темпа: сообщения
+    уходят не чаще rate в секунду. Ответ 429 сдвигает следующую отправку
+    на retry_after секунд, после чего сообщение повторяется.
+    """
+
+    def __init__(self, token: str, rate: float, max_retries: int):
         self.bot = Bot(
             token=token, default=DefaultBotProperties(parse_mode=ParseMode.MARKDOWN)
         )
+        self.interval = 1 / rate
+        self.max_retries = max_retries
+        self.sent = 0
+        self.retries = 0
+        self.throttled_time = 0.0
+        self._next_send = 0.0
 
     async def send_message(self, user_id: int, text: str):
-        await self.bot.send_message(user_id, text)
+        attempt = 0
+        while True:
+            await self._wait_turn()
+            try:
+                await self.bot.send_message(user_id, text)
+                self.sent += 1
+                return
+            except TelegramRetryAfter as e:
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    f"Telegram ограничил отправку, повтор через {e.retry_after} с"
+                )
+                self._next_send = max(
+                    self._next_send, time.monotonic() + e.retry_after
+                )
+                if attempt > self.max_retries:
+                    raise
+
+    def stats(self) -> Dict[str, float]:
+        """Возвращает метрики отправки."""
+        return {
+            "sent": self.sent,
+            "retries": self.retries,
+            "throttled_time": round(self.throttled_time, 3),
+        }
+
+    async def _wait_turn(self) -> None:
+        # Время отправки резервируется до ожидания, поэтому одновременные
+        # вызовы встают в очередь друг за другом
+        now = time.monotonic()
+        slot = max(now, self._next_send)
+        self._next_send = slot + self.interval
+        if slot > now:
+            self.throttled_time += slot - now
+            await asyncio.sleep(slot - now)
 
 
 @lru_cache()
 def get_telegram_bot():
-    return TelegramBot(token=settings.bot_token)
+    return TelegramBot(
+        token=settings.bot_token,
+        rate=settings.telegram_global_rate,
+        max_retries=settings.telegram_max_retries,
+    )
@@ -10,6 +10,8 @@ from src.schemas.entity import (
     UsersListOut,
     QuestionCreate,
     HistoryCreate,
+    HistoryBulkCreate,
+    HistoryBulkOut,
     HistoryOut,
     QuestionOut,
     QuestionsListOut,
@@ -28,7 +30,7 @@ class UserService:
 
     async def get_users(self, pagination: PaginatedParams) -> UsersListOut:
         """Получение списка пользователей"""
-        users = await self.db_engine.get_users(pagination)
+        users, next_cursor = await self.db_engine.get_users(pagination)
         user_out_list = [
             UserOut(
                 id=str(user.id),
@@ -38,7 +40,7 @@ class UserService:
             )
             for user in users
         ]
-        return UsersListOut(items=user_out_list)
+        return UsersListOut(items=user_out_list, next_cursor=next_cursor)
 
     async def create_user(self, user_data: UserCreate) -> dict:
         """Создание пользователя"""
@@ -103,7 +105,7 @@ class UserService:
         sort_order: str = "desc"
     ) -> QuestionsListOut:
         """Получение всех вопросов с фильтрацией и сортировкой"""
-        questions = await self.db_engine.get_all_questions(
+        questions, next_cursor = await self.db_engine.get_all_questions(
             pagination,
             start_date,
             end_date,
@@ -121,7 +123,7 @@ class UserService:
             )
             for question in questions
         ]
-        return QuestionsListOut(items=question_out_list)
+        return QuestionsListOut(items=question_out_list, next_cursor=next_cursor)
 
     async def create_question(self, question_data: QuestionCreate) -> dict:
         """Создание вопроса"""
@@ -168,11 +170,19 @@ class UserService:
         history = await self.db_engine.create_history_record(user_id, history_data)
         return {"detail": "User action recorded successfully"}
 
+    async def create_user_action_records_bulk(
+        self, history_data: HistoryBulkCreate
+    ) -> HistoryBulkOut:
+        """Пакетное создание записей истории пользователей"""
+        return await self.db_engine.create_history_records(history_data.items)
+
     async def get_user_history(
         self, user_id: str, pagination: PaginatedParams
     ) -> HistoryListOut:
         """Получение истории пользователя"""
-        history_records = await self.db_engine.get_user_history(user_id, pagination)
+        history_records, next_cursor = await self.db_engine.get_user_history(
+            user_id, pagination
+        )
         history_out_list = [
             HistoryOut(
                 user_id=user_id,
@@ -183,7 +193,7 @@ class UserService:
             )
             for history_record in history_records
         ]
-        return HistoryListOut(items=history_out_list)
+        return HistoryListOut(items=history_out_list, next_cursor=next_cursor)
 
 
 def get_user_service(
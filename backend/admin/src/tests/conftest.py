@@ -1,4 +1,7 @@
 import pytest_asyncio
+from sqlalchemy import event
+
+from src.db.postgres import async_engine
 
 
 @pytest_asyncio.fixture
@@ -6,3 +9,17 @@ async def base_url():
     """Возвращает базовый url для запросов."""
 
     return 'http://admin-tests/api/v1'
+
+
+@pytest_asyncio.fixture
+async def query_counter():
+    """Считает SQL-запросы, отправленные в БД во время теста."""
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -2,6 +2,8 @@ import pytest
 import pytest_asyncio
 from fastapi import status
 from httpx import ASGITransport, AsyncClient
+from src.db.db_engine import DBEngine
+from src.db.postgres import async_session_maker
 from src.main import app
 from uuid import uuid4, UUID
 from datetime import datetime
@@ -26,6 +28,20 @@ async def test_get_full_menu(client: AsyncClient):
     assert "id" in response.json()  # Проверяем наличие корневого id
 
 
+async def test_get_full_menu_matches_root(client: AsyncClient):
+    """Тест: дерево из строк драйвера совпадает с корнем и кэшируется."""
+    root = (await client.get('/menu/root')).json()
+    first = await client.get('/menu/')
+    second = await client.get('/menu/')
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.content == second.content
+    tree = first.json()
+    assert tree["id"] == root["id"]
+    assert tree["children_nodes"] == root["children_nodes"]
+    for child in tree["children"]:
+        assert child["parent_id"] == root["id"]
+
+
 async def test_get_menu_node_by_name(client: AsyncClient):
     """Тест на получение узла меню по имени."""
     # Предполагаем, что существует узел с именем "root" или замените на реальное
@@ -43,6 +59,152 @@ async def test_get_menu_root(client: AsyncClient):
     assert response.json()["parent_id"] is None
 
 
+async def test_menu_root_children_nodes(client: AsyncClient):
+    """Тест на наличие пар (id, имя) дочерних узлов корня."""
+    response = await client.get('/menu/root')
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [child["name"] for child in data["children_nodes"]] == data["children_names"]
+    for child in data["children_nodes"]:
+        child_response = await client.get(f'/menu/{child["id"]}')
+        assert child_response.status_code == status.HTTP_200_OK
+        assert child_response.json()["name"] == child["name"]
+
+
+async def test_get_menu_nodes_by_ids(client: AsyncClient):
+    """Тест на получение нескольких узлов меню за один запрос."""
+    root = (await client.get('/menu/root')).json()
+    ids = [child["id"] for child in root["children_nodes"]]
+    response = await client.get(
+        '/menu/nodes', params=[("ids", menu_id) for menu_id in ids])
+    assert response.status_code == status.HTTP_200_OK
+    assert [node["id"] for node in response.json()] == ids
+
+
+async def test_post_menu_nodes_by_ids(client: AsyncClient):
+    """Тест на получение узлов меню по списку ID в теле запроса."""
+    root = (await client.get('/menu/root')).json()
+    ids = [root["id"]] + [child["id"] for child in root["children_nodes"]]
+    response = await client.post('/menu/nodes', json={"ids": ids + [str(uuid4())]})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [node["id"] for node in data] == ids
+    assert data[0]["children_nodes"] == root["children_nodes"]
+
+
+async def test_get_menu_subtree(client: AsyncClient):
+    """Тест на получение ветки меню с ограничением глубины."""
+    root = (await client.get('/menu/root')).json()
+    response = await client.get(f'/menu/{root["id"]}/subtree', params={"depth": 1})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["children_nodes"] == root["children_nodes"]
+    assert [child["name"] for child in data["children"]] == root["children_names"]
+    for child in data["children"]:
+        assert child["children"] == []
+        # Дети узлов на последнем уровне приходят из отдельного запроса
+        node = (await client.get(f'/menu/{child["id"]}')).json()
+        assert child["children_nodes"] == node["children_nodes"]
+
+
+async def test_get_menu_subtree_not_found(client: AsyncClient):
+    """Тест на получение ветки от несуществующего узла."""
+    response = await client.get(f'/menu/{uuid4()}/subtree')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_menu_node_lineage(client: AsyncClient):
+    """Тест на предков, навигационную цепочку и число потомков узла."""
+    root = (await client.get('/menu/root')).json()
+    child = root["children_nodes"][0]
+
+    response = await client.get(f'/menu/{child["id"]}/ancestors')
+    assert response.status_code == status.HTTP_200_OK
+    assert [(node["id"], node["depth"]) for node in response.json()] == [
+        (root["id"], 0)
+    ]
+
+    response = await client.get(f'/menu/{child["id"]}/breadcrumbs')
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()["items"]] == [
+        root["id"], child["id"]
+    ]
+
+    response = await client.get(f'/menu/{root["id"]}/descendants/count')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["descendants"] >= len(root["children_nodes"])
+
+
+async def test_menu_node_lineage_not_found(client: AsyncClient):
+    """Тест на предков и число потомков несуществующего узла."""
+    menu_id = uuid4()
+    assert (await client.get(f'/menu/{menu_id}/ancestors')).status_code == 404
+    assert (await client.get(f'/menu/{menu_id}/descendants/count')).status_code == 404
+
+
+async def test_search_menu_nodes(client: AsyncClient):
+    """Тест на полнотекстовый поиск с учетом словоформ и пагинацией."""
+    response = await client.get('/menu/search', params={"keywords": "слуха"})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert any("слух" in node["name"].lower() for node in data)
+
+    response = await client.get(
+        '/menu/search', params={"keywords": "слуха", "page_size": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == data[:1]
+
+
+async def test_search_menu_nodes_ignores_operators(client: AsyncClient):
+    """Тест: минус и кавычки в запросе не превращаются в операторы поиска."""
+    plain = await client.get('/menu/search', params={"keywords": "слуха детей"})
+    response = await client.get(
+        '/menu/search', params={"keywords": 'слуха -детей "or"'})
+    assert response.status_code == status.HTTP_200_OK
+    ids = {node["id"] for node in response.json()}
+    # "-детей" ищет слово "детей", а не исключает его
+    assert {node["id"] for node in plain.json()} <= ids
+
+
+async def test_menu_node_lookups_run_one_query(
+    client: AsyncClient, query_counter: list
+):
+    """Тест: узел с контентом и дочерними узлами читается одним запросом."""
+    root = (await client.get('/menu/root')).json()
+    child = root["children_nodes"][0]
+
+    for url, params in [
+        ('/menu/root', None),
+        (f'/menu/{child["id"]}', None),
+        ('/menu/search-by-name', {"name": child["name"]}),
+    ]:
+        query_counter.clear()
+        response = await client.get(url, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_counter) == 1, query_counter
+
+
+async def test_get_menu_revision(client: AsyncClient):
+    """Тест на получение ревизии меню."""
+    response = await client.get('/menu/revision')
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json()["revision"], int)
+
+
+async def test_menu_revision_changes_on_update(client: AsyncClient):
+    """Тест на рост ревизии после изменения меню."""
+    before = (await client.get('/menu/revision')).json()["revision"]
+    node_data = {
+        "parent_id": "00000000-0000-0000-0000-000000000003",
+        "name": f"Revision Node {uuid4()}",
+        "text": "Revision text",
+    }
+    response = await client.post('/menu/add', json=node_data)
+    assert response.status_code == status.HTTP_200_OK
+    after = (await client.get('/menu/revision')).json()["revision"]
+    assert after > before
+
+
 async def test_add_menu_node(client: AsyncClient):
     """Тест на добавление узла меню."""
     node_data = {
@@ -149,6 +311,60 @@ async def test_get_menu_ratings_all(client: AsyncClient):
         status.HTTP_200_OK, status.HTTP_404_NOT_FOUND]
 
 
+async def test_rate_menu_node_upsert(client: AsyncClient, query_counter: list):
+    """Тест: повторная оценка меняет прежнюю и пишется одним запросом."""
+    menu_id = "00000000-0000-0000-0000-000000000001"
+    for is_useful in [True, False]:
+        query_counter.clear()
+        response = await client.post(
+            f'/menu/{menu_id}/rate',
+            json={"user_id": "user_001", "is_useful": is_useful},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(query_counter) == 1, query_counter
+
+    ratings = (await client.get(f'/menu/{menu_id}/rates-all')).json()["ratings"]
+    user_ratings = [r for r in ratings if r["user_id"] == "user_001"]
+    assert len(user_ratings) == 1
+    assert user_ratings[0]["is_useful"] is False
+
+
+async def test_rate_menu_node_unknown_user(client: AsyncClient):
+    """Тест: оценка от несуществующего пользователя возвращает 404."""
+    response = await client.post(
+        '/menu/00000000-0000-0000-0000-000000000001/rate',
+        json={"user_id": f"missing_{uuid4()}", "is_useful": True},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_get_menu_rating_summaries(client: AsyncClient):
+    """Тест: сводка по всем узлам совпадает со сводкой отдельного узла."""
+    response = await client.get('/menu/ratings/summary')
+    assert response.status_code == status.HTTP_200_OK
+    summaries = response.json()
+    assert summaries
+    summary = summaries[0]
+    single = (await client.get(f'/menu/{summary["menu_id"]}/rate')).json()
+    assert single == summary
+
+
+async def test_rating_counters_follow_vote_flip(client: AsyncClient):
+    """Тест: смена оценки переносит голос между счетчиками, сверка их не меняет."""
+    menu_id = "00000000-0000-0000-0000-000000000001"
+    rating = {"user_id": "user_002", "is_useful": True}
+    await client.post(f'/menu/{menu_id}/rate', json=rating)
+    before = (await client.get(f'/menu/{menu_id}/rate')).json()
+
+    await client.post(f'/menu/{menu_id}/rate', json={**rating, "is_useful": False})
+    after = (await client.get(f'/menu/{menu_id}/rate')).json()
+    assert after["useful_count"] == before["useful_count"] - 1
+    assert after["not_useful_count"] == before["not_useful_count"] + 1
+
+    async with async_session_maker() as session:
+        assert await DBEngine(session).reconcile_menu_rating_counters() == 0
+
+
 async def test_create_user(client: AsyncClient):
     """Тест на создание пользователя."""
     user_data = {
@@ -101,3 +101,167 @@ async def test_get_user_history(base_url: str):
         )
         response = await client.get(f'/users/{user_id}/history')
         assert response.status_code == status.HTTP_200_OK
+
+
+async def test_create_user_history_bulk(base_url: str):
+    """Тест пакетного добавления истории пользователей."""
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=base_url
+    ) as client:
+        user_id = str(uuid.uuid4())
+        await client.post(
+            '/users/create',
+            json={
+                'id': user_id,
+                'phone_number': ''
+            }
+        )
+        response = await client.post(
+            '/users/history/bulk',
+            json={
+                'items': [
+                    {
+                        'user_id': user_id,
+                        'menu_id': '00000000-0000-0000-0000-000000000001',
+                        'action_date': '2024-01-15T10:00:00'
+                    },
+                    {
+                        'user_id': str(uuid.uuid4()),
+                        'menu_id': '00000000-0000-0000-0000-000000000001',
+                        'action_date': '2024-01-15T10:00:00'
+                    }
+                ]
+            }
+        )
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()
+        assert stats['received'] == 2
+        assert stats['inserted'] == 1
+        assert stats['skipped_unknown_user'] == 1
+
+
+async def test_get_users_cursor_pagination(base_url: str):
+    """Тест: страницы по курсору совпадают со страницами по номеру."""
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=base_url
+    ) as client:
+        by_number = []
+        for page_number in [1, 2, 3]:
+            response = await client.get(
+                '/users/users',
+                params={'page_size': 1, 'page_number': page_number}
+            )
+            by_number += response.json()['items']
+
+        by_cursor = []
+        params = {'page_size': 1}
+        for _ in range(3):
+            response = await client.get('/users/users', params=params)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            by_cursor += page['items']
+            params['cursor'] = page['next_cursor']
+        assert by_cursor == by_number
+
+
+async def test_get_user_history_cursor_pagination(base_url: str):
+    """Тест: курсор истории доходит до последней страницы без повторов."""
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=base_url
+    ) as client:
+        user_id = str(uuid.uuid4())
+        await client.post(
+            '/users/create',
+            json={
+                'id': user_id,
+                'phone_number': ''
+            }
+        )
+        # Одинаковые даты: порядок внутри них задает id
+        await client.post(
+            '/users/history/bulk',
+            json={
+                'items': [
+                    {
+                        'user_id': user_id,
+                        'menu_id': '00000000-0000-0000-0000-000000000001',
+                        'action_date': f'2024-01-{day:02d}T10:00:00'
+                    }
+                    for day in [1, 1, 1, 2, 3]
+                ]
+            }
+        )
+
+        action_ids = []
+        params = {'page_size': 2}
+        while True:
+            response = await client.get(f'/users/{user_id}/history', params=params)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            action_ids += [item['action_id'] for item in page['items']]
+            if page['next_cursor'] is None:
+                break
+            params['cursor'] = page['next_cursor']
+        assert len(action_ids) == len(set(action_ids)) == 5
+
+
+async def test_get_users_invalid_cursor(base_url: str):
+    """Тест: поврежденный курсор возвращает 400."""
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=base_url
+    ) as client:
+        response = await client.get('/users/users', params={'cursor': 'broken'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_get_questions_cursor_pagination(base_url: str):
+    """Тест: курсор по таблице с UUID-ключом строится и читается."""
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url=base_url
+    ) as client:
+        user_id = str(uuid.uuid4())
+        await client.post(
+            '/users/create',
+            json={
+                'id': user_id,
+                'phone_number': ''
+            }
+        )
+        for number in range(3):
+            await client.post(
+                '/users/questions/create',
+                json={
+                    'user_id': user_id,
+                    'text': f'Question {number}?'
+                }
+            )
+
+        # В режиме OFFSET next_cursor тоже строится из id записи
+        response = await client.get(
+            '/users/questions',
+            params={'page_size': 1, 'page_number': 1}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['next_cursor'] is not None
+
+        question_ids = []
+        params = {'page_size': 1}
+        while True:
+            response = await client.get('/users/questions', params=params)
+            assert response.status_code == status.HTTP_200_OK
+            page = response.json()
+            question_ids += [item['id'] for item in page['items']]
+            if page['next_cursor'] is None:
+                break
+            params['cursor'] = page['next_cursor']
+        assert len(question_ids) == len(set(question_ids)) >= 3
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any, Iterable
+from uuid import UUID
+
+from src.models.nodes import MenuNode
+
+
+def build_menu_tree(
+    nodes: Iterable[MenuNode],
+    leaf_children: Iterable[tuple[UUID, UUID, str]] = (),
+) -> dict[str, Any] | None:
+    """
+    Построение дерева меню из плоского списка узлов за линейное время.
+
+    Узлы сразу превращаются в словари с полями AllMenuNodeOut, а дочерние
+    узлы добавляются к родителю по словарю id -> узел, без промежуточных
+    моделей pydantic. Порядок дочерних узлов совпадает с порядком во входном
+    списке. Возвращает первый корневой узел или None для пустого списка.
+
+    Идентификаторы записываются строками: asyncpg отдает их своим типом
+    UUID, который orjson не сериализует.
+
+    leaf_children - строки (parent_id, id, name) дочерних узлов, которые не
+    загружались (например, ниже ограничения глубины): они попадают в
+    children_names и children_nodes родителя, но не в children.
+    """
+    entries: dict[UUID, dict[str, Any]] = {}
+    parents: list[tuple[UUID | None, dict[str, Any]]] = []
+    for node in nodes:
+        entry = {
+            "id": str(node.id),
+            "parent_id": str(node.parent_id) if node.parent_id else None,
+            "name": node.name,
+            "text": node.text,
+            "subscription_type": node.subscription_type,
+            "content": [
+                {
+                    "id": str(c.id),
+                    "menu_id": str(c.menu_id),
+                    "type": c.type,
+                    "server_path": c.server_path,
+                    "created_at": c.created_at,
+                    "updated_at": c.updated_at,
+                }
+                for c in node.content
+            ],
+            "children_names": [],
+            "children_nodes": [],
+            "children": [],
+        }
+        entries[node.id] = entry
+        parents.append((node.parent_id, entry))
+
+    roots = []
+    for parent_id, entry in parents:
+        parent = entries.get(parent_id) if parent_id else None
+        if parent is None:
+            roots.append(entry)
+            continue
+        parent["children_names"].append(entry["name"])
+        parent["children_nodes"].append({"id": entry["id"], "name": entry["name"]})
+        parent["children"].append(entry)
+
+    for parent_id, child_id, name in leaf_children:
+        parent = entries.get(parent_id)
+        if parent is not None and child_id not in entries:
+            parent["children_names"].append(name)
+            parent["children_nodes"].append({"id": str(child_id), "name": name})
+
+    return roots[0] if roots else None
+
+
+class MenuTreeCache:
+    """
+    Кэш сериализованного дерева меню.
+
+    Хранит готовое тело ответа для одной ревизии меню. Ревизию повышают
+    триггеры БД при любом изменении узлов и контента, поэтому кэш
+    сбрасывается со следующим изменением меню, в том числе сделанным
+    другим процессом.
+    """
+
+    def __init__(self):
+        self.revision: int | None = None
+        self.body: bytes | None = None
+        self.lock = asyncio.Lock()
+
+    def get(self, revision: int) -> bytes | None:
+        if self.revision == revision:
+            return self.body
+        return None
+
+    def set(self, revision: int, body: bytes) -> None:
+        self.revision = revision
+        self.body = body
+
+
+menu_tree_cache = MenuTreeCache()
@@ -1,16 +1,44 @@
-from fastapi import Query
+import base64
+import binascii
+from datetime import datetime
+from typing import Annotated, Any, Sequence, TypeVar
+
+import orjson
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
 
 
 class PaginatedParams:
+    """
+    Параметры пагинации.
+
+    Без cursor страница выбирается через OFFSET по page_number. С cursor
+    (значение next_cursor из предыдущего ответа) следующая страница
+    выбирается по ключу сортировки и id: запрос идет по индексу с места,
+    где закончилась прошлая страница, и не зависит от ее номера.
+    """
+
     def __init__(
         self,
         page_size: int = Query(
             50, ge=1, le=100, description="Количество записей на странице"
         ),
         page_number: int = Query(1, ge=1, description="Номер страницы"),
+        cursor: Annotated[
+            str | None,
+            Query(
+                max_length=512,
+                description="Курсор следующей страницы из next_cursor; "
+                "если задан, page_number не используется",
+            ),
+        ] = None,
     ):
         self.page_size = page_size
         self.page_number = page_number
+        self.cursor = cursor
 
     @property
     def offset(self) -> int:
@@ -19,3 +47,93 @@ class PaginatedParams:
     @property
     def limit(self) -> int:
         return self.page_size
+
+    def paginate(
+        self,
+        stmt: Select,
+        *columns: InstrumentedAttribute,
+        descending: bool = False,
+    ) -> Select:
+        """
+        Сортирует запрос по columns и ограничивает его одной страницей.
+
+        Последняя колонка должна быть уникальной (обычно id), иначе курсор
+        не определяет позицию однозначно. Выбирается на одну запись больше
+        страницы, чтобы page() понял, есть ли следующая.
+        """
+        stmt = stmt.order_by(
+            *(column.desc() if descending else column.asc() for column in columns)
+        )
+        if self.cursor is None:
+            return stmt.offset(self.offset).limit(self.limit + 1)
+
+        values = _decode_cursor(self.cursor, columns, descending)
+        key = tuple_(*columns)
+        bound = tuple_(*(literal(value) for value in values))
+        return stmt.where(key < bound if descending else key > bound).limit(
+            self.limit + 1
+        )
+
+    def page(
+        self,
+        items: Sequence[T],
+        *columns: InstrumentedAttribute,
+        descending: bool = False,
+    ) -> tuple[list[T], str | None]:
+        """Обрезает результат paginate() до страницы и строит next_cursor."""
+        items = list(items)
+        if len(items) <= self.limit:
+            return items, None
+        items = items[: self.limit]
+        last = items[-1]
+        return items, _encode_cursor(
+            [getattr(last, column.key) for column in columns], columns, descending
+        )
+
+
+def _encode_cursor(
+    values: list[Any],
+    columns: Sequence[InstrumentedAttribute],
+    descending: bool,
+) -> str:
+    """
+    Кодирует значения ключа в курсор.
+
+    UUID из драйвера (asyncpg.pgproto.UUID) orjson не сериализует, поэтому
+    такие значения пишутся строкой; _decode_cursor приводит их обратно по
+    типу колонки.
+    """
+    payload = {
+        "k": [column.key for column in columns],
+        "d": descending,
+        "v": values,
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload, default=str)).decode().rstrip("=")
+
+
+def _decode_cursor(
+    cursor: str,
+    columns: Sequence[InstrumentedAttribute],
+    descending: bool,
+) -> list[Any]:
+    """Значения ключа из курсора, приведенные к типам колонок."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        if (
+            payload["k"] != [column.key for column in columns]
+            or payload["d"] != descending
+        ):
+            raise ValueError("cursor was built for another sort order")
+        values = []
+        for raw, column in zip(payload["v"], columns, strict=True):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(raw))
+            else:
+                values.append(python_type(raw))
+        return values
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -0,0 +1,110 @@
+"""
+Микробенчмарк задержки API.get_menu_by_id.
+
+Сравнивает старую схему (новая aiohttp.ClientSession на каждый запрос)
+с общей сессией и пулом соединений. Поднимает локальный HTTP-сервер,
+имитирующий API администрирования, и выводит p50/p99 в миллисекундах.
+
+Запуск из каталога backend/bot:
+    python benchmarks/menu_api_latency.py --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+os.environ.setdefault('BOT_TOKEN', '0:benchmark')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+
+from menu_api import API  # noqa: E402
+from models import Menu  # noqa: E402
+
+MENU_ID = '00000000-0000-0000-0000-000000000001'
+MENU_DATA = {
+    'id': MENU_ID,
+    'parent_id': None,
+    'name': 'Главное меню',
+    'text': 'Текст меню',
+    'subscription_type': 'free',
+    'content': [],
+    'children_names': [f'Пункт {i}' for i in range(5)],
+}
+
+
+async def _menu_handler(request: web.Request) -> web.Response:
+    return web.json_response(MENU_DATA)
+
+
+async def _start_server() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_get('/menu/{menu_id}', _menu_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+async def _get_menu_with_new_session(api_url: str, timeout) -> Menu:
+    """Прежнее поведение: отдельная сессия на каждый вызов."""
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(f'{api_url}/menu/{MENU_ID}') as response:
+            return Menu(await response.json())
+
+
+async def _measure(call, requests: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def _report(title: str, latencies: list[float]) -> None:
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f'{title:<24} p50={percentiles[49]:7.3f} ms  '
+        f'p99={percentiles[98]:7.3f} ms  n={len(latencies)}'
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    runner, api_url = await _start_server()
+    api = API()
+    api.api_url = api_url
+
+    try:
+        before = await _measure(
+            lambda: _get_menu_with_new_session(api_url, api.timeout),
+            requests, concurrency)
+        after = await _measure(
+            lambda: api.get_menu_by_id(MENU_ID), requests, concurrency)
+    finally:
+        await api.close()
+        await runner.cleanup()
+
+    _report('Сессия на запрос', before)
+    _report('Общая сессия', after)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,159 @@
+"""
+Бенчмарк памяти моделей меню и состояния FSM.
+
+Строит кэш из заданного числа узлов меню и состояние FSM для заданного
+числа активных пользователей. Сравнивает прежнюю схему (модели со
+словарем атрибутов, json, копии имен и контента в состоянии каждого
+пользователя) с текущей (__slots__, orjson, в состоянии только ID).
+
+Запуск из каталога backend/bot:
+    python benchmarks/model_memory.py --nodes 10000 --users 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+import orjson
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+os.environ.setdefault('BOT_TOKEN', '0:benchmark')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+
+from models import Menu  # noqa: E402
+
+CHILDREN = 6
+CONTENTS = 2
+
+
+class LegacyContent:
+    """Прежняя модель контента."""
+
+    def __init__(self, data):
+        self.id = data.get('id')
+        self.menu_id = data.get('menu_id')
+        self.type = data.get('type')
+        self.server_path = data.get('server_path')
+        self.created_at = data.get('created_at')
+        self.updated_at = data.get('updated_at')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'menu_id': self.menu_id,
+            'type': self.type,
+            'server_path': self.server_path,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+        }
+
+
+class LegacyMenu:
+    """Прежняя модель меню."""
+
+    def __init__(self, data):
+        self.id = data.get('id')
+        self.parent_id = data.get('parent_id')
+        self.name = data.get('name')
+        self.text = data.get('text')
+        self.subscription_type = data.get('subscription_type')
+        self.content = [LegacyContent(c) for c in data.get('content', [])]
+        self.children_names = data.get('children_names', [])
+        self.children_ids = [
+            str(child.get('id')) for child in data.get('children_nodes', [])
+        ]
+
+
+def _node_id(index: int) -> str:
+    return f'00000000-0000-0000-0000-{index:012d}'
+
+
+def _payload(nodes: int) -> bytes:
+    """JSON, который API отдает по узлам меню."""
+    items = []
+    for index in range(nodes):
+        children = [
+            {'id': _node_id((index * CHILDREN + i) % nodes),
+             'name': f'Пункт {(index * CHILDREN + i) % nodes}'}
+            for i in range(CHILDREN)
+        ]
+        items.append({
+            'id': _node_id(index),
+            'parent_id': _node_id(index // CHILDREN),
+            'name': f'Пункт {index}',
+            'text': f'Текст раздела {index}. ' * 10,
+            'subscription_type': 'free',
+            'content': [
+                {'id': f'{_node_id(index)}-{i}', 'menu_id': _node_id(index),
+                 'type': 1, 'server_path': f'uploaded_content/{index}_{i}.jpg',
+                 'created_at': '2024-01-15T10:00:00',
+                 'updated_at': '2024-01-15T10:00:00'}
+                for i in range(CONTENTS)
+            ],
+            'children_names': [child['name'] for child in children],
+            'children_nodes': children,
+        })
+    return orjson.dumps(items)
+
+
+def _legacy(payload: bytes, users: int):
+    menus = [LegacyMenu(item) for item in json.loads(payload)]
+    states = {}
+    for user_id in range(users):
+        menu = menus[user_id % len(menus)]
+        states[user_id] = {
+            'current_menu_id': menu.id,
+            'current_children': list(menu.children_names),
+            'current_children_ids': list(menu.children_ids),
+            'current_content': [c.to_dict() for c in menu.content],
+            'rating_shown': False,
+            'last_history_menu_id': menu.id,
+        }
+    return menus, states
+
+
+def _current(payload: bytes, users: int):
+    menus = [Menu(item) for item in orjson.loads(payload)]
+    states = {}
+    for user_id in range(users):
+        menu = menus[user_id % len(menus)]
+        states[user_id] = {
+            'current_menu_id': menu.id,
+            'current_children_ids': menu.children_ids,
+            'rating_shown': False,
+            'last_history_menu_id': menu.id,
+        }
+    return menus, states
+
+
+def _measure(build, payload: bytes, users: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    result = build(payload, users)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 2**20
+
+
+def main(nodes: int, users: int) -> None:
+    payload = _payload(nodes)
+    legacy = _measure(_legacy, payload, users)
+    current = _measure(_current, payload, users)
+
+    print(f'Узлов: {nodes}, пользователей: {users}')
+    print(f'{"Прежние модели":<16} {legacy:8.1f} МБ')
+    print(f'{"__slots__ и ID":<16} {current:8.1f} МБ  '
+          f'(-{(1 - current / legacy) * 100:.0f}%)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--nodes', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+    main(args.nodes, args.users)
@@ -0,0 +1,77 @@
+"""
+Микробенчмарк отрисовки меню на одно нажатие.
+
+Сравнивает построение текста и клавиатуры с нуля на каждое нажатие
+(create_menu_keyboard и f-строка) с кэшем RenderCache. Нажатия
+распределены по нескольким узлам меню, как у реальных пользователей.
+
+Запуск из каталога backend/bot:
+    python benchmarks/render_cost.py --clicks 100000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+os.environ.setdefault('BOT_TOKEN', '0:benchmark')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+
+from keyboards import create_menu_keyboard  # noqa: E402
+from models import Menu  # noqa: E402
+from utils.render_cache import RenderCache  # noqa: E402
+
+REVISION = 1
+
+
+def _menu(index: int) -> Menu:
+    children = [
+        {'id': f'00000000-0000-0000-{index:04d}-{i:012d}', 'name': f'Пункт {i}'}
+        for i in range(8)
+    ]
+    return Menu({
+        'id': f'00000000-0000-0000-0000-{index:012d}',
+        'parent_id': '00000000-0000-0000-0000-000000000000',
+        'name': f'Раздел {index}',
+        'text': 'Текст раздела меню. ' * 20,
+        'content': [{'id': str(i), 'type': i % 3 + 1} for i in range(3)],
+        'children_names': [child['name'] for child in children],
+        'children_nodes': children,
+    })
+
+
+def _render_uncached(menu: Menu) -> tuple:
+    return (
+        f'<b>{menu.name}</b>\n\n{menu.text}',
+        create_menu_keyboard(menu, is_root=False),
+    )
+
+
+def _measure(render, menus: list, clicks: int) -> float:
+    started = time.perf_counter()
+    for click in range(clicks):
+        render(menus[click % len(menus)])
+    return (time.perf_counter() - started) / clicks * 1_000_000
+
+
+def main(clicks: int, nodes: int) -> None:
+    menus = [_menu(i) for i in range(nodes)]
+    cache = RenderCache(max_size=nodes * 2)
+
+    before = _measure(_render_uncached, menus, clicks)
+    after = _measure(
+        lambda menu: cache.render(menu, False, REVISION), menus, clicks)
+
+    print(f'{"Без кэша":<10} {before:8.2f} мкс/нажатие')
+    print(f'{"С кэшем":<10} {after:8.2f} мкс/нажатие  (x{before / after:.0f})')
+    print(f'Попаданий: {cache.hits}, промахов: {cache.misses}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clicks', type=int, default=100000)
+    parser.add_argument('--nodes', type=int, default=50)
+    args = parser.parse_args()
+    main(args.clicks, args.nodes)
@@ -0,0 +1,108 @@
+"""
+Бенчмарк памяти хранилища состояния пользователей.
+
+Имитирует заданное число пользователей, каждый из которых проходит
+по нескольким меню и оценивает одно из них. Сравнивает прежние
+неограниченные словари с хранилищами MemoryStorage и SQLiteStorage
+и выводит объем памяти Python (tracemalloc) по ходу прогона.
+
+Запуск из каталога backend/bot:
+    python benchmarks/storage_memory.py --users 1000000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+os.environ.setdefault('BOT_TOKEN', '0:benchmark')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+
+from utils.storage import (  # noqa: E402
+    MemoryStorage, SQLiteStorage, Storage, UserStore)
+
+MENU_IDS = [f'00000000-0000-0000-0000-{i:012d}' for i in range(1, 6)]
+CHECKPOINTS = 5
+
+
+class DictStorage(Storage):
+    """Прежнее поведение: обычный словарь без ограничений."""
+
+    def __init__(self):
+        self._entries = {}
+
+    async def get(self, key, default=None):
+        return self._entries.get(key, default)
+
+    async def set(self, key, value):
+        self._entries[key] = value
+
+    async def delete(self, key):
+        self._entries.pop(key, None)
+
+    async def add_scheduled(self, key, member, due):
+        self._entries.setdefault(key, {})[member] = due
+
+    async def remove_scheduled(self, key, members):
+        for member in members:
+            self._entries.get(key, {}).pop(member, None)
+
+    async def get_scheduled(self, key, until=None):
+        return sorted(
+            ((member, due) for member, due in self._entries.get(key, {}).items()
+             if until is None or due <= until),
+            key=lambda item: item[1])
+
+    def stats(self):
+        return {'size': len(self._entries)}
+
+
+async def _simulate(title: str, storage: Storage, users: int) -> None:
+    navigation_stack = UserStore(storage, 'nav')
+    rated_menus = UserStore(storage, 'rated')
+    step = max(users // CHECKPOINTS, 1)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for user_id in range(users):
+        await navigation_stack.set(user_id, MENU_IDS[:3])
+        await rated_menus.set(user_id, [MENU_IDS[user_id % len(MENU_IDS)]])
+        if (user_id + 1) % step == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            print(
+                f'{title:<8} пользователей={user_id + 1:>9}  '
+                f'память={current / 2**20:8.1f} МБ')
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    print(f'{title:<8} {elapsed:.1f} с, статистика: {storage.stats()}\n')
+    await storage.close()
+
+
+async def main(users: int, max_entries: int, with_sqlite: bool) -> None:
+    ttl = 3600
+    await _simulate('dict', DictStorage(), users)
+    await _simulate('memory', MemoryStorage(max_entries, ttl), users)
+    if with_sqlite:
+        with tempfile.TemporaryDirectory() as tmp:
+            await _simulate(
+                'sqlite',
+                SQLiteStorage(f'{tmp}/storage.sqlite3', max_entries, ttl),
+                users)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--max-entries', type=int, default=10000)
+    parser.add_argument(
+        '--sqlite', action='store_true',
+        help='также прогнать SQLiteStorage (медленно на 1M пользователей)')
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.max_entries, args.sqlite))
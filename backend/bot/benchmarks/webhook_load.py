@@ -0,0 +1,127 @@
+"""
+Нагрузочный тест приема обновлений через вебхук.
+
+Отправляет синтетические обновления Telegram (текстовые сообщения от
+разных пользователей) на вебхук и выводит число принятых и
+обработанных обновлений в секунду. По умолчанию поднимает вебхук
+локально с обработчиком-заглушкой, который имитирует задержку
+обработки; с --url нагружает уже запущенного бота (BOT_MODE=webhook).
+
+Запуск из каталога backend/bot:
+    python benchmarks/webhook_load.py --updates 20000 --concurrency 200
+    python benchmarks/webhook_load.py --url http://localhost/bot/webhook \\
+        --secret <WEBHOOK_SECRET>
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+os.environ.setdefault('BOT_TOKEN', '0:benchmark')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+
+from aiogram import Bot, Dispatcher, Router  # noqa: E402
+from aiogram.types import Message  # noqa: E402
+
+from webhook import (  # noqa: E402
+    SECRET_HEADER, WebhookHandler, create_webhook_app)
+
+PATH = '/bot/webhook'
+
+
+def _update(update_id: int) -> dict:
+    user_id = 100000 + update_id % 5000
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': 'Test'},
+            'text': 'Проверка',
+        },
+    }
+
+
+async def _start_local(delay: float, max_concurrency: int):
+    router = Router()
+
+    @router.message()
+    async def on_message(message: Message) -> None:
+        await asyncio.sleep(delay)
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    bot = Bot(token=os.environ['BOT_TOKEN'])
+    handler = WebhookHandler(
+        dp, bot, secret='', max_concurrency=max_concurrency)
+
+    runner = web.AppRunner(create_webhook_app(handler, PATH), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, bot, handler, f'http://127.0.0.1:{port}{PATH}'
+
+
+async def _load(url: str, secret: str, updates: int, concurrency: int) -> float:
+    headers = {SECRET_HEADER: secret} if secret else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def post(update_id: int) -> None:
+            async with semaphore:
+                async with session.post(
+                        url, json=_update(update_id), headers=headers) as r:
+                    r.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(i) for i in range(updates)))
+        return time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.url:
+        elapsed = await _load(
+            args.url, args.secret, args.updates, args.concurrency)
+        print(f'Принято: {args.updates / elapsed:10.1f} обновлений/с')
+        return
+
+    runner, bot, handler, url = await _start_local(
+        args.handler_delay, args.max_concurrency)
+    try:
+        started = time.perf_counter()
+        accepted = await _load(url, '', args.updates, args.concurrency)
+        await handler.drain()
+        processed = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+        await bot.session.close()
+
+    print(f'Принято:     {args.updates / accepted:10.1f} обновлений/с')
+    print(
+        f'Обработано:  {handler.processed / processed:10.1f} обновлений/с '
+        f'({handler.processed} из {args.updates})')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='')
+    parser.add_argument('--secret', default='')
+    parser.add_argument('--updates', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument(
+        '--max-concurrency', type=int, default=100,
+        help='WEBHOOK_MAX_CONCURRENCY для локального вебхука')
+    parser.add_argument(
+        '--handler-delay', type=float, default=0.01,
+        help='имитация времени обработки обновления, в секундах')
+    asyncio.run(main(parser.parse_args()))
@@ -14,6 +14,72 @@ class Config:
     BOT_TOKEN = env.str('BOT_TOKEN')
     API_URL = env.str('API_URL')
     API_TIMEOUT = env.int('API_TIMEOUT')  # Время ожидания ответа в секундах
+    # Пул соединений с API администрирования
+    API_POOL_LIMIT = env.int('API_POOL_LIMIT', default=100)
+    API_POOL_LIMIT_PER_HOST = env.int('API_POOL_LIMIT_PER_HOST', default=30)
+    API_KEEPALIVE_TIMEOUT = env.float(
+        'API_KEEPALIVE_TIMEOUT', default=30)  # Секунды
+    API_DNS_CACHE_TTL = env.int('API_DNS_CACHE_TTL', default=300)  # Секунды
+    # Повторы GET-запросов к API с экспоненциальной задержкой и джиттером
+    API_RETRIES = env.int('API_RETRIES', default=2)
+    API_RETRY_BACKOFF = env.float('API_RETRY_BACKOFF', default=0.2)  # Секунды
+    # Выключатель: после скольких ошибок подряд и на сколько секунд
+    # прекращать запросы к API
+    API_BREAKER_FAILURES = env.int('API_BREAKER_FAILURES', default=5)
+    API_BREAKER_RESET = env.float('API_BREAKER_RESET', default=30)
+    # Stale-while-revalidate для меню: ответ свежий API_SWR_FRESH_TTL
+    # секунд, устаревший отдается не дольше API_SWR_MAX_STALE секунд
+    API_SWR_FRESH_TTL = env.float('API_SWR_FRESH_TTL', default=30)
+    API_SWR_MAX_STALE = env.float('API_SWR_MAX_STALE', default=86400)
+    API_SWR_CACHE_SIZE = env.int('API_SWR_CACHE_SIZE', default=1000)
+    # Интервал проверки ревизии меню для обновления кэша, в секундах
+    MENU_CACHE_REFRESH_INTERVAL = env.int(
+        'MENU_CACHE_REFRESH_INTERVAL', default=60)
+    # Сколько отрисованных меню держать в памяти
+    RENDER_CACHE_SIZE = env.int('RENDER_CACHE_SIZE', default=1000)
+    # Кэш file_id Telegram для локальных файлов
+    FILE_ID_CACHE_PATH = env.str(
+        'FILE_ID_CACHE_PATH', default='data/file_id_cache.json')
+    # Служебный чат для предзагрузки файлов при старте (0 - отключено)
+    FILE_ID_CACHE_PREFILL_CHAT_ID = env.int(
+        'FILE_ID_CACHE_PREFILL_CHAT_ID', default=0)
+    # Отложенная запись истории навигации пачками
+    HISTORY_BATCH_SIZE = env.int('HISTORY_BATCH_SIZE', default=100)
+    HISTORY_FLUSH_INTERVAL = env.float(
+        'HISTORY_FLUSH_INTERVAL', default=5)  # Секунды
+    HISTORY_QUEUE_SIZE = env.int('HISTORY_QUEUE_SIZE', default=10000)
+    # Хранилище состояния пользователей: memory, sqlite или redis
+    STORAGE_BACKEND = env.str('STORAGE_BACKEND', default='sqlite')
+    STORAGE_PATH = env.str('STORAGE_PATH', default='data/storage.sqlite3')
+    STORAGE_REDIS_URL = env.str(
+        'STORAGE_REDIS_URL', default='redis://localhost:6379/0')
+    # Сколько записей держать в памяти процесса
+    STORAGE_MAX_ENTRIES = env.int('STORAGE_MAX_ENTRIES', default=10000)
+    STORAGE_TTL = env.int('STORAGE_TTL', default=2592000)  # Секунды
+    NAVIGATION_STACK_LIMIT = env.int('NAVIGATION_STACK_LIMIT', default=50)
+    # Режим приема обновлений: polling или webhook
+    BOT_MODE = env.str('BOT_MODE', default='polling')
+    # Внешний адрес, на который Telegram шлет обновления (без пути)
+    WEBHOOK_BASE_URL = env.str('WEBHOOK_BASE_URL', default='')
+    WEBHOOK_PATH = env.str('WEBHOOK_PATH', default='/bot/webhook')
+    WEBHOOK_SECRET = env.str('WEBHOOK_SECRET', default='')
+    WEBHOOK_HOST = env.str('WEBHOOK_HOST', default='0.0.0.0')
+    WEBHOOK_PORT = env.int('WEBHOOK_PORT', default=8080)
+    # Сколько обновлений один процесс обрабатывает одновременно
+    WEBHOOK_MAX_CONCURRENCY = env.int('WEBHOOK_MAX_CONCURRENCY', default=100)
+    # Сколько пользователей обслуживается одновременно
+    UPDATE_MAX_CONCURRENCY = env.int('UPDATE_MAX_CONCURRENCY', default=100)
+    # Лимиты исходящих сообщений Telegram, сообщений в секунду.
+    # Токен общий с администрированием: вместе с его лимитом не больше 30
+    TELEGRAM_GLOBAL_RATE = env.float('TELEGRAM_GLOBAL_RATE', default=25)
+    TELEGRAM_CHAT_RATE = env.float('TELEGRAM_CHAT_RATE', default=1)
+    TELEGRAM_GROUP_RATE = env.float(
+        'TELEGRAM_GROUP_RATE', default=20 / 60)  # 20 в минуту
+    TELEGRAM_MAX_RETRIES = env.int('TELEGRAM_MAX_RETRIES', default=3)
+    # Упреждающая загрузка подменю, которых нет в кэше меню
+    PREFETCH_ENABLED = env.bool('PREFETCH_ENABLED', default=True)
+    PREFETCH_CONCURRENCY = env.int('PREFETCH_CONCURRENCY', default=4)
+    PREFETCH_CACHE_SIZE = env.int('PREFETCH_CACHE_SIZE', default=1000)
     LOG_LEVEL = env.str('LOG_LEVEL', default='INFO')
 
 
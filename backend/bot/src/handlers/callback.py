@@ -5,9 +5,12 @@ from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery
 
-from keyboards import create_menu_keyboard
-from menu_api import API
+from config import config
+from keyboards import unpack_menu_id
+from menu_api import menu_api
+from menu_cache import menu_cache
 from utils.menu_update import update_menu_state
+from utils.render_cache import render_cache
 from utils.texts import TEXTS
 from utils.send_content import send_content_to_user
 from utils.states import UserStates
@@ -16,10 +19,12 @@ from utils.storage import navigation_stack, rated_menus
 logger = logging.getLogger(__name__)
 
 router = Router(name='callback')
-menu_api = API()
 
 
-@router.callback_query(UserStates.navigating, F.data.startswith('menu:'))
+@router.callback_query(
+    UserStates.navigating,
+    F.data.startswith('node:') | F.data.startswith('menu:')
+)
 async def navigate_menu(callback: CallbackQuery, state: FSMContext):
     """
     Обрабатывает переход пользователя в подменю.
@@ -28,7 +33,9 @@ async def navigate_menu(callback: CallbackQuery, state: FSMContext):
     Сохраняет текущее положение в стек для возможности возврата назад.
 
     Формат Callback data:
-        'menu:{index}' - где index это порядковый номер подменю.
+        'node:{id}' - где id это компактная запись UUID подменю,
+        'menu:{index}' - где index это порядковый номер подменю
+                         (кнопки, созданные до перехода на ID).
 
     Функционал:
         - Обновляет стек навигации пользователя,
@@ -37,8 +44,7 @@ async def navigate_menu(callback: CallbackQuery, state: FSMContext):
         - Редактирует сообщение с новым меню.
     """
     try:
-        menu_index = _extract_menu_index(callback.data)
-        target_menu = await _load_target_menu(state, menu_index)
+        target_menu = await _load_target_menu(state, callback.data)
 
         if not target_menu:
             await callback.answer(TEXTS['error_start'])
@@ -77,11 +83,11 @@ async def go_home(callback: CallbackQuery, state: FSMContext):
     """
     try:
         user_id = callback.from_user.id
-        navigation_stack[user_id] = []
+        await navigation_stack.delete(user_id)
 
         await _reset_rating_flag(state)
 
-        root_menu = await menu_api.get_root_menu()
+        root_menu = await menu_cache.get_root()
         await update_menu_state(
             state,
             root_menu,
@@ -110,7 +116,7 @@ async def go_back(callback: CallbackQuery, state: FSMContext):
     """
     user_id = callback.from_user.id
 
-    if not _has_navigation_history(user_id):
+    if not await _has_navigation_history(user_id):
         await callback.answer('Вы в главном меню')
         return
 
@@ -246,21 +252,17 @@ async def restore_menu(callback: CallbackQuery, state: FSMContext):
     try:
         await callback.message.delete()
 
-        state_data = await state.get_data()
-        current_menu_id = state_data.get('current_menu_id')
+        current_menu = await _get_current_menu(await state.get_data())
+        if current_menu:
+            is_root = current_menu.parent_id is None
+            text, keyboard = render_cache.render(
+                current_menu, is_root, menu_cache.revision)
 
-        if current_menu_id:
-            current_menu = await menu_api.get_menu_by_id(current_menu_id)
-            if current_menu:
-                is_root = current_menu.parent_id is None
-                keyboard = create_menu_keyboard(current_menu, is_root=is_root)
-                text = f'<b>{current_menu.name}</b>\n\n{current_menu.text}'
-
-                await callback.message.answer(
-                    text,
-                    reply_markup=keyboard,
-                    parse_mode='HTML'
-                )
+            await callback.message.answer(
+                text,
+                reply_markup=keyboard,
+                parse_mode='HTML'
+            )
 
         await callback.answer()
 
@@ -271,36 +273,51 @@ async def restore_menu(callback: CallbackQuery, state: FSMContext):
 
 # ============= Вспомогательные функции =============
 
-def _extract_menu_index(data: str) -> int:
-    """Извлекает индекс меню из callback data."""
-    return int(data.split(':', 1)[1])
-
-
 def _extract_content_index(data: str) -> int:
     """Извлекает индекс контента из callback data."""
     return int(data.split(':', 1)[1])
 
 
-async def _load_target_menu(state: FSMContext, menu_index: int):
-    """Загружает целевое меню по индексу."""
+async def _load_target_menu(state: FSMContext, data: str):
+    """
+    Загружает целевое меню из callback data.
+
+    Основной путь - поиск по ID узла. Поиск по имени остается запасным
+    вариантом для старых кнопок и узлов, которых нет по ID.
+    """
+    prefix, value = data.split(':', 1)
     state_data = await state.get_data()
-    current_children = state_data.get('current_children', [])
 
-    if menu_index >= len(current_children):
+    if prefix == 'node':
+        menu_id = unpack_menu_id(value)
+        target_menu = await menu_cache.get_by_id(menu_id)
+        if target_menu:
+            return target_menu
+
+        current_children_ids = state_data.get('current_children_ids', [])
+        if menu_id not in current_children_ids:
+            return None
+        menu_index = current_children_ids.index(menu_id)
+    else:
+        menu_index = int(value)
+
+    current_menu = await _get_current_menu(state_data)
+    if not current_menu or menu_index >= len(current_menu.children_names):
         return None
 
-    menu_name = current_children[menu_index]
-    return await menu_api.find_menu_by_name(menu_name)
+    menu_name = current_menu.children_names[menu_index]
+    return await menu_cache.get_by_name(menu_name)
 
 
 async def _update_navigation_stack(user_id: int, state: FSMContext):
     """Обновляет стек навигации пользователя."""
-    if user_id not in navigation_stack:
-        navigation_stack[user_id] = []
+    stack = await navigation_stack.get(user_id, [])
 
     state_data = await state.get_data()
     current_menu_id = state_data.get('current_menu_id')
-    navigation_stack[user_id].append(current_menu_id)
+    stack.append(current_menu_id)
+    await navigation_stack.set(
+        user_id, stack[-config.NAVIGATION_STACK_LIMIT:])
 
 
 async def _reset_rating_flag(state: FSMContext):
@@ -308,32 +325,41 @@ async def _reset_rating_flag(state: FSMContext):
     await state.update_data(rating_shown=False)
 
 
-def _has_navigation_history(user_id: int) -> bool:
+async def _has_navigation_history(user_id: int) -> bool:
     """Проверяет наличие истории навигации."""
-    return user_id in navigation_stack and bool(navigation_stack[user_id])
+    return bool(await navigation_stack.get(user_id))
 
 
 async def _get_previous_menu(user_id: int):
     """Получает предыдущее меню из стека навигации."""
-    previous_menu_id = navigation_stack[user_id].pop()
-    previous_menu = await menu_api.get_menu_by_id(previous_menu_id)
+    stack = await navigation_stack.get(user_id, [])
+    previous_menu_id = stack.pop()
+    await navigation_stack.set(user_id, stack)
+    previous_menu = await menu_cache.get_by_id(previous_menu_id)
 
     if not previous_menu:
-        previous_menu = await menu_api.get_root_menu()
-        navigation_stack[user_id] = []
+        previous_menu = await menu_cache.get_root()
+        await navigation_stack.delete(user_id)
 
     return previous_menu
 
 
+async def _get_current_menu(state_data: dict):
+    """Получает текущее меню пользователя из кэша по ID из состояния."""
+    current_menu_id = state_data.get('current_menu_id')
+    if not current_menu_id:
+        return None
+    return await menu_cache.get_by_id(current_menu_id)
+
+
 async def _get_content_by_index(state: FSMContext, content_index: int):
-    """Получает контент по индексу из состояния."""
-    state_data = await state.get_data()
-    current_content = state_data.get('current_content', [])
+    """Получает контент текущего меню по индексу."""
+    current_menu = await _get_current_menu(await state.get_data())
 
-    if content_index >= len(current_content):
+    if not current_menu or content_index >= len(current_menu.content):
         return None
 
-    return current_content[content_index]
+    return current_menu.content[content_index]
 
 
 def _parse_rating_data(data: str):
@@ -344,9 +370,10 @@ def _parse_rating_data(data: str):
 
 async def _save_user_rating(user_id: int, menu_id: str):
     """Сохраняет оценку пользователя."""
-    if user_id not in rated_menus:
-        rated_menus[user_id] = set()
-    rated_menus[user_id].add(menu_id)
+    user_rated = await rated_menus.get(user_id, [])
+    if menu_id not in user_rated:
+        user_rated.append(menu_id)
+        await rated_menus.set(user_id, user_rated)
 
 
 async def _show_rating_feedback(callback: CallbackQuery, rating: bool):
@@ -366,6 +393,5 @@ async def _save_current_menu_state(state: FSMContext):
     current_data = await state.get_data()
     await state.update_data(
         previous_menu_id=current_data.get('current_menu_id'),
-        previous_children=current_data.get('current_children'),
-        previous_content=current_data.get('current_content')
+        previous_children_ids=current_data.get('current_children_ids')
     )
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from aiogram import Router, F
@@ -6,10 +5,12 @@ from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 
-from menu_api import API
+from menu_api import menu_api
+from menu_cache import menu_cache
 from utils.menu_update import update_menu_state
 from utils.texts import TEXTS
 from utils.constants import SEND_QUESTION_MES_DEL
+from utils.deletion_scheduler import deletion_scheduler
 from utils.states import UserStates
 from utils.storage import navigation_stack
 
@@ -18,10 +19,6 @@ logger = logging.getLogger(__name__)
 router = Router(name='command')
 
 
-# Инициализируем API и хранилище для навигации (стек меню)
-menu_api = API()
-
-
 @router.message(Command('start'))
 async def cmd_start(message: Message, state: FSMContext):
     """
@@ -40,9 +37,10 @@ async def cmd_start(message: Message, state: FSMContext):
         if not user:
             await menu_api.register_user(user_id=message.from_user.id)
 
-        root_menu = await menu_api.get_root_menu()
+        root_menu = await menu_cache.get_root()
         user_id = message.from_user.id
-        navigation_stack[user_id] = []  # Пустой стек для корневого меню
+        # Пустой стек для корневого меню
+        await navigation_stack.set(user_id, [])
         await state.set_state(UserStates.navigating)
 
         await update_menu_state(
@@ -71,8 +69,9 @@ async def process_question(message: Message, state: FSMContext):
         - Проверяет текущее состояние пользователя и ожидает ввод текста,
         - Отправляет введённый вопрос на внешний API,
         - После успешной отправки вопроса отображает временное сообщение
-          о завершении отправки и удаляет его через три секунды,
-        - Удаляет исходное и предыдущее сообщение пользователя,
+          о завершении отправки,
+        - Через три секунды удаляет это сообщение, вопрос и приглашение
+          к вводу через планировщик, не задерживая обработчик,
         - Возвращает пользователя обратно в режим навигации по меню.
     """
 
@@ -87,23 +86,17 @@ async def process_question(message: Message, state: FSMContext):
     if success:
         bot_message = await message.answer(
             TEXTS['send_question_done'], parse_mode='HTML')
-        await asyncio.sleep(SEND_QUESTION_MES_DEL)
-        await bot_message.delete()
     else:
         bot_message = await message.answer(
             TEXTS['send_question_error'], parse_mode='HTML')
-        await asyncio.sleep(SEND_QUESTION_MES_DEL)
-        await bot_message.delete()
 
-    await message.delete()
+    # Ответ, вопрос и приглашение к вводу удаляются одной пачкой
+    message_ids = [bot_message.message_id, message.message_id]
     if question_prompt_message_id:
-        try:
-            await message.bot.delete_message(
-                chat_id=message.chat.id,
-                message_id=question_prompt_message_id
-            )
-        except Exception as e:
-            logger.error(f'Ошибка при удалении сообщения: {e}')
+        message_ids.append(question_prompt_message_id)
+    for message_id in message_ids:
+        await deletion_scheduler.schedule(
+            message.chat.id, message_id, SEND_QUESTION_MES_DEL)
 
     await state.set_state(UserStates.navigating)
 
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from aiogram.types import (
     BotCommand,
     InlineKeyboardButton,
@@ -15,13 +17,19 @@ def create_menu_keyboard(
     """Создает клавиатуру для меню."""
     buttons = []
 
-    # Кнопки для дочерних элементов меню
+    # Кнопки для дочерних элементов меню. Если API вернул ID дочерних
+    # узлов, кнопка хранит сам ID, иначе - порядковый номер подменю.
     if menu.children_names:
+        use_ids = len(menu.children_ids) == len(menu.children_names)
         for index, child_name in enumerate(menu.children_names):
+            callback_data = (
+                f'node:{pack_menu_id(menu.children_ids[index])}' if use_ids
+                else f'menu:{index}'
+            )
             buttons.append([
                 InlineKeyboardButton(
                     text=child_name,
-                    callback_data=f'menu:{index}'
+                    callback_data=callback_data
                 )
             ])
         # Кнопка с вопросом от пользователя. Создаем в дочернем меню.
@@ -52,6 +60,16 @@ def create_menu_keyboard(
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
+def pack_menu_id(menu_id: str) -> str:
+    """Упаковывает UUID узла меню в компактную строку для callback data."""
+    return UUID(str(menu_id)).hex
+
+
+def unpack_menu_id(packed_id: str) -> str:
+    """Восстанавливает UUID узла меню из callback data."""
+    return str(UUID(hex=packed_id))
+
+
 def create_navigation_buttons(
         restore_menu: bool = False) -> InlineKeyboardMarkup:
     """
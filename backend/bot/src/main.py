@@ -7,7 +7,16 @@ from aiogram import Bot, Dispatcher
 from config import config
 from handlers import message, callback
 from keyboards import set_main_commands
+from middlewares import TelegramRateLimiter, UserOrderMiddleware
+from menu_api import menu_api
+from menu_cache import menu_cache
+from utils.deletion_scheduler import deletion_scheduler
+from utils.file_id_cache import file_id_cache
+from utils.history_buffer import history_buffer
 from utils.logger import setup_logging
+from utils.send_content import prefill_file_id_cache
+from utils.storage import storage
+from webhook import run_webhook
 
 
 logger = setup_logging()
@@ -18,25 +27,71 @@ async def main() -> None:
     # Инициализация бота
     bot = Bot(token=config.BOT_TOKEN)
 
+    # Все исходящие запросы к Telegram проходят через ограничитель
+    rate_limiter = TelegramRateLimiter(
+        global_rate=config.TELEGRAM_GLOBAL_RATE,
+        chat_rate=config.TELEGRAM_CHAT_RATE,
+        group_rate=config.TELEGRAM_GROUP_RATE,
+        max_retries=config.TELEGRAM_MAX_RETRIES
+    )
+    bot.session.middleware(rate_limiter)
+
     # Инициализация диспетчера
     dp = Dispatcher()
 
+    # Обновления одного пользователя обрабатываются по очереди
+    user_order = UserOrderMiddleware(config.UPDATE_MAX_CONCURRENCY)
+    dp.update.outer_middleware(user_order)
+
     # Регистрация роутеров
     dp.include_router(callback.router)
     dp.include_router(message.router)
 
     await set_main_commands(bot)
 
-    # Удаляем вебхуки и запускаем polling
-    await bot.delete_webhook(drop_pending_updates=True)
+    # Открываем общий пул соединений с API администрирования
+    await menu_api.start()
+
+    # Запускаем фоновую запись истории навигации
+    await history_buffer.start()
+
+    # Запускаем отложенное удаление служебных сообщений
+    await deletion_scheduler.start(bot)
+
+    # Загружаем дерево меню в кэш и следим за его ревизией
+    await menu_cache.start()
+
+    # Загружаем сохраненные file_id и дозагружаем новые файлы в фоне
+    file_id_cache.load()
+    prefill_task = asyncio.create_task(
+        prefill_file_id_cache(bot, menu_cache.contents()))
+
     logger.info('Бот запущен!')
 
     try:
-        await dp.start_polling(bot)
+        if config.BOT_MODE == 'webhook':
+            await run_webhook(dp, bot)
+        else:
+            # Удаляем вебхуки и запускаем polling
+            await bot.delete_webhook(drop_pending_updates=True)
+            await dp.start_polling(bot)
     except Exception as e:
         logger.error(f'Ошибка при работе бота: {e}')
     finally:
         logger.info("Бот остановлен")
+        prefill_task.cancel()
+        await menu_cache.stop()
+        await history_buffer.stop()
+        await deletion_scheduler.stop()
+        await menu_api.close()
+        logger.info(f'Статистика очередей обновлений: {user_order.stats()}')
+        logger.info(f'Статистика отправки в Telegram: {rate_limiter.stats()}')
+        logger.info(f'Статистика хранилища: {storage.stats()}')
+        if menu_cache.prefetcher is not None:
+            logger.info(
+                f'Статистика упреждающей загрузки: '
+                f'{menu_cache.prefetcher.stats()}')
+        await storage.close()
         await bot.session.close()
 
 
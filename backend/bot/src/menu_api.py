@@ -1,22 +1,74 @@
-from datetime import datetime, timezone
+import asyncio
 import logging
-from typing import Optional
+import random
+import time
+from typing import Dict, List, Optional
 
 import aiohttp
+import orjson
 
 from config import config
 from models import Menu
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.storage import MemoryStorage
 
 logger = logging.getLogger(__name__)
 
 
+class RequestRejectedError(Exception):
+    """API отклонило запрос ответом 4xx: повтор не поможет."""
+
+
+def _orjson_dumps(obj) -> str:
+    """Сериализует тело запроса через orjson."""
+    return orjson.dumps(obj).decode()
+
+
 class API:
     """API для взаимодействия с меню."""
 
     def __init__(self):
         self.api_url = config.API_URL
         self.timeout = aiohttp.ClientTimeout(total=config.API_TIMEOUT)
-        self.last_saved_menu = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.breaker = CircuitBreaker(
+            config.API_BREAKER_FAILURES, config.API_BREAKER_RESET)
+        # Последние успешные ответы для stale-while-revalidate
+        self._swr_cache = MemoryStorage(
+            config.API_SWR_CACHE_SIZE, config.API_SWR_MAX_STALE)
+        self._revalidating: Dict[str, asyncio.Task] = {}
+        # Запросы в полете: одинаковые GET ждут один и тот же запрос
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+        self.coalesced = 0
+
+    # ========== Жизненный цикл HTTP-сессии ==========
+
+    async def start(self) -> None:
+        """Создает общую HTTP-сессию с пулом соединений."""
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=config.API_POOL_LIMIT,
+            limit_per_host=config.API_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=config.API_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=config.API_DNS_CACHE_TTL,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            json_serialize=_orjson_dumps
+        )
+        logger.debug('HTTP-сессия API создана')
+
+    async def close(self) -> None:
+        """Закрывает общую HTTP-сессию."""
+        for task in list(self._revalidating.values()):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.debug('HTTP-сессия API закрыта')
+        self._session = None
 
     # ========== Методы для работы с пользователями ==========
 
@@ -73,7 +125,8 @@ class API:
         url = f'{self.api_url}/menu/root'
 
         try:
-            data = await self._fetch_json(url, raise_for_status=True)
+            data = await self._fetch_json(
+                url, raise_for_status=True, swr=True)
             logger.debug('Корневое меню загружено')
             return Menu(data)
         except Exception as e:
@@ -90,7 +143,7 @@ class API:
 
         try:
             data = await self._fetch_json(
-                url, params=params, raise_for_status=True)
+                url, params=params, raise_for_status=True, swr=True)
             logger.debug(f'Меню "{menu_name}" загружено')
             return Menu(data)
         except Exception as e:
@@ -102,7 +155,7 @@ class API:
         url = f'{self.api_url}/menu/{menu_id}'
 
         try:
-            data = await self._fetch_json(url)
+            data = await self._fetch_json(url, swr=True)
             if data:
                 logger.debug(f'Меню с ID {menu_id} загружено')
                 return Menu(data)
@@ -111,6 +164,48 @@ class API:
             logger.error(f'Ошибка при загрузке меню с ID {menu_id}: {e}')
             raise
 
+    async def get_menus_by_ids(self, menu_ids: List[str]) -> List[Menu]:
+        """Получение нескольких меню по ID одним запросом."""
+        if not menu_ids:
+            return []
+
+        url = f'{self.api_url}/menu/nodes'
+        params = [('ids', str(menu_id)) for menu_id in menu_ids]
+
+        try:
+            data = await self._fetch_json(
+                url, params=params, raise_for_status=True)
+            logger.debug(f'Загружено меню по ID: {len(data or [])}')
+            return [Menu(item) for item in data or []]
+        except Exception as e:
+            logger.error(f'Ошибка при загрузке меню по списку ID: {e}')
+            raise
+
+    async def get_full_menu(self) -> Optional[dict]:
+        """Получение всего дерева меню одним запросом."""
+        url = f'{self.api_url}/menu/'
+
+        try:
+            data = await self._fetch_json(url, raise_for_status=True)
+            logger.debug('Дерево меню загружено')
+            return data
+        except Exception as e:
+            logger.error(f'Ошибка при загрузке дерева меню: {e}')
+            raise
+
+    async def get_menu_revision(self) -> Optional[int]:
+        """Получение текущей ревизии меню."""
+        url = f'{self.api_url}/menu/revision'
+
+        try:
+            data = await self._fetch_json(url)
+            if data:
+                return data.get('revision')
+            return None
+        except Exception as e:
+            logger.error(f'Ошибка при получении ревизии меню: {e}')
+            return None
+
     # ========== Методы для работы с рейтингами и историей ==========
 
     async def send_rating(
@@ -130,34 +225,34 @@ class API:
             logger.error(f'Ошибка при отправке рейтинга: {e}')
             return False
 
-    async def add_to_history(self, user_id: int, menu_id: str) -> bool:
-        """Добавление записи в историю пользователя."""
-        # Проверка на дублирование
-        if self.last_saved_menu.get(user_id) == menu_id:
-            logger.debug(f'Пропускаем дублирование истории для меню {menu_id}')
-            return True
+    async def add_history_batch(self, events: list) -> bool:
+        """
+        Пакетное добавление записей в историю пользователей.
 
-        url = f'{self.api_url}/users/{user_id}/history/add'
-        data = self._prepare_history_data(menu_id)
+        Возвращает False при временной ошибке (нет соединения, таймаут,
+        ответ 5xx, разомкнутый выключатель), которую стоит повторить.
+        Если API отклонило пачку ответом 4xx, бросает RequestRejectedError.
+        """
+        url = f'{self.api_url}/users/history/bulk'
+        data = {'items': events}
 
         try:
             response_data = await self._post_request(url, data)
-
-            if response_data.get('status') in [200, 201]:
-                log_message = (
-                    f'История сохранена для пользователя {user_id}, '
-                    f'меню {menu_id}')
-                logger.debug(log_message)
-                self.last_saved_menu[user_id] = menu_id
-                return True
-
-            logger.error(f'Ошибка сохранения истории: {response_data}')
-            return False
-
         except Exception as e:
             logger.error(f'Ошибка при добавлении в историю: {e}')
             return False
 
+        status = response_data.get('status')
+        if status in [200, 201]:
+            logger.debug(f'История сохранена: {len(events)} записей')
+            return True
+
+        logger.error(f'Ошибка сохранения истории: {response_data}')
+        if 400 <= status < 500:
+            raise RequestRejectedError(
+                f'status={status}, body={response_data.get("text")}')
+        return False
+
     async def send_question(self, user_id: int, text: str) -> bool:
         """Отправка вопроса пользователя."""
         url = f'{self.api_url}/users/questions/create'
@@ -188,43 +283,154 @@ class API:
                 return True
         return False
 
-    def _prepare_history_data(self, menu_id: str) -> dict:
-        """Подготавливает данные для сохранения истории."""
-        current_time = datetime.now(timezone.utc)
-        formatted_date = current_time.strftime('%Y-%m-%d %H:%M:%S')
-        return {
-            'menu_id': str(menu_id),
-            'action_date': formatted_date
-        }
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Возвращает общую сессию, создавая ее при необходимости."""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
 
     async def _fetch_json(
         self,
         url: str,
         params: dict = {},
-        raise_for_status: bool = False
+        raise_for_status: bool = False,
+        swr: bool = False
     ) -> Optional[dict]:
-        """Выполняет GET запрос и возвращает JSON."""
-        try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 404:
-                        return None
+        """
+        Выполняет GET запрос и возвращает JSON.
+
+        С swr=True последний успешный ответ отдается сразу, а если он
+        старше API_SWR_FRESH_TTL, в фоне запрашивается свежий.
+        """
+        if not swr:
+            return await self._get_shared(url, params, raise_for_status)
+
+        key = self._cache_key(url, params)
+        cached = await self._swr_cache.get(key)
+        if cached is not None:
+            fetched_at, data = cached
+            if time.monotonic() - fetched_at > config.API_SWR_FRESH_TTL:
+                self._revalidate(key, url, params)
+            return data
+
+        data = await self._get_shared(url, params, raise_for_status)
+        if data is not None:
+            await self._swr_cache.set(key, (time.monotonic(), data))
+        return data
+
+    def _revalidate(self, key: str, url: str, params: dict) -> None:
+        """Обновляет закэшированный ответ в фоне, один запрос на ключ."""
+        if key in self._revalidating:
+            return
+
+        async def refresh():
+            try:
+                data = await self._get_shared(url, params, True)
+                if data is not None:
+                    await self._swr_cache.set(key, (time.monotonic(), data))
+            except Exception as e:
+                logger.debug(f'Не удалось обновить {url} в фоне: {e}')
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(refresh())
+
+    async def _get_shared(
+        self,
+        url: str,
+        params: dict,
+        raise_for_status: bool
+    ) -> Optional[dict]:
+        """
+        Объединяет одинаковые одновременные GET запросы.
+
+        Пока запрос к URL с теми же параметрами в полете, новые вызовы
+        не идут в API, а ждут его результат или ошибку.
+        """
+        key = (self._cache_key(url, params), raise_for_status)
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(
+                self._get_with_retries(url, params, raise_for_status))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Отмена одного из ожидающих не должна отменять общий запрос
+        return await asyncio.shield(task)
+
+    async def _get_with_retries(
+        self,
+        url: str,
+        params: dict,
+        raise_for_status: bool
+    ) -> Optional[dict]:
+        """Выполняет GET с повторами и случайной задержкой между ними."""
+        for attempt in range(config.API_RETRIES + 1):
+            try:
+                return await self._get_once(url, params, raise_for_status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_attempt = attempt == config.API_RETRIES
+                if last_attempt or not self._is_retryable(e):
                     if raise_for_status:
-                        response.raise_for_status()
-                    if response.status == 200:
-                        return await response.json()
-
-                    response_text = await response.text()
-                    log_message = (
-                        f'Ошибка запроса: status={response.status}, '
-                        f'body={response_text}')
-                    logger.error(log_message)
+                        raise
+                    logger.error(f'Ошибка HTTP при запросе {url}: {e}')
                     return None
-        except aiohttp.ClientError as e:
-            if raise_for_status:
-                raise
-            logger.error(f'Ошибка HTTP при запросе {url}: {e}')
-            return None
+
+                # Экспоненциальная задержка с полным джиттером
+                await asyncio.sleep(
+                    random.uniform(0, config.API_RETRY_BACKOFF * 2 ** attempt))
+
+    async def _get_once(
+        self,
+        url: str,
+        params: dict,
+        raise_for_status: bool
+    ) -> Optional[dict]:
+        """Выполняет один GET запрос через выключатель."""
+        self.breaker.check()
+        session = await self._get_session()
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status >= 500:
+                    response.raise_for_status()
+                self.breaker.record_success()
+
+                if response.status == 404:
+                    return None
+                if raise_for_status:
+                    response.raise_for_status()
+                if response.status == 200:
+                    return await response.json(loads=orjson.loads)
+
+                response_text = await response.text()
+                log_message = (
+                    f'Ошибка запроса: status={response.status}, '
+                    f'body={response_text}')
+                logger.error(log_message)
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if self._is_retryable(e):
+                self.breaker.record_failure()
+            raise
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Ошибка связана с недоступностью API, а не с самим запросом."""
+        if isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500
+        return True
+
+    @staticmethod
+    def _cache_key(url: str, params: dict | list) -> str:
+        if not params:
+            return url
+        items = params.items() if isinstance(params, dict) else params
+        query = '&'.join(f'{k}={v}' for k, v in sorted(items))
+        return f'{url}?{query}'
 
     async def _post_request(
         self,
@@ -233,26 +439,37 @@ class API:
         raise_for_status: bool = False
     ) -> dict:
         """Выполняет POST запрос и возвращает результат."""
+        self.breaker.check()
+        session = await self._get_session()
         try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                async with session.post(url, json=data) as response:
-                    response_text = await response.text()
+            async with session.post(url, json=data) as response:
+                response_text = await response.text()
+                if response.status >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
 
-                    if raise_for_status:
-                        response.raise_for_status()
-
-                    log_message = (
-                        f'Ответ сервера: status={response.status}, '
-                        f'body={response_text}'
-                    )
-                    logger.debug(log_message)
-
-                    return {
-                        'status': response.status,
-                        'text': response_text
-                    }
-        except aiohttp.ClientError as e:
+                if raise_for_status:
+                    response.raise_for_status()
+
+                log_message = (
+                    f'Ответ сервера: status={response.status}, '
+                    f'body={response_text}'
+                )
+                logger.debug(log_message)
+
+                return {
+                    'status': response.status,
+                    'text': response_text
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if not isinstance(e, aiohttp.ClientResponseError):
+                self.breaker.record_failure()
             if raise_for_status:
                 raise
             logger.error(f'Ошибка HTTP при POST запросе {url}: {e}')
             raise
+
+
+# Общий экземпляр API: одна сессия и пул соединений на весь бот
+menu_api = API()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from config import config
+from menu_api import API, menu_api
+from models import Content, Menu
+from utils.prefetcher import MenuPrefetcher
+
+logger = logging.getLogger(__name__)
+
+
+class MenuCache:
+    """
+    Кэш дерева меню в памяти бота.
+
+    Загружает все дерево одним запросом к API и отвечает на запросы
+    корня, узла по ID и узла по имени из словарей. Дерево перезагружается
+    только когда на стороне администрирования меняется ревизия меню.
+    Если узла нет в кэше, запрос уходит в API, а подменю показанных
+    узлов, которых нет в кэше, можно загрузить заранее через prefetcher.
+    """
+
+    def __init__(
+        self,
+        api: API,
+        refresh_interval: int,
+        prefetcher: Optional[MenuPrefetcher] = None
+    ):
+        self.api = api
+        self.refresh_interval = refresh_interval
+        self.prefetcher = prefetcher
+        self.revision: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self._root: Optional[Menu] = None
+        self._by_id: Dict[str, Menu] = {}
+        self._by_name: Dict[str, Menu] = {}
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    # ========== Жизненный цикл ==========
+
+    async def start(self) -> None:
+        """Загружает меню и запускает фоновую проверку ревизии."""
+        try:
+            await self.refresh(force=True)
+        except Exception as e:
+            logger.error(f'Не удалось загрузить меню в кэш: {e}')
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую проверку ревизии."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Перезагружает дерево меню, если изменилась ревизия.
+
+        Возвращает True, если содержимое кэша было обновлено.
+        """
+        async with self._lock:
+            revision = await self.api.get_menu_revision()
+            if not force and self._root is not None and (
+                    revision is None or revision == self.revision):
+                return False
+
+            tree = await self.api.get_full_menu()
+            if not tree:
+                return False
+
+            self._load_tree(tree)
+            self.revision = revision
+            if self.prefetcher is not None:
+                self.prefetcher.clear()
+            logger.info(
+                f'Кэш меню обновлен: {len(self._by_id)} узлов, '
+                f'ревизия {revision}')
+            return True
+
+    # ========== Поиск узлов ==========
+
+    async def get_root(self) -> Menu:
+        """Возвращает корневое меню."""
+        if self._root is not None:
+            self.hits += 1
+            return self._root
+
+        self.misses += 1
+        return await self.api.get_root_menu()
+
+    async def get_by_id(self, menu_id: str) -> Optional[Menu]:
+        """Возвращает меню по ID."""
+        menu = self._by_id.get(str(menu_id))
+        if menu is not None:
+            self.hits += 1
+            return menu
+
+        self.misses += 1
+        if self.prefetcher is not None:
+            menu = await self.prefetcher.get(menu_id)
+            if menu is not None:
+                self._by_id[str(menu.id)] = menu
+                return menu
+        return await self.api.get_menu_by_id(menu_id)
+
+    async def get_by_name(self, menu_name: str) -> Optional[Menu]:
+        """Возвращает меню по имени."""
+        menu = self._by_name.get(menu_name)
+        if menu is not None:
+            self.hits += 1
+            return menu
+
+        self.misses += 1
+        return await self.api.find_menu_by_name(menu_name)
+
+    def prefetch_children(self, menu: Menu) -> None:
+        """Запускает фоновую загрузку подменю, которых нет в кэше."""
+        if self.prefetcher is None:
+            return
+        missing = [
+            menu_id for menu_id in menu.children_ids
+            if str(menu_id) not in self._by_id
+        ]
+        if missing:
+            self.prefetcher.schedule(missing)
+
+    def contents(self) -> List[Content]:
+        """Возвращает весь контент узлов, загруженных в кэш."""
+        return [
+            content for menu in self._by_id.values() for content in menu.content
+        ]
+
+    # ========== Приватные вспомогательные методы ==========
+
+    def _load_tree(self, tree: dict) -> None:
+        """Строит индексы по дереву меню за один обход."""
+        by_id: Dict[str, Menu] = {}
+        by_name: Dict[str, Menu] = {}
+
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            menu = Menu(node)
+            by_id[str(menu.id)] = menu
+            by_name.setdefault(menu.name, menu)
+            stack.extend(node.get('children', []))
+
+        # Словари подменяются целиком, чтобы читатели не видели
+        # частично построенный кэш
+        self._by_id = by_id
+        self._by_name = by_name
+        self._root = by_id.get(str(tree.get('id')))
+
+    async def _refresh_loop(self) -> None:
+        """Периодически сверяет ревизию меню с API."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f'Ошибка при обновлении кэша меню: {e}')
+
+
+# Общий кэш меню для всех обработчиков
+menu_cache = MenuCache(
+    menu_api,
+    config.MENU_CACHE_REFRESH_INTERVAL,
+    prefetcher=MenuPrefetcher(
+        menu_api, config.PREFETCH_CONCURRENCY, config.PREFETCH_CACHE_SIZE
+    ) if config.PREFETCH_ENABLED else None
+)
@@ -0,0 +1,4 @@
+from .rate_limit import TelegramRateLimiter
+from .user_order import UserOrderMiddleware
+
+__all__ = ['TelegramRateLimiter', 'UserOrderMiddleware']
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from typing import Dict
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware, NextRequestMiddlewareType)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Корзина токенов с резервированием.
+
+    Каждый вызов reserve забирает токен, даже если его еще нет, и
+    возвращает, сколько ждать до его появления. Поэтому ожидающие
+    запросы выстраиваются в очередь без опроса в цикле.
+    """
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'blocked_until')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self) -> float:
+        """Резервирует токен и возвращает задержку до его появления."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(delay, self.blocked_until - now)
+
+    def block(self, seconds: float) -> None:
+        """Запрещает выдачу токенов на seconds секунд (ответ 429)."""
+        self.blocked_until = max(
+            self.blocked_until, time.monotonic() + seconds)
+
+    def is_idle(self) -> bool:
+        """Корзина полна и не заблокирована: ее можно забыть."""
+        now = time.monotonic()
+        tokens = self.tokens + (now - self.updated) * self.rate
+        return tokens >= self.capacity and self.blocked_until <= now
+
+
+class TelegramRateLimiter(BaseRequestMiddleware):
+    """
+    Ограничитель исходящих запросов к Telegram.
+
+    Подключается к сессии бота, поэтому через него проходит каждый вызов
+    Bot API. Запросы, адресованные чату (с полем chat_id), ограничиваются
+    общей корзиной и корзиной чата: для личных чатов и для групп свои
+    лимиты. Ответ 429 приостанавливает отправку на retry_after секунд,
+    после чего запрос повторяется.
+    """
+
+    # Сколько корзин чатов держать, прежде чем удалять простаивающие
+    MAX_CHAT_BUCKETS = 10000
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        group_rate: float,
+        chat_burst: int = 3,
+        max_retries: int = 3
+    ):
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.sent = 0
+        self.waiting = 0
+        self.retries = 0
+        self.throttled_time = 0.0
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: Dict[int | str, TokenBucket] = {}
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, 'chat_id', None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        attempt = 0
+        while True:
+            await self._acquire(chat_id)
+            try:
+                response = await make_request(bot, method)
+                self.sent += 1
+                return response
+            except TelegramRetryAfter as e:
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    f'Telegram ограничил отправку в чат {chat_id}, '
+                    f'повтор через {e.retry_after} с')
+                # 429 может означать и общий лимит бота, поэтому
+                # приостанавливаем и чат, и все остальные отправки
+                self._chat_bucket(chat_id).block(e.retry_after)
+                self._global.block(e.retry_after)
+                if attempt > self.max_retries:
+                    raise
+
+    def stats(self) -> Dict[str, float]:
+        """Возвращает метрики ограничителя."""
+        return {
+            'sent': self.sent,
+            'waiting': self.waiting,
+            'retries': self.retries,
+            'throttled_time': round(self.throttled_time, 3),
+            'chat_buckets': len(self._chats),
+        }
+
+    async def _acquire(self, chat_id: int | str) -> None:
+        delay = max(self._chat_bucket(chat_id).reserve(),
+                    self._global.reserve())
+        if delay <= 0:
+            return
+
+        self.waiting += 1
+        self.throttled_time += delay
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.waiting -= 1
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= self.MAX_CHAT_BUCKETS:
+                self._prune()
+            rate = self.chat_rate if self._is_private(chat_id) \
+                else self.group_rate
+            bucket = self._chats[chat_id] = TokenBucket(rate, self.chat_burst)
+        return bucket
+
+    def _prune(self) -> None:
+        for chat_id in [c for c, b in self._chats.items() if b.is_idle()]:
+            del self._chats[chat_id]
+
+    @staticmethod
+    def _is_private(chat_id: int | str) -> bool:
+        # У групп и каналов отрицательные ID или @username
+        return isinstance(chat_id, int) and chat_id > 0
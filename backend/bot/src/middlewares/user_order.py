@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]]
+
+
+class _UserQueue:
+    """Очередь обновлений одного пользователя."""
+
+    __slots__ = ('lock', 'depth')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.depth = 0
+
+
+class UserOrderMiddleware(BaseMiddleware):
+    """
+    Упорядоченная обработка обновлений по пользователям.
+
+    Обновления одного пользователя выполняются строго по очереди, в
+    порядке поступления: нажатия не обгоняют друг друга, а состояние FSM
+    и стек навигации не меняются параллельно. Обновления разных
+    пользователей идут параллельно, но не больше max_concurrency
+    одновременно. Регистрируется как внешний middleware на update.
+
+    Очереди живут в памяти процесса, поэтому порядок гарантируется только
+    при одном процессе бота. В режиме вебхука все обновления должны
+    приходить в один процесс (см. upstream bot_webhook в configs/site.conf).
+    """
+
+    # Порог ожидания, после которого в лог пишется предупреждение
+    SLOW_WAIT = 5.0
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.processed = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: Dict[int, _UserQueue] = {}
+
+    async def __call__(
+        self,
+        handler: Handler,
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user: Optional[User] = data.get('event_from_user')
+        if user is None:
+            async with self._semaphore:
+                return await handler(event, data)
+
+        queue = self._queues.get(user.id)
+        if queue is None:
+            queue = self._queues[user.id] = _UserQueue()
+
+        queue.depth += 1
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        started = time.monotonic()
+        acquired = False
+        try:
+            async with queue.lock, self._semaphore:
+                acquired = True
+                self.waiting -= 1
+                self._record_wait(user.id, time.monotonic() - started)
+                return await handler(event, data)
+        finally:
+            if not acquired:
+                self.waiting -= 1
+            queue.depth -= 1
+            if queue.depth == 0:
+                # Очередь пуста: не держим записи для ушедших пользователей
+                self._queues.pop(user.id, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Возвращает метрики очередей и ожидания."""
+        return {
+            'processed': self.processed,
+            'waiting': self.waiting,
+            'max_waiting': self.max_waiting,
+            'active_users': len(self._queues),
+            'avg_wait': (
+                self.total_wait / self.processed if self.processed else 0),
+            'max_wait': self.max_wait,
+        }
+
+    def _record_wait(self, user_id: int, wait: float) -> None:
+        self.processed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > self.SLOW_WAIT:
+            logger.warning(
+                f'Обновление пользователя {user_id} ждало {wait:.1f} с, '
+                f'в очереди {self.waiting}')
@@ -1,10 +1,24 @@
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, Optional, Tuple
 
 from utils.texts import TEXTS
 
 
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Интернирует строку, чтобы одинаковые ID хранились один раз."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class Content:
-    """Класс модели MenuContent."""
+    """
+    Класс модели MenuContent.
+
+    Экземпляры общие для всех пользователей и не изменяются после
+    создания, поэтому используют __slots__ вместо словаря атрибутов.
+    """
+
+    __slots__ = (
+        'id', 'menu_id', 'type', 'server_path', 'created_at', 'updated_at')
 
     CONTENT_TYPES = {
             1: TEXTS['photo_type'],
@@ -13,8 +27,8 @@ class Content:
         }
 
     def __init__(self, data: Dict):
-        self.id = data.get('id')
-        self.menu_id = data.get('menu_id')
+        self.id = _intern(data.get('id'))
+        self.menu_id = _intern(data.get('menu_id'))
         self.type = data.get('type')
         self.server_path = data.get('server_path')
         self.created_at = data.get('created_at')
@@ -39,17 +53,33 @@ class Content:
 
 
 class Menu:
-    """Класс модели Menu."""
+    """
+    Класс модели Menu.
+
+    Узлы меню разделяются между всеми пользователями через кэш меню,
+    поэтому коллекции хранятся в кортежах, а строки интернируются.
+    """
+
+    __slots__ = (
+        'id', 'parent_id', 'name', 'text', 'subscription_type', 'content',
+        'children_names', 'children_ids')
+
     def __init__(self, data: Dict):
-        self.id = data.get('id')
-        self.parent_id = data.get('parent_id')
-        self.name = data.get('name')
+        self.id = _intern(data.get('id'))
+        self.parent_id = _intern(data.get('parent_id'))
+        self.name = _intern(data.get('name'))
         self.text: Optional[str] = data.get('text')
         self.subscription_type = data.get('subscription_type')
-        self.content: List[Content] = [
+        self.content: Tuple[Content, ...] = tuple(
             Content(content) for content in data.get('content', [])
-        ]
-        self.children_names: List[str] = data.get('children_names', [])
+        )
+        self.children_names: Tuple[str, ...] = tuple(
+            _intern(name) for name in data.get('children_names', [])
+        )
+        self.children_ids: Tuple[str, ...] = tuple(
+            _intern(str(child.get('id')))
+            for child in data.get('children_nodes', [])
+        )
 
     def to_dict(self) -> Dict:
         """Преобразует объект в словарь."""
@@ -0,0 +1,90 @@
+import asyncio
+import os
+
+# Конфигурация бота читается при импорте модулей, поэтому окружение
+# задается до импорта тестируемого кода
+os.environ.setdefault('BOT_TOKEN', '0:test')
+os.environ.setdefault('API_URL', 'http://127.0.0.1')
+os.environ.setdefault('API_TIMEOUT', '10')
+os.environ.setdefault('STORAGE_BACKEND', 'memory')
+
+import pytest_asyncio  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+from menu_api import API  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def api_server():
+    """
+    Локальный сервер, имитирующий API администрирования.
+
+    Возвращает приложение aiohttp, его адрес и счетчик обращений
+    к каждому пути.
+    """
+    hits = {}
+    app = web.Application()
+
+    async def menu_handler(request: web.Request) -> web.Response:
+        hits[request.path] = hits.get(request.path, 0) + 1
+        # Задержка, чтобы одновременные запросы успели пересечься
+        await asyncio.sleep(0.05)
+        return web.json_response({
+            'id': request.match_info.get('menu_id', 'root'),
+            'parent_id': None,
+            'name': 'Главное меню',
+            'text': 'Текст меню',
+            'content': [],
+            'children_names': [],
+            'children_nodes': [],
+        })
+
+    async def nodes_handler(request: web.Request) -> web.Response:
+        hits[request.path] = hits.get(request.path, 0) + 1
+        await asyncio.sleep(0.05)
+        return web.json_response([
+            {
+                'id': menu_id,
+                'parent_id': 'root',
+                'name': f'Подменю {menu_id}',
+                'text': 'Текст подменю',
+                'content': [],
+                'children_names': [],
+                'children_nodes': [],
+            }
+            for menu_id in request.query.getall('ids', [])
+        ])
+
+    async def history_handler(request: web.Request) -> web.Response:
+        hits[request.path] = hits.get(request.path, 0) + 1
+        items = (await request.json())['items']
+        # Как валидация FastAPI: пачку с неверной записью API отклоняет
+        if any(item['user_id'] == 'invalid' for item in items):
+            return web.json_response({'detail': 'invalid'}, status=422)
+        return web.json_response({'received': len(items)}, status=201)
+
+    app.router.add_post('/users/history/bulk', history_handler)
+    app.router.add_get('/menu/nodes', nodes_handler)
+    app.router.add_get('/menu/root', menu_handler)
+    app.router.add_get('/menu/{menu_id}', menu_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f'http://127.0.0.1:{port}', hits
+
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def api(api_server):
+    """Клиент API, направленный на локальный сервер."""
+    url, _ = api_server
+    client = API()
+    client.api_url = url
+    await client.start()
+    yield client
+    await client.close()
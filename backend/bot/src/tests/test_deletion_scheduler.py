@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest_asyncio
+
+from utils.deletion_scheduler import DeletionScheduler
+from utils.storage import MemoryStorage, SQLiteStorage
+
+
+class FakeBot:
+    """Бот, который запоминает удаленные сообщения."""
+
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_messages(self, chat_id, message_ids):
+        self.deleted += [(chat_id, message_id) for message_id in message_ids]
+
+
+@pytest_asyncio.fixture(params=['memory', 'sqlite'])
+async def storage(request, tmp_path):
+    if request.param == 'memory':
+        storage = MemoryStorage(max_entries=100, ttl=60)
+    else:
+        storage = SQLiteStorage(
+            str(tmp_path / 'state.db'), max_entries=100, ttl=60)
+    yield storage
+    await storage.close()
+
+
+async def test_schedulers_share_storage(storage):
+    """Процессы с общим хранилищем не затирают удаления друг друга."""
+    first = DeletionScheduler(storage)
+    second = DeletionScheduler(storage)
+    await first.schedule(1, 10, delay=60)
+    await second.schedule(-100, 20, delay=60)
+
+    pending = await storage.get_scheduled(DeletionScheduler.STORAGE_KEY)
+    assert {member for member, _ in pending} == {'1:10', '-100:20'}
+
+
+async def test_pending_deletions_survive_restart(storage):
+    """После перезапуска наступившие удаления выполняются и убираются."""
+    await DeletionScheduler(storage).schedule(1, 10, delay=0)
+
+    bot = FakeBot()
+    restarted = DeletionScheduler(storage)
+    await restarted.start(bot)
+    await asyncio.sleep(0.1)
+    await restarted.stop()
+
+    assert bot.deleted == [(1, 10)]
+    assert await storage.get_scheduled(DeletionScheduler.STORAGE_KEY) == []
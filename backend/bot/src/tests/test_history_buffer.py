@@ -0,0 +1,75 @@
+import asyncio
+
+from utils.history_buffer import HistoryBuffer
+
+
+class FlakyAPI:
+    """API истории, недоступный первые failures запросов."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+        self.received = []
+
+    async def add_history_batch(self, events: list) -> bool:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError('API недоступно')
+        self.received += events
+        return True
+
+
+def _buffer(api, max_queue_size: int = 100) -> HistoryBuffer:
+    buffer = HistoryBuffer(
+        api, batch_size=10, flush_interval=0.01, max_queue_size=max_queue_size)
+    buffer.RETRY_DELAY = 0.01
+    return buffer
+
+
+async def test_failed_batch_is_sent_after_recovery():
+    """События пачки, не отправленной из-за сбоя API, не теряются."""
+    api = FlakyAPI(failures=2)
+    buffer = _buffer(api)
+    await buffer.start()
+
+    await buffer.add(1, 'a')
+    await buffer.add(2, 'b')
+    await asyncio.sleep(0.2)
+    await buffer.add(3, 'c')
+    await buffer.stop()
+
+    assert [event['menu_id'] for event in api.received] == ['a', 'b', 'c']
+    assert buffer.sent == 3
+    assert buffer.dropped == 0
+
+
+async def test_rejected_batch_is_dropped(api, api_server):
+    """Пачка, отклоненная ответом 4xx, не повторяется и не держит очередь."""
+    _, hits = api_server
+    buffer = _buffer(api)
+    await buffer.start()
+
+    await buffer.add('invalid', 'a')
+    await asyncio.sleep(0.2)
+    await buffer.add(1, 'b')
+    await buffer.stop()
+
+    assert hits == {'/users/history/bulk': 2}
+    assert buffer.sent == 1
+    assert buffer.dropped == 1
+
+
+async def test_retry_queue_is_bounded():
+    """Пока API недоступно, буфер не растет больше max_queue_size."""
+    api = FlakyAPI(failures=1000)
+    buffer = _buffer(api, max_queue_size=3)
+    await buffer.start()
+
+    for user_id in range(5):
+        await buffer.add(user_id, 'a')
+        await asyncio.sleep(0.05)
+    assert len(buffer._pending) + buffer._queue.qsize() <= 3
+
+    await buffer.stop()
+    assert buffer.sent == 0
+    assert buffer.dropped == 5
@@ -0,0 +1,48 @@
+import asyncio
+
+MENU_ID = '00000000-0000-0000-0000-000000000001'
+
+
+async def test_concurrent_identical_lookups_coalesced(api, api_server):
+    """1000 одновременных одинаковых запросов дают одно обращение к API."""
+    _, hits = api_server
+
+    menus = await asyncio.gather(
+        *(api.get_menu_by_id(MENU_ID) for _ in range(1000)))
+
+    assert hits == {f'/menu/{MENU_ID}': 1}
+    assert all(menu.id == MENU_ID for menu in menus)
+    assert api.coalesced == 999
+
+
+async def test_different_lookups_not_coalesced(api, api_server):
+    """Запросы к разным узлам выполняются независимо."""
+    _, hits = api_server
+    other_id = '00000000-0000-0000-0000-000000000002'
+
+    await asyncio.gather(
+        api.get_menu_by_id(MENU_ID),
+        api.get_menu_by_id(other_id),
+        api.get_root_menu())
+
+    assert hits == {
+        f'/menu/{MENU_ID}': 1,
+        f'/menu/{other_id}': 1,
+        '/menu/root': 1,
+    }
+    assert api.coalesced == 0
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request(
+        api, api_server):
+    """Отмена одного из ожидающих не мешает остальным получить ответ."""
+    _, hits = api_server
+
+    first = asyncio.create_task(api.get_menu_by_id(MENU_ID))
+    second = asyncio.create_task(api.get_menu_by_id(MENU_ID))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    menu = await second
+    assert menu.id == MENU_ID
+    assert hits == {f'/menu/{MENU_ID}': 1}
@@ -0,0 +1,56 @@
+import asyncio
+
+from utils.prefetcher import MenuPrefetcher
+
+
+async def test_prefetched_menu_is_served_without_request(api, api_server):
+    """Узел, загруженный заранее, отдается без отдельного запроса."""
+    _, hits = api_server
+    prefetcher = MenuPrefetcher(api, concurrency=4, max_size=100)
+
+    prefetcher.schedule(['a', 'b'])
+    await asyncio.sleep(0.2)
+    menu = await prefetcher.get('a')
+
+    assert menu is not None and menu.id == 'a'
+    assert hits == {'/menu/nodes': 1}
+    assert prefetcher.stats()['hits'] == 1
+
+
+async def test_lookup_waits_for_pending_prefetch(api, api_server):
+    """Запрос узла во время загрузки дожидается ее, а не дублирует."""
+    _, hits = api_server
+    prefetcher = MenuPrefetcher(api, concurrency=4, max_size=100)
+
+    prefetcher.schedule(['a'])
+    menu = await prefetcher.get('a')
+
+    assert menu is not None and menu.id == 'a'
+    assert hits == {'/menu/nodes': 1}
+
+
+async def test_budget_exhausted_skips_prefetch(api, api_server):
+    """Сверх бюджета одновременных загрузок упреждение пропускается."""
+    _, hits = api_server
+    prefetcher = MenuPrefetcher(api, concurrency=1, max_size=100)
+
+    prefetcher.schedule(['a'])
+    prefetcher.schedule(['b', 'c'])
+    await asyncio.sleep(0.2)
+
+    assert hits == {'/menu/nodes': 1}
+    assert prefetcher.stats()['skipped'] == 2
+    assert await prefetcher.get('b') is None
+
+
+async def test_clear_counts_unused_menus_as_waste(api):
+    """Неиспользованные узлы при очистке считаются лишней загрузкой."""
+    prefetcher = MenuPrefetcher(api, concurrency=4, max_size=100)
+
+    prefetcher.schedule(['a', 'b', 'c'])
+    await prefetcher.get('a')
+    prefetcher.clear()
+
+    stats = prefetcher.stats()
+    assert stats['wasted'] == 2
+    assert stats['size'] == 0
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetMe, SendMessage
+
+from middlewares.rate_limit import TelegramRateLimiter, TokenBucket
+
+
+class FakeTelegram:
+    """Имитация make_request: запоминает время и чат каждого вызова."""
+
+    def __init__(self, retry_after: float = 0, failures: int = 0):
+        self.retry_after = retry_after
+        self.failures = failures
+        self.calls = []
+
+    async def __call__(self, bot, method):
+        self.calls.append((time.monotonic(), getattr(method, 'chat_id', None)))
+        if len(self.calls) <= self.failures:
+            raise TelegramRetryAfter(
+                method=method, message='Too Many Requests',
+                retry_after=self.retry_after)
+        return True
+
+
+def _limiter(**kwargs) -> TelegramRateLimiter:
+    params = {
+        'global_rate': 1000, 'chat_rate': 20, 'group_rate': 5,
+        'chat_burst': 2, 'max_retries': 3,
+    }
+    params.update(kwargs)
+    return TelegramRateLimiter(**params)
+
+
+def _send(chat_id) -> SendMessage:
+    return SendMessage(chat_id=chat_id, text='Текст')
+
+
+def test_bucket_reservations_queue_up():
+    """Резервирования сверх емкости получают растущие задержки."""
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+async def test_chat_sends_spaced_after_burst():
+    """Сообщения в один чат сверх burst идут с интервалом 1/chat_rate."""
+    limiter = _limiter()
+    telegram = FakeTelegram()
+    started = time.monotonic()
+
+    await asyncio.gather(
+        *(limiter(telegram, None, _send(1)) for _ in range(5)))
+
+    offsets = [moment - started for moment, _ in telegram.calls]
+    assert offsets[1] < 0.02
+    for previous, current in zip(offsets[1:], offsets[2:]):
+        assert current - previous == pytest.approx(0.05, abs=0.02)
+    assert limiter.stats()['sent'] == 5
+
+
+def test_private_and_group_chats_use_own_rates():
+    """Личные чаты и группы получают корзины со своими лимитами."""
+    limiter = _limiter()
+
+    assert limiter._chat_bucket(1).rate == 20
+    assert limiter._chat_bucket(-100).rate == 5
+    assert limiter._chat_bucket('@channel').rate == 5
+
+
+async def test_methods_without_chat_not_limited():
+    """Вызовы без chat_id проходят мимо корзин."""
+    limiter = _limiter()
+    telegram = FakeTelegram()
+
+    await limiter(telegram, None, GetMe())
+
+    assert len(telegram.calls) == 1
+    assert limiter.stats()['chat_buckets'] == 0
+
+
+async def test_retry_after_blocks_chat_and_global():
+    """Ответ 429 приостанавливает и чат, и остальные отправки."""
+    limiter = _limiter()
+    telegram = FakeTelegram(retry_after=0.2, failures=1)
+
+    first = asyncio.create_task(limiter(telegram, None, _send(1)))
+    await asyncio.sleep(0.05)
+    await limiter(telegram, None, _send(2))
+    await first
+
+    failed_at, _ = telegram.calls[0]
+    later = {chat_id: moment for moment, chat_id in telegram.calls[1:]}
+    assert set(later) == {1, 2}
+    assert all(moment - failed_at >= 0.19 for moment in later.values())
+    assert limiter.stats()['retries'] == 1
+
+
+async def test_retry_after_raised_after_max_retries():
+    """После max_retries повторов ошибка 429 передается вызывающему."""
+    limiter = _limiter(max_retries=2)
+    telegram = FakeTelegram(retry_after=0.01, failures=10)
+
+    with pytest.raises(TelegramRetryAfter):
+        await limiter(telegram, None, _send(1))
+
+    assert len(telegram.calls) == 3
+    assert limiter.stats()['sent'] == 0
+
+
+async def test_idle_chat_buckets_pruned():
+    """При переполнении забываются корзины простаивающих чатов."""
+    limiter = _limiter(chat_rate=1000)
+    limiter.MAX_CHAT_BUCKETS = 3
+    telegram = FakeTelegram()
+
+    for chat_id in (1, 2, 3):
+        await limiter(telegram, None, _send(chat_id))
+    await asyncio.sleep(0.01)
+    await limiter(telegram, None, _send(4))
+
+    assert set(limiter._chats) == {4}
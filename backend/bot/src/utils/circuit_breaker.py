@@ -0,0 +1,66 @@
+import logging
+import time
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Запрос не выполнен: API признан недоступным."""
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель запросов к API.
+
+    После failure_threshold ошибок подряд выключатель размыкается, и
+    запросы сразу завершаются ошибкой CircuitOpenError, не нагружая
+    упавший сервис и не заставляя пользователей ждать таймаут. Через
+    reset_timeout секунд пропускается один пробный запрос: при успехе
+    выключатель замыкается, при ошибке снова размыкается.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+
+    def check(self) -> None:
+        """Пропускает запрос или выбрасывает CircuitOpenError."""
+        if self.state == self.CLOSED:
+            return
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            # Пробный запрос; остальные ждут его результата еще
+            # reset_timeout секунд
+            self.state = self.HALF_OPEN
+            self._opened_at = time.monotonic()
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError('API временно недоступен')
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info('API снова доступен, выключатель замкнут')
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+                self.failures >= self.failure_threshold):
+            if self.state != self.OPEN:
+                logger.warning(
+                    f'API недоступен после {self.failures} ошибок, '
+                    f'запросы приостановлены на {self.reset_timeout} с')
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,137 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot
+
+from utils.storage import Storage, storage
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionScheduler:
+    """
+    Планировщик отложенного удаления служебных сообщений бота.
+
+    Обработчики передают ID сообщения и задержку и сразу возвращаются.
+    Одна фоновая задача держит очередь с приоритетом по времени удаления,
+    собирает наступившие удаления и удаляет их пачками по чатам одним
+    вызовом deleteMessages. Каждое удаление отдельно записывается
+    в расписание хранилища, поэтому после перезапуска просроченные
+    сообщения все равно будут удалены. Процессы с общим хранилищем не
+    затирают удаления друг друга; если при старте процесс подхватит
+    удаление, которое выполнит и другой процесс, повтор безвреден:
+    deleteMessages пропускает уже удаленные сообщения.
+    """
+
+    STORAGE_KEY = 'deletions'
+    # Удаления, которые наступят в пределах окна, выполняются одной пачкой
+    BATCH_WINDOW = 0.5
+    # Ограничение Telegram на число сообщений в одном deleteMessages
+    MAX_BATCH_SIZE = 100
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+        self.deleted = 0
+        self.failed = 0
+        self._heap: List[Tuple[float, int, int]] = []
+        self._wakeup = asyncio.Event()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def schedule(
+        self, chat_id: int, message_id: int, delay: float
+    ) -> None:
+        """Ставит сообщение в очередь на удаление через delay секунд."""
+        due = time.time() + delay
+        heapq.heappush(self._heap, (due, chat_id, message_id))
+        self._wakeup.set()
+        try:
+            await self.storage.add_scheduled(
+                self.STORAGE_KEY, self._member(chat_id, message_id), due)
+        except Exception as e:
+            logger.error(f'Ошибка при сохранении удаления: {e}')
+
+    async def start(self, bot: Bot) -> None:
+        """Восстанавливает очередь из хранилища и запускает удаление."""
+        self._bot = bot
+        pending = await self.storage.get_scheduled(self.STORAGE_KEY)
+        restored = set()
+        for member, due in pending:
+            chat_id, message_id = member.split(':')
+            restored.add((due, int(chat_id), int(message_id)))
+        self._heap = list(set(self._heap) | restored)
+        heapq.heapify(self._heap)
+        if pending:
+            logger.info(f'Восстановлено отложенных удалений: {len(pending)}')
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает планировщик, оставляя расписание в хранилище."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Ждет ближайшего удаления и выполняет наступившие пачкой."""
+        while True:
+            self._wakeup.clear()
+            if self._heap:
+                timeout = self._heap[0][0] - time.time()
+            else:
+                timeout = None
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            await self._delete_due()
+
+    async def _delete_due(self) -> None:
+        """Удаляет сообщения, время которых наступило."""
+        deadline = time.time() + self.BATCH_WINDOW
+        by_chat: Dict[int, List[int]] = defaultdict(list)
+        while self._heap and self._heap[0][0] <= deadline:
+            _, chat_id, message_id = heapq.heappop(self._heap)
+            by_chat[chat_id].append(message_id)
+
+        if not by_chat:
+            return
+
+        for chat_id, message_ids in by_chat.items():
+            for start in range(0, len(message_ids), self.MAX_BATCH_SIZE):
+                batch = message_ids[start:start + self.MAX_BATCH_SIZE]
+                try:
+                    await self._bot.delete_messages(chat_id, batch)
+                    self.deleted += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error(f'Ошибка при удалении сообщений: {e}')
+
+        try:
+            await self.storage.remove_scheduled(self.STORAGE_KEY, [
+                self._member(chat_id, message_id)
+                for chat_id, message_ids in by_chat.items()
+                for message_id in message_ids
+            ])
+        except Exception as e:
+            logger.error(f'Ошибка при удалении из расписания: {e}')
+
+    @staticmethod
+    def _member(chat_id: int, message_id: int) -> str:
+        return f'{chat_id}:{message_id}'
+
+
+deletion_scheduler = DeletionScheduler(storage)
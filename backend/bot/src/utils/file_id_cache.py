@@ -0,0 +1,82 @@
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class FileIdCache:
+    """
+    Постоянный кэш file_id Telegram для локальных файлов.
+
+    Ключ записи - ID контента, вместе с file_id хранится отпечаток файла
+    (путь, размер и время изменения). Если администратор заменил файл,
+    отпечаток перестает совпадать и запись считается недействительной.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._lock = asyncio.Lock()
+
+    def load(self) -> None:
+        """Загружает сохраненные file_id с диска."""
+        if not self.path.exists():
+            return
+        try:
+            self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+            logger.info(f'Загружено file_id из кэша: {len(self._entries)}')
+        except (OSError, ValueError) as e:
+            logger.error(f'Ошибка при чтении кэша file_id: {e}')
+            self._entries = {}
+
+    def get(self, key: str, file_path: Path) -> Optional[str]:
+        """Возвращает file_id, если файл не менялся с момента отправки."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.get('fingerprint') != self._fingerprint(file_path):
+            return None
+        return entry.get('file_id')
+
+    async def set(self, key: str, file_path: Path, file_id: str) -> None:
+        """Сохраняет file_id для файла и записывает кэш на диск."""
+        self._entries[key] = {
+            'fingerprint': self._fingerprint(file_path),
+            'file_id': file_id,
+        }
+        await self._save()
+
+    async def invalidate(self, key: str) -> None:
+        """Удаляет запись из кэша."""
+        if self._entries.pop(key, None) is not None:
+            await self._save()
+
+    @staticmethod
+    def _fingerprint(file_path: Path) -> str:
+        """Отпечаток файла: путь, размер и время изменения."""
+        stat = file_path.stat()
+        return f'{file_path}:{stat.st_size}:{stat.st_mtime_ns}'
+
+    async def _save(self) -> None:
+        """Атомарно записывает кэш на диск."""
+        async with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False)
+            await asyncio.to_thread(self._write, data)
+
+    def _write(self, data: str) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(data, encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f'Ошибка при сохранении кэша file_id: {e}')
+
+
+file_id_cache = FileIdCache(config.FILE_ID_CACHE_PATH)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from config import config
+from menu_api import API, RequestRejectedError, menu_api
+from utils.storage import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryBuffer:
+    """
+    Буфер истории навигации с отложенной записью.
+
+    Обработчики только кладут событие в очередь и сразу продолжают
+    работу. Фоновая задача собирает события в пачки по размеру или по
+    времени и отправляет их одним запросом на пакетный эндпоинт API.
+    Повторные просмотры одного и того же меню подряд не записываются.
+
+    Пачка, которую не удалось отправить из-за временной ошибки,
+    возвращается в начало очереди и отправляется повторно с растущей
+    задержкой, пока API не ответит. Пачка, отклоненная ответом 4xx,
+    отбрасывается.
+    Неотправленные события вместе с очередью ограничены max_queue_size,
+    поэтому долгий сбой API не раздувает память. При остановке каждая
+    пачка отправляется один раз, без ожидания.
+    """
+
+    # Задержка перед первым повтором, удваивается до MAX_RETRY_DELAY
+    RETRY_DELAY = 1.0
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(
+        self,
+        api: API,
+        batch_size: int,
+        flush_interval: float,
+        max_queue_size: int
+    ):
+        self.api = api
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        # События неотправленных пачек, в порядке поступления
+        self._pending: List[dict] = []
+        self._failures = 0
+        self._stopped = asyncio.Event()
+        # Последнее записанное меню пользователя, только для отсева
+        # повторов, поэтому достаточно ограниченного кэша в памяти
+        self._last_menu = MemoryStorage(
+            config.STORAGE_MAX_ENTRIES, config.STORAGE_TTL)
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def add(self, user_id: int, menu_id: str) -> None:
+        """Добавляет событие просмотра меню без ожидания записи."""
+        if await self._last_menu.get(str(user_id)) == menu_id:
+            logger.debug(f'Пропускаем дублирование истории для меню {menu_id}')
+            return
+
+        event = {
+            'user_id': str(user_id),
+            'menu_id': str(menu_id),
+            'action_date': datetime.now(timezone.utc).strftime(
+                '%Y-%m-%d %H:%M:%S'),
+        }
+        try:
+            if len(self._pending) + self._queue.qsize() >= self.max_queue_size:
+                raise asyncio.QueueFull
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning('Очередь истории переполнена, событие отброшено')
+            return
+
+        await self._last_menu.set(str(user_id), menu_id)
+
+    async def start(self) -> None:
+        """Запускает фоновую отправку истории."""
+        if self._task is None:
+            self._stopping = False
+            self._stopped.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает буфер, отправив все накопленные события."""
+        if self._task is None:
+            return
+
+        self._stopping = True
+        self._stopped.set()
+        try:
+            # Будим задачу, если она ждет новых событий
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+        await self._task
+        self._task = None
+        logger.info(
+            f'Буфер истории остановлен: отправлено {self.sent}, '
+            f'отброшено {self.dropped}, ошибок {self.failed}')
+
+    async def _run(self) -> None:
+        """Собирает и отправляет пачки, пока буфер не остановлен."""
+        while True:
+            if self._pending:
+                await self._wait_retry()
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            else:
+                batch = await self._collect_batch()
+            if batch:
+                await self._send(batch)
+            if self._stopping and not self._pending and self._queue.empty():
+                return
+
+    async def _wait_retry(self) -> None:
+        """Ждет перед повторной отправкой; при остановке не ждет."""
+        if self._failures == 0:
+            return
+        delay = min(
+            self.RETRY_DELAY * 2 ** (self._failures - 1), self.MAX_RETRY_DELAY)
+        try:
+            await asyncio.wait_for(self._stopped.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _collect_batch(self) -> List[dict]:
+        """Ждет первое событие и добирает пачку до размера или таймаута."""
+        loop = asyncio.get_running_loop()
+        batch: List[dict] = []
+        deadline = None
+
+        while len(batch) < self.batch_size:
+            if self._stopping and self._queue.empty():
+                break
+
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+            try:
+                event = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            if event is None:
+                continue
+
+            batch.append(event)
+            if deadline is None:
+                deadline = loop.time() + self.flush_interval
+
+        return batch
+
+    async def _send(self, batch: List[dict]) -> None:
+        """Отправляет пачку событий в API."""
+        try:
+            success = await self.api.add_history_batch(batch)
+        except RequestRejectedError as e:
+            # Пачку с ошибкой в данных бесполезно повторять: она бы
+            # держала очередь, пока бот не перезапустят
+            self.failed += len(batch)
+            self.dropped += len(batch)
+            logger.error(f'API отклонило пачку истории, отброшено: {e}')
+            return
+        except Exception as e:
+            logger.error(f'Ошибка при отправке истории: {e}')
+            success = False
+
+        if success:
+            self.sent += len(batch)
+            self._failures = 0
+            return
+
+        self.failed += len(batch)
+        if self._stopping:
+            self.dropped += len(batch)
+            logger.warning(
+                f'История не отправлена при остановке: {len(batch)} событий')
+            return
+
+        self._failures += 1
+        self._pending[:0] = batch
+        overflow = len(self._pending) + self._queue.qsize() - self.max_queue_size
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped += overflow
+            logger.warning(
+                f'Буфер истории переполнен, отброшено {overflow} событий')
+
+
+history_buffer = HistoryBuffer(
+    menu_api,
+    batch_size=config.HISTORY_BATCH_SIZE,
+    flush_interval=config.HISTORY_FLUSH_INTERVAL,
+    max_queue_size=config.HISTORY_QUEUE_SIZE,
+)
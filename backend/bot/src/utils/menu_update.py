@@ -1,12 +1,14 @@
-import asyncio
 
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 
-from menu_api import API
 from models import Menu
-from keyboards import create_menu_keyboard, create_rating_keyboard
+from keyboards import create_rating_keyboard
+from menu_cache import menu_cache
 from utils.constants import SHOW_RATING_MES_DEL
+from utils.deletion_scheduler import deletion_scheduler
+from utils.history_buffer import history_buffer
+from utils.render_cache import render_cache
 from utils.texts import TEXTS
 from utils.storage import rated_menus
 
@@ -35,6 +37,9 @@ async def update_menu_state(
         menu, message, callback, is_root
     )
 
+    # Заранее загружаем подменю, по которым пользователь может перейти
+    menu_cache.prefetch_children(menu)
+
     # Показываем запрос оценки при необходимости
     await _show_rating_if_needed(
         state, menu, user_id, target_message
@@ -56,22 +61,25 @@ async def _save_navigation_history(
     menu: Menu,
     user_id: int
 ):
-    """Сохраняет историю навигации пользователя."""
+    """Ставит переход в очередь на запись в историю пользователя."""
     state_data = await state.get_data()
     last_menu_id = state_data.get('last_history_menu_id')
 
     # Сохраняем только при переходе в другое меню
     if last_menu_id != menu.id:
-        menu_api = API()
-        await menu_api.add_to_history(user_id, menu.id)
+        await history_buffer.add(user_id, menu.id)
 
 
 async def _update_user_state(state: FSMContext, menu: Menu):
-    """Обновляет состояние FSM с данными текущего меню."""
+    """
+    Обновляет состояние FSM с данными текущего меню.
+
+    В состоянии хранятся только ID: само меню и его контент берутся
+    из общего кэша меню.
+    """
     await state.update_data(
         current_menu_id=menu.id,
-        current_children=menu.children_names,
-        current_content=[content.to_dict() for content in menu.content],
+        current_children_ids=menu.children_ids,
         rating_shown=False,
         last_history_menu_id=menu.id
     )
@@ -84,8 +92,7 @@ async def _send_or_update_menu_message(
     is_root: bool = False
 ) -> Message:
     """Отправляет новое сообщение или редактирует существующее."""
-    keyboard = create_menu_keyboard(menu, is_root=is_root)
-    text = f'<b>{menu.name}</b>\n\n{menu.text}'
+    text, keyboard = render_cache.render(menu, is_root, menu_cache.revision)
 
     if message:
         await message.answer(text, reply_markup=keyboard, parse_mode='HTML')
@@ -118,7 +125,7 @@ async def _show_rating_if_needed(
     should_show_rating = (
         menu.content
         and not state_data.get('rating_shown', False)
-        and menu.id not in rated_menus.get(user_id, set())
+        and menu.id not in await rated_menus.get(user_id, [])
     )
 
     if should_show_rating:
@@ -128,5 +135,8 @@ async def _show_rating_if_needed(
             reply_markup=rating_keyboard,
             parse_mode='HTML'
         )
-        await asyncio.sleep(SHOW_RATING_MES_DEL)
-        await rating_message.delete()
+        await deletion_scheduler.schedule(
+            rating_message.chat.id,
+            rating_message.message_id,
+            SHOW_RATING_MES_DEL
+        )
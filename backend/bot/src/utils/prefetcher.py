@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from menu_api import API
+from models import Menu
+
+logger = logging.getLogger(__name__)
+
+
+class MenuPrefetcher:
+    """
+    Упреждающая загрузка дочерних меню.
+
+    Когда пользователю показано меню, его подменю, которых нет в кэше,
+    запрашиваются в фоне одним пакетным запросом. Следующий клик по
+    подменю берет узел отсюда, а если загрузка еще идет, дожидается ее
+    вместо отдельного запроса. Число одновременных загрузок ограничено:
+    сверх бюджета упреждение пропускается, а не ставится в очередь.
+    """
+
+    def __init__(self, api: API, concurrency: int, max_size: int):
+        self.api = api
+        self.concurrency = concurrency
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.skipped = 0
+        self.fetched = 0
+        self._active = 0
+        self._generation = 0
+        self._menus: OrderedDict[str, Menu] = OrderedDict()
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, menu_ids: Iterable[str]) -> None:
+        """Запускает фоновую загрузку узлов, которых еще нет."""
+        ids = [
+            menu_id for menu_id in map(str, menu_ids)
+            if menu_id not in self._menus and menu_id not in self._pending
+        ]
+        if not ids:
+            return
+        if self._active >= self.concurrency:
+            self.skipped += len(ids)
+            return
+
+        self._active += 1
+        task = asyncio.create_task(self._fetch(ids, self._generation))
+        for menu_id in ids:
+            self._pending[menu_id] = task
+
+    async def get(self, menu_id: str) -> Optional[Menu]:
+        """Возвращает загруженный заранее узел или None."""
+        key = str(menu_id)
+        task = self._pending.get(key)
+        if task is not None:
+            try:
+                await asyncio.shield(task)
+            except Exception:
+                pass
+
+        menu = self._menus.pop(key, None)
+        if menu is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return menu
+
+    def clear(self) -> None:
+        """Забывает загруженные узлы, например при смене ревизии меню."""
+        self.wasted += len(self._menus)
+        self._menus.clear()
+        # Загрузки, начатые до очистки, не должны вернуть старые узлы
+        self._generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает метрики упреждающей загрузки."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'wasted': self.wasted,
+            'skipped': self.skipped,
+            'fetched': self.fetched,
+            'size': len(self._menus),
+        }
+
+    async def _fetch(self, menu_ids: List[str], generation: int) -> None:
+        try:
+            menus = await self.api.get_menus_by_ids(menu_ids)
+            if generation != self._generation:
+                return
+            for menu in menus:
+                self._store(menu)
+            self.fetched += len(menus)
+        except Exception as e:
+            logger.debug(f'Не удалось заранее загрузить меню: {e}')
+        finally:
+            self._active -= 1
+            for menu_id in menu_ids:
+                self._pending.pop(menu_id, None)
+
+    def _store(self, menu: Menu) -> None:
+        self._menus[str(menu.id)] = menu
+        self._menus.move_to_end(str(menu.id))
+        while len(self._menus) > self.max_size:
+            self._menus.popitem(last=False)
+            self.wasted += 1
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from config import config
+from keyboards import create_menu_keyboard
+from models import Menu
+
+Rendered = Tuple[str, InlineKeyboardMarkup]
+
+
+class RenderCache:
+    """
+    Кэш готовых текста и клавиатуры меню.
+
+    Все пользователи видят одни и те же меню, поэтому разметка строится
+    один раз на узел и переиспользуется. Ключ - (ID узла, ревизия меню,
+    признак корня). При смене ревизии кэш очищается целиком, размер
+    ограничен вытеснением давно не использованных записей.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._revision: Optional[int] = None
+        self._entries: OrderedDict[tuple, Rendered] = OrderedDict()
+
+    def render(
+        self, menu: Menu, is_root: bool, revision: Optional[int]
+    ) -> Rendered:
+        """Возвращает текст и клавиатуру меню."""
+        if revision != self._revision:
+            self._entries.clear()
+            self._revision = revision
+
+        key = (menu.id, revision, is_root)
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rendered
+
+        self.misses += 1
+        rendered = (
+            f'<b>{menu.name}</b>\n\n{menu.text}',
+            create_menu_keyboard(menu, is_root=is_root),
+        )
+        self._entries[key] = rendered
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return rendered
+
+
+render_cache = RenderCache(config.RENDER_CACHE_SIZE)
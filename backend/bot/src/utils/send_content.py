@@ -1,22 +1,28 @@
 import logging
 from pathlib import Path
+from typing import Iterable, Optional
 
-from aiogram.types import FSInputFile
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
 
+from config import config
 from keyboards import create_navigation_buttons
+from models import Content
+from utils.file_id_cache import file_id_cache
 from utils.texts import TEXTS
 
 logger = logging.getLogger(__name__)
 
 
-async def send_content_to_user(message, content: dict):
+async def send_content_to_user(message, content: Content):
     """
     Отправляет контент пользователю в зависимости от типа и источника.
 
     Параметры:
-        content: Словарь с информацией о контенте
+        content: Контент узла меню
     """
-    content_path = content.get('server_path', '')
+    content_path = content.server_path or ''
 
     if _is_url(content_path):
         await _send_url_content(message, content_path)
@@ -44,13 +50,14 @@ async def _send_url_content(message, url: str):
     await _send_navigation_buttons(message)
 
 
-async def _send_local_content(message, content: dict):
+async def _send_local_content(message, content: Content):
     """Отправляет локальный контент."""
     await send_local_file(
         message,
-        content.get('server_path', ''),
-        content.get('type', 0),
-        content.get('name', 'Файл')
+        content.server_path or '',
+        content.type or 0,
+        'Файл',
+        content_id=content.id
     )
     await _send_navigation_buttons(message)
 
@@ -70,14 +77,22 @@ async def _send_navigation_buttons(message):
 
 
 async def send_local_file(
-        message, file_path: str, content_type: int, name: str):
+        message,
+        file_path: str,
+        content_type: int,
+        name: str,
+        content_id: Optional[str] = None):
     """
     Отправляет локальный файл пользователю.
 
+    Если файл уже отправлялся и не менялся, повторно используется
+    file_id Telegram без загрузки файла.
+
     Параметры:
         file_path: Путь к файлу на сервере
         content_type: Тип контента (1 - изображение, 2 - видео, 3 - документ)
         name: Имя файла для подписи
+        content_id: ID контента, ключ в кэше file_id
     """
     path = Path(file_path)
 
@@ -86,38 +101,108 @@ async def send_local_file(
         await message.answer(TEXTS['content_not_found'])
         return
 
-    file_input = FSInputFile(path)
+    handler = CONTENT_HANDLERS.get(content_type, _send_document)
+    cache_key = str(content_id or file_path)
 
-    # Соответствие контента и методов отправки
-    content_handlers = {
-        1: _send_photo,
-        2: _send_video,
-        3: _send_document,
-    }
+    file_id = file_id_cache.get(cache_key, path)
+    if file_id:
+        try:
+            await handler(message, file_id, name)
+            return
+        except TelegramBadRequest as e:
+            logger.warning(f'Сохраненный file_id недействителен: {e}')
+            await file_id_cache.invalidate(cache_key)
+
+    sent_message = await handler(message, FSInputFile(path), name)
+    await _remember_file_id(cache_key, path, sent_message)
+
+
+async def prefill_file_id_cache(bot: Bot, contents: Iterable[Content]):
+    """
+    Заполняет кэш file_id при старте бота.
 
-    handler = content_handlers.get(content_type, _send_document)
-    await handler(message, file_input, name)
+    Файлы, которых еще нет в кэше, отправляются в служебный чат
+    FILE_ID_CACHE_PREFILL_CHAT_ID, после чего сообщения удаляются.
+    """
+    chat_id = config.FILE_ID_CACHE_PREFILL_CHAT_ID
+    if not chat_id:
+        return
 
+    senders = {
+        1: lambda file_input: bot.send_photo(chat_id, photo=file_input),
+        2: lambda file_input: bot.send_video(chat_id, video=file_input),
+        3: lambda file_input: bot.send_document(chat_id, document=file_input),
+    }
 
-async def _send_photo(message, file_input, name: str):
+    uploaded = 0
+    for content in contents:
+        if not _is_local_file(content.server_path or ''):
+            continue
+
+        path = Path(content.server_path)
+        cache_key = str(content.id or content.server_path)
+        if not path.exists() or file_id_cache.get(cache_key, path):
+            continue
+
+        send = senders.get(content.type, senders[3])
+        try:
+            sent_message = await send(FSInputFile(path))
+            await _remember_file_id(cache_key, path, sent_message)
+            await sent_message.delete()
+            uploaded += 1
+        except Exception as e:
+            logger.error(f'Ошибка предзагрузки файла {path}: {e}')
+
+    logger.info(f'Предзагрузка file_id завершена, загружено файлов: {uploaded}')
+
+
+async def _remember_file_id(cache_key: str, path: Path, sent_message: Message):
+    """Сохраняет file_id из отправленного сообщения."""
+    file_id = _extract_file_id(sent_message)
+    if file_id:
+        await file_id_cache.set(cache_key, path, file_id)
+
+
+def _extract_file_id(sent_message: Message) -> Optional[str]:
+    """Извлекает file_id загруженного файла из сообщения."""
+    if sent_message is None:
+        return None
+    if sent_message.photo:
+        return sent_message.photo[-1].file_id
+    for media in (sent_message.video, sent_message.document,
+                  sent_message.animation):
+        if media:
+            return media.file_id
+    return None
+
+
+async def _send_photo(message, file_input, name: str) -> Message:
     """Отправляет фото."""
-    await message.answer_photo(
+    return await message.answer_photo(
         photo=file_input,
         caption=TEXTS['photo_type']
     )
 
 
-async def _send_video(message, file_input, name: str):
+async def _send_video(message, file_input, name: str) -> Message:
     """Отправляет видео."""
-    await message.answer_video(
+    return await message.answer_video(
         video=file_input,
         caption=TEXTS['video_type']
     )
 
 
-async def _send_document(message, file_input, name: str):
+async def _send_document(message, file_input, name: str) -> Message:
     """Отправляет документ."""
-    await message.answer_document(
+    return await message.answer_document(
         document=file_input,
         caption=TEXTS['doc_type']
     )
+
+
+# Соответствие контента и методов отправки
+CONTENT_HANDLERS = {
+    1: _send_photo,
+    2: _send_video,
+    3: _send_document,
+}
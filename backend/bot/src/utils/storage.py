@@ -1,3 +1,351 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class Storage(ABC):
+    """Асинхронное хранилище ключ-значение для состояния пользователей."""
+
+    @abstractmethod
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Возвращает значение по ключу или default."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Сохраняет значение по ключу."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удаляет значение по ключу."""
+
+    async def close(self) -> None:
+        """Освобождает ресурсы хранилища."""
+
+    @abstractmethod
+    async def add_scheduled(self, key: str, member: str, due: float) -> None:
+        """
+        Добавляет member в расписание key со временем due.
+
+        Расписание - упорядоченное по времени множество, как sorted set
+        в Redis: каждый элемент хранится отдельно, поэтому добавление и
+        удаление не переписывают расписание целиком, а несколько
+        процессов с общим хранилищем не затирают элементы друг друга.
+        """
+
+    @abstractmethod
+    async def remove_scheduled(self, key: str, members: Iterable[str]) -> None:
+        """Удаляет элементы из расписания key."""
+
+    @abstractmethod
+    async def get_scheduled(
+        self, key: str, until: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """Возвращает пары (member, due) с due не позже until по возрастанию."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики работы хранилища."""
+
+
+class MemoryStorage(Storage):
+    """
+    Хранилище в памяти с вытеснением LRU и сроком жизни записей.
+
+    Число записей ограничено max_entries: при переполнении удаляется
+    запись, к которой дольше всего не обращались. Записи старше ttl
+    секунд считаются отсутствующими.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._scheduled: Dict[str, Dict[str, float]] = {}
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def add_scheduled(self, key: str, member: str, due: float) -> None:
+        self._scheduled.setdefault(key, {})[member] = due
+
+    async def remove_scheduled(self, key: str, members: Iterable[str]) -> None:
+        scheduled = self._scheduled.get(key, {})
+        for member in members:
+            scheduled.pop(member, None)
+
+    async def get_scheduled(
+        self, key: str, until: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        items = self._scheduled.get(key, {}).items()
+        return sorted(
+            ((member, due) for member, due in items
+             if until is None or due <= until),
+            key=lambda item: item[1])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class SQLiteStorage(Storage):
+    """
+    Постоянное хранилище в файле SQLite.
+
+    Значения сериализуются в JSON и переживают перезапуск бота. Перед
+    файлом стоит ограниченный кэш MemoryStorage, поэтому память процесса
+    не растет с числом пользователей. Запросы к SQLite выполняются
+    в отдельном потоке, чтобы не блокировать цикл событий.
+    """
+
+    # Как часто (в операциях записи) удалять просроченные записи
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._cache = MemoryStorage(max_entries, ttl)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        missing = object()
+        value = await self._cache.get(key, missing)
+        if value is not missing:
+            return value
+
+        value = await asyncio.to_thread(self._read, key)
+        if value is None:
+            return default
+
+        await self._cache.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._cache.set(key, value)
+        await asyncio.to_thread(self._write, key, value)
+
+    async def delete(self, key: str) -> None:
+        await self._cache.delete(key)
+        await asyncio.to_thread(
+            self._execute, 'DELETE FROM kv WHERE key = ?', (key,))
+
+    async def add_scheduled(self, key: str, member: str, due: float) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            'INSERT OR REPLACE INTO scheduled (key, member, due) '
+            'VALUES (?, ?, ?)',
+            (key, member, due))
+
+    async def remove_scheduled(self, key: str, members: Iterable[str]) -> None:
+        await asyncio.to_thread(
+            self._executemany,
+            'DELETE FROM scheduled WHERE key = ? AND member = ?',
+            [(key, member) for member in members])
+
+    async def get_scheduled(
+        self, key: str, until: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            'SELECT member, due FROM scheduled '
+            'WHERE key = ? AND due <= ? ORDER BY due',
+            (key, float('inf') if until is None else until))
+        return [(member, due) for member, due in rows]
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, check_same_thread=False, isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS kv ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'expires_at REAL NOT NULL)')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS scheduled ('
+                'key TEXT NOT NULL, member TEXT NOT NULL, due REAL NOT NULL, '
+                'PRIMARY KEY (key, member))')
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS scheduled_due '
+                'ON scheduled (key, due)')
+        return self._connection
+
+    def _execute(self, query: str, params: tuple) -> list:
+        with self._lock:
+            return self._connect().execute(query, params).fetchall()
+
+    def _executemany(self, query: str, params: List[tuple]) -> None:
+        with self._lock:
+            self._connect().executemany(query, params)
+
+    def _read(self, key: str) -> Any:
+        rows = self._execute(
+            'SELECT value FROM kv WHERE key = ? AND expires_at >= ?',
+            (key, time.time()))
+        if not rows:
+            return None
+        return json.loads(rows[0][0])
+
+    def _write(self, key: str, value: Any) -> None:
+        self._execute(
+            'INSERT OR REPLACE INTO kv (key, value, expires_at) '
+            'VALUES (?, ?, ?)',
+            (key, json.dumps(value), time.time() + self.ttl))
+
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._execute(
+                'DELETE FROM kv WHERE expires_at < ?', (time.time(),))
+
+
+class RedisStorage(Storage):
+    """
+    Хранилище в Redis (или совместимом сервере).
+
+    Подходит для запуска нескольких процессов бота с общим состоянием.
+    Срок жизни записей задается средствами Redis. Требует пакет redis.
+    """
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError(
+                'Для STORAGE_BACKEND=redis установите пакет redis') from e
+
+        self.ttl = int(ttl)
+        self.hits = 0
+        self.misses = 0
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        raw = await self._redis.get(key)
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._redis.set(key, json.dumps(value), ex=self.ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+    async def add_scheduled(self, key: str, member: str, due: float) -> None:
+        await self._redis.zadd(key, {member: due})
+
+    async def remove_scheduled(self, key: str, members: Iterable[str]) -> None:
+        members = list(members)
+        if members:
+            await self._redis.zrem(key, *members)
+
+    async def get_scheduled(
+        self, key: str, until: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        rows = await self._redis.zrangebyscore(
+            key, '-inf', '+inf' if until is None else until, withscores=True)
+        return [(member.decode(), due) for member, due in rows]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class UserStore:
+    """Представление хранилища для одного вида данных пользователя."""
+
+    def __init__(self, storage: Storage, prefix: str):
+        self.storage = storage
+        self.prefix = prefix
+
+    async def get(self, user_id: int, default: Any = None) -> Any:
+        return await self.storage.get(self._key(user_id), default)
+
+    async def set(self, user_id: int, value: Any) -> None:
+        await self.storage.set(self._key(user_id), value)
+
+    async def delete(self, user_id: int) -> None:
+        await self.storage.delete(self._key(user_id))
+
+    def _key(self, user_id: int) -> str:
+        return f'{self.prefix}:{user_id}'
+
+
+def create_storage() -> Storage:
+    """Создает хранилище по настройке STORAGE_BACKEND."""
+    backend = config.STORAGE_BACKEND
+    if backend == 'memory':
+        return MemoryStorage(config.STORAGE_MAX_ENTRIES, config.STORAGE_TTL)
+    if backend == 'sqlite':
+        return SQLiteStorage(
+            config.STORAGE_PATH, config.STORAGE_MAX_ENTRIES, config.STORAGE_TTL)
+    if backend == 'redis':
+        return RedisStorage(config.STORAGE_REDIS_URL, config.STORAGE_TTL)
+    raise ValueError(f'Неизвестный STORAGE_BACKEND: {backend}')
+
+
 # Хранилище для навигации и оценок
-navigation_stack: dict[int, list[str]] = {}
-rated_menus: dict[int, set[str]] = {}
+storage = create_storage()
+# Стек ID меню для кнопки "Назад", не глубже NAVIGATION_STACK_LIMIT
+navigation_stack = UserStore(storage, 'nav')
+# ID меню, которые пользователь уже оценил
+rated_menus = UserStore(storage, 'rated')
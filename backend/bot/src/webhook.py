@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from typing import Set
+
+from aiogram import Bot, Dispatcher
+from aiohttp import web
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+class WebhookHandler:
+    """
+    Прием обновлений Telegram через вебхук.
+
+    Каждое обновление обрабатывается в отдельной задаче, а Telegram сразу
+    получает ответ 200. Число одновременно обрабатываемых обновлений
+    ограничено семафором: когда он исчерпан, новые запросы ждут, и
+    нагрузка упирается в прокси, а не в память процесса.
+    """
+
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        secret: str,
+        max_concurrency: int
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.secret = secret
+        self.processed = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Принимает обновление и ставит его в обработку."""
+        if self.secret and request.headers.get(SECRET_HEADER) != self.secret:
+            return web.Response(status=401)
+
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+
+        await self._semaphore.acquire()
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response()
+
+    async def drain(self) -> None:
+        """Дожидается обработки уже принятых обновлений."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _process(self, update: dict) -> None:
+        try:
+            result = await self.dp.feed_webhook_update(self.bot, update)
+            if result is not None:
+                await self.dp.silent_call_request(self.bot, result)
+            self.processed += 1
+        except Exception as e:
+            logger.error(f'Ошибка при обработке обновления: {e}')
+        finally:
+            self._semaphore.release()
+
+
+def create_webhook_app(handler: WebhookHandler, path: str) -> web.Application:
+    """Создает aiohttp-приложение с маршрутом вебхука."""
+    app = web.Application()
+    app.router.add_post(path, handler.handle)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """Регистрирует вебхук в Telegram и принимает обновления."""
+    handler = WebhookHandler(
+        dp, bot,
+        secret=config.WEBHOOK_SECRET,
+        max_concurrency=config.WEBHOOK_MAX_CONCURRENCY
+    )
+    app = create_webhook_app(handler, config.WEBHOOK_PATH)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, config.WEBHOOK_HOST, config.WEBHOOK_PORT)
+    await site.start()
+
+    if config.WEBHOOK_BASE_URL:
+        await bot.set_webhook(
+            url=f'{config.WEBHOOK_BASE_URL}{config.WEBHOOK_PATH}',
+            secret_token=config.WEBHOOK_SECRET or None,
+            max_connections=min(config.WEBHOOK_MAX_CONCURRENCY, 100),
+            allowed_updates=dp.resolve_used_update_types()
+        )
+    logger.info(
+        f'Вебхук слушает {config.WEBHOOK_HOST}:{config.WEBHOOK_PORT}'
+        f'{config.WEBHOOK_PATH}')
+
+    try:
+        await dp.emit_startup(bot=bot)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await handler.drain()
+        await dp.emit_shutdown(bot=bot)
@@ -17,7 +17,14 @@ CREATE TABLE content.menu_node (
 	"parent_id" UUID,
 	"name" VARCHAR(255) NOT NULL,
 	"text" TEXT,
-	"subscription_type" VARCHAR(255)
+	"subscription_type" VARCHAR(255),
+	-- Материализованный путь "/id_корня/.../id_узла/", поддерживается сервисом
+	"path" TEXT COLLATE "C" NOT NULL DEFAULT '',
+	-- Поисковый вектор по имени (вес A) и тексту (вес B)
+	"search_vector" TSVECTOR GENERATED ALWAYS AS (
+		setweight(to_tsvector('russian', coalesce("name", '')), 'A') ||
+		setweight(to_tsvector('russian', coalesce("text", '')), 'B')
+	) STORED
 );
 
 CREATE TABLE content.content (
@@ -53,9 +60,74 @@ CREATE TABLE content.user_menu_node (
 	"post_rating" BOOLEAN,
 	"created_at" TIMESTAMP NOT NULL DEFAULT now(),
     "updated_at" TIMESTAMP NOT NULL DEFAULT now(),
-	UNIQUE ("user_id", "menu_id")
+	CONSTRAINT unique_user_menu_rating UNIQUE ("user_id", "menu_id")
 );
 
+-- Ревизия меню: единственная строка, счетчик растет при любом изменении
+-- узлов меню или контента. Используется клиентами для инвалидации кэша.
+CREATE TABLE content.menu_revision (
+	"id" SMALLINT PRIMARY KEY DEFAULT 1 CHECK ("id" = 1),
+	"revision" BIGINT NOT NULL DEFAULT 0,
+	"updated_at" TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO content.menu_revision ("id", "revision") VALUES (1, 0);
+
+CREATE OR REPLACE FUNCTION content.bump_menu_revision() RETURNS trigger AS $$
+BEGIN
+	UPDATE content.menu_revision
+	SET "revision" = "revision" + 1, "updated_at" = now()
+	WHERE "id" = 1;
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER menu_node_bump_revision
+	AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON content.menu_node
+	FOR EACH STATEMENT EXECUTE FUNCTION content.bump_menu_revision();
+
+CREATE TRIGGER content_bump_revision
+	AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON content.content
+	FOR EACH STATEMENT EXECUTE FUNCTION content.bump_menu_revision();
+
+
+-- Счетчики оценок узлов меню. Поддерживаются триггером на user_menu_node,
+-- поэтому сводка по узлу читается по первичному ключу. Расхождения
+-- исправляет периодическая сверка в админке.
+CREATE TABLE content.menu_rating_counter (
+	"menu_id" UUID PRIMARY KEY,
+	"useful_count" BIGINT NOT NULL DEFAULT 0,
+	"not_useful_count" BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION content.count_menu_rating() RETURNS trigger AS $$
+BEGIN
+	IF TG_OP = 'UPDATE'
+		AND OLD."menu_id" = NEW."menu_id"
+		AND OLD."post_rating" IS NOT DISTINCT FROM NEW."post_rating" THEN
+		RETURN NULL;
+	END IF;
+	IF TG_OP IN ('UPDATE', 'DELETE') THEN
+		UPDATE content.menu_rating_counter
+		SET "useful_count" = "useful_count" - (OLD."post_rating" IS TRUE)::int,
+			"not_useful_count" = "not_useful_count" - (OLD."post_rating" IS FALSE)::int
+		WHERE "menu_id" = OLD."menu_id";
+	END IF;
+	IF TG_OP IN ('INSERT', 'UPDATE') THEN
+		INSERT INTO content.menu_rating_counter AS c ("menu_id", "useful_count", "not_useful_count")
+		VALUES (NEW."menu_id", (NEW."post_rating" IS TRUE)::int, (NEW."post_rating" IS FALSE)::int)
+		ON CONFLICT ("menu_id") DO UPDATE
+		SET "useful_count" = c."useful_count" + EXCLUDED."useful_count",
+			"not_useful_count" = c."not_useful_count" + EXCLUDED."not_useful_count";
+	END IF;
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_menu_node_count_rating
+	AFTER INSERT OR UPDATE OF "menu_id", "post_rating" OR DELETE ON content.user_menu_node
+	FOR EACH ROW EXECUTE FUNCTION content.count_menu_rating();
+
 
 -- Добавление внешних ключей
 ALTER TABLE content.menu_node ADD FOREIGN KEY ("parent_id") REFERENCES content.menu_node ("id");
@@ -65,6 +137,7 @@ ALTER TABLE content.history ADD FOREIGN KEY ("user_id") REFERENCES content."user
 ALTER TABLE content.history ADD FOREIGN KEY ("menu_id") REFERENCES content.menu_node ("id");
 ALTER TABLE content.user_menu_node ADD FOREIGN KEY ("menu_id") REFERENCES content.menu_node ("id");
 ALTER TABLE content.user_menu_node ADD FOREIGN KEY ("user_id") REFERENCES content."user" ("id");
+ALTER TABLE content.menu_rating_counter ADD FOREIGN KEY ("menu_id") REFERENCES content.menu_node ("id") ON DELETE CASCADE;
 
 
 -- Вставка тестовых данных
@@ -290,6 +363,14 @@ INSERT INTO content.content ("menu_id", "type", "server_path") VALUES
 ('00000000-0000-0000-0000-000000000290', 3, 'uploaded_content/Compensation_procedure_TSR.pdf');
 
 
+-- Материализованные пути для тестовых узлов
+WITH RECURSIVE tree AS (
+	SELECT "id", '/' || "id" || '/' AS "path" FROM content.menu_node WHERE "parent_id" IS NULL
+	UNION ALL
+	SELECT n."id", t."path" || n."id" || '/' FROM content.menu_node n JOIN tree t ON n."parent_id" = t."id"
+)
+UPDATE content.menu_node m SET "path" = tree."path" FROM tree WHERE m."id" = tree."id";
+
 INSERT INTO content.question ("user_id", "text", "admin_answer") VALUES
 ('user_001', 'Какой график работы вашей службы поддержки?', 'Наша служба поддержки работает с 9:00 до 18:00 по московскому времени в рабочие дни.'),
 ('user_002', 'Можно ли получить консультацию сурдолога онлайн?', 'Да, мы организуем онлайн-консультации со специалистами. Заполните форму на нашем сайте.'),
@@ -319,10 +400,18 @@ INSERT INTO content.user_menu_node ("user_id", "menu_id", "post_rating") VALUES
 
 -- Создание индексов
 CREATE INDEX CONCURRENTLY idx_menu_node_parent_id ON content.menu_node(parent_id) WHERE parent_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY idx_menu_node_path ON content.menu_node(path);
+CREATE INDEX CONCURRENTLY idx_menu_node_search_vector ON content.menu_node USING GIN (search_vector);
+CREATE UNIQUE INDEX CONCURRENTLY idx_menu_node_name ON content.menu_node(name);
+CREATE INDEX CONCURRENTLY idx_menu_node_root ON content.menu_node(id) WHERE parent_id IS NULL;
 CREATE INDEX CONCURRENTLY idx_content_menu_id ON content.content(menu_id);
 CREATE INDEX CONCURRENTLY idx_history_user_id ON content.history(user_id);
 CREATE INDEX CONCURRENTLY idx_history_menu_id ON content.history(menu_id) WHERE menu_id IS NOT NULL;
 CREATE INDEX CONCURRENTLY idx_question_user_id ON content.question(user_id);
-CREATE INDEX CONCURRENTLY idx_history_user_action_date ON content.history(user_id, action_date);
+CREATE INDEX CONCURRENTLY idx_history_user_action_date ON content.history(user_id, action_date, id);
 CREATE INDEX CONCURRENTLY idx_user_menu_node_menu_id_rating ON content.user_menu_node (menu_id, post_rating);
-CREATE INDEX CONCURRENTLY idx_user_menu_node_menu_id ON content.user_menu_node(menu_id);
\ No newline at end of file
+-- Ключи курсорной пагинации: колонка сортировки и id
+CREATE INDEX CONCURRENTLY idx_user_menu_node_menu_created ON content.user_menu_node(menu_id, created_at, id);
+CREATE INDEX CONCURRENTLY idx_user_phone_number ON content."user"(phone_number, id);
+CREATE INDEX CONCURRENTLY idx_question_created_at ON content.question(created_at, id);
+CREATE INDEX CONCURRENTLY idx_question_updated_at ON content.question(updated_at, id);
\ No newline at end of file